@@ -0,0 +1,9 @@
+-- Indexes for the item list filters and sort keys.
+-- Safe to run repeatedly against an existing database.
+CREATE INDEX IF NOT EXISTS ix_items_name ON items (name);
+CREATE INDEX IF NOT EXISTS ix_items_location ON items (location);
+CREATE INDEX IF NOT EXISTS ix_items_purchase_date ON items (purchase_date);
+CREATE INDEX IF NOT EXISTS ix_items_expiry_date ON items (expiry_date);
+
+-- Refresh planner statistics so SQLite picks the new indexes
+ANALYZE;
@@ -0,0 +1,9 @@
+-- Composite indexes for the transaction list/export and item listing queries.
+-- Safe to run repeatedly against an existing database.
+CREATE INDEX IF NOT EXISTS ix_transactions_timestamp_id ON transactions (timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_item_id_timestamp ON transactions (item_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_transactions_user_id_timestamp ON transactions (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_items_category_id_state ON items (category_id, state);
+
+-- Refresh planner statistics so SQLite picks the new indexes
+ANALYZE;
@@ -1,13 +1,15 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from backend.dependencies import (
     get_db,
-    get_current_user,
+    get_current_user_record,
     create_access_token,
+    token_claims,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
 from backend.services.user_service import UserService
@@ -21,9 +23,10 @@ async def login(
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
+    The password check runs on a process pool, off the event loop.
     """
     user_service = UserService(db)
-    user = user_service.authenticate(form_data.username, form_data.password)
+    user = await user_service.authenticate_async(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,14 +35,14 @@ async def login(
         )
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
-    )
+    # Claims mode may reload the token epoch table, so keep that off the loop too
+    claims = await run_in_threadpool(token_claims, user, db)
+    access_token = create_access_token(data=claims, expires_delta=access_token_expires)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=dict)
 async def read_current_user(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_record)
 ):
     """
     Get current user information.
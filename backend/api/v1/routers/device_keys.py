@@ -0,0 +1,70 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from backend import schemas
+from backend.dependencies import get_db, get_current_user
+from backend.models import User
+from backend.services.device_key_service import DeviceKeyService
+from backend.shared_enums import UserRole
+
+router = APIRouter(tags=["device-keys"])
+
+
+def require_admin(current_user: User) -> None:
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can manage device keys."
+        )
+
+
+@router.post("/", response_model=schemas.DeviceKeyIssued, status_code=status.HTTP_201_CREATED)
+def issue_device_key(
+    key_in: schemas.DeviceKeyCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Issue an API key for a scanning station or integration.
+
+    The key acts as the caller (superadmins may name another `user_id`) and is
+    returned only in this response; send it as `X-Device-Key` or as the bearer token.
+    """
+    require_admin(current_user)
+    user_id = key_in.user_id or current_user.id
+    if user_id != current_user.id:
+        if current_user.role != UserRole.superadmin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only superadmins can issue keys for other users."
+            )
+        if db.get(User, user_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with id {user_id} not found.")
+    device_key, key = DeviceKeyService(db).issue(key_in.name, user_id)
+    return schemas.DeviceKeyIssued(**schemas.DeviceKeyRead.model_validate(device_key).model_dump(), key=key)
+
+
+@router.get("/", response_model=List[schemas.DeviceKeyRead])
+def read_device_keys(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List device keys: all of them for superadmins, the caller's own for admins."""
+    require_admin(current_user)
+    user_id = None if current_user.role == UserRole.superadmin else current_user.id
+    return DeviceKeyService(db).list(user_id=user_id)
+
+
+@router.delete("/{key_id}", response_model=schemas.DeviceKeyRead)
+def revoke_device_key(
+    key_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Revoke a device key; it stops working on the next request."""
+    require_admin(current_user)
+    service = DeviceKeyService(db)
+    device_key = service.get(key_id)
+    if device_key is None or (current_user.role != UserRole.superadmin and device_key.user_id != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Device key with id {key_id} not found.")
+    return service.revoke(device_key)
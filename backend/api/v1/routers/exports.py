@@ -0,0 +1,66 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from backend.dependencies import get_db, get_current_user
+from backend.models import User
+from backend.schemas import ExportJobCreate, ExportJobRead
+from backend.services.export_jobs import ExportJobManager, get_export_jobs
+from backend.services.export_service import HAS_OPENPYXL, MEDIA_TYPES
+
+router = APIRouter(tags=["exports"])
+
+def get_job_or_404(job_id: str, jobs: ExportJobManager):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@router.post("/", response_model=ExportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def create_export(
+    export_in: ExportJobCreate,
+    db: Session = Depends(get_db),
+    jobs: ExportJobManager = Depends(get_export_jobs),
+    current_user: User = Depends(get_current_user),
+):
+    """Queue a transaction export for a range and return its job.
+
+    The job id depends on the range, format and the range's current data, so
+    asking again for an unchanged report returns the already built file
+    (status ``done``) instead of rebuilding it.
+    """
+    now_utc = datetime.now(timezone.utc)
+    start = export_in.start or now_utc - timedelta(days=7)
+    end = export_in.end or now_utc
+    fmt = export_in.format or ("xlsx" if HAS_OPENPYXL else "csv")
+    if fmt == "xlsx" and not HAS_OPENPYXL:
+        raise HTTPException(status_code=400, detail="Excel export is not available on this server; use format=csv")
+    return jobs.submit(db, fmt, start, end).to_read()
+
+@router.get("/{job_id}", response_model=ExportJobRead)
+def read_export(
+    job_id: str,
+    jobs: ExportJobManager = Depends(get_export_jobs),
+    current_user: User = Depends(get_current_user),
+):
+    """Status and progress (`rows_done` of `rows_total`) of an export job."""
+    return get_job_or_404(job_id, jobs).to_read()
+
+@router.get("/{job_id}/download")
+def download_export(
+    job_id: str,
+    jobs: ExportJobManager = Depends(get_export_jobs),
+    current_user: User = Depends(get_current_user),
+):
+    """Download a finished export; 409 while the job is still queued or running."""
+    job = get_job_or_404(job_id, jobs)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    path = jobs.path(job)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Export file has expired")
+    filename = f"transactions_{job.start.date()}_{job.end.date()}.{job.format}"
+    return FileResponse(path, media_type=MEDIA_TYPES[job.format], filename=filename)
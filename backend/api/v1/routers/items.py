@@ -1,20 +1,136 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import os
+import zipfile
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from openpyxl.utils.exceptions import InvalidFileException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.dependencies import get_db, get_current_user
-from backend.services.item_service import ItemService
-from backend.schemas import ItemRead, ItemCreate, ItemUpdate
-from backend.models import User
+from backend.dependencies import get_db, get_async_db, get_current_user
+from backend.services.export_service import (
+    HAS_OPENPYXL,
+    ITEM_EXPORT_HEADERS,
+    MEDIA_TYPES,
+    iter_csv,
+    iter_ndjson,
+    iter_xlsx,
+)
+from backend.services.item_service import AsyncItemService, ItemService
+from backend.schemas import ItemRead, ItemCreate, ItemPage, ItemSuggestion, ItemUpdate, ItemImportReport
+from backend.services.suggest_index import suggest_index
+from backend.utils import iter_csv_rows, iter_xlsx_rows
+from backend.models import ItemState, User
 from backend.shared_enums import UserRole
 
 router = APIRouter(tags=["items"])
+# Async read routes, mounted ahead of `router` when DB_ASYNC is enabled
+async_router = APIRouter(tags=["items"])
+
+ItemSort = Literal["id", "unique_id", "name", "purchase_date", "expiry_date"]
+
+
+class ItemFilterParams:
+    """Item list filters, shared by the list routes and the export."""
+
+    def __init__(
+        self,
+        category_id: Optional[int] = None,
+        state: Optional[ItemState] = None,
+        location: Optional[str] = None,
+        name: Optional[str] = Query(None, description="Case-insensitive substring of the item name"),
+        purchase_from: Optional[datetime] = None,
+        purchase_to: Optional[datetime] = None,
+        expiry_from: Optional[datetime] = None,
+        expiry_to: Optional[datetime] = None,
+    ):
+        self.filters = {
+            "category_id": category_id,
+            "state": state,
+            "location": location,
+            "name": name,
+            "purchase_from": purchase_from,
+            "purchase_to": purchase_to,
+            "expiry_from": expiry_from,
+            "expiry_to": expiry_to,
+        }
+
+
+class ItemListParams:
+    """Query parameters shared by the sync and async item list routes."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+        limit: int = Query(100, ge=1, le=500),
+        sort: ItemSort = "id",
+        order: Literal["asc", "desc"] = "asc",
+        filter_params: ItemFilterParams = Depends(),
+    ):
+        self.paging = {"cursor": cursor, "limit": limit, "sort": sort, "order": order}
+        self.filters = filter_params.filters
+
+
+def page_response(page: ItemPage, response: Response) -> List[ItemRead]:
+    """Move the page metadata into headers so the body stays a plain item list."""
+    response.headers["X-Total-Count"] = str(page.total)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
 
 @router.get("/", response_model=List[ItemRead])
-def read_items(db: Session = Depends(get_db)):
-    """Retrieve all items."""
+def read_items(response: Response, params: ItemListParams = Depends(), db: Session = Depends(get_db)):
+    """Retrieve items one keyset page at a time, filtered and sorted.
+
+    The total number of matching items is returned in `X-Total-Count`. When more
+    items follow, `X-Next-Cursor` holds the cursor for the next page; pass it back
+    with the same `sort` and `order`.
+    """
     item_service = ItemService(db)
-    return item_service.get_all()
+    return page_response(item_service.get_page(**params.paging, **params.filters), response)
+
+@router.get("/export")
+def export_items(
+    fmt: Optional[Literal["xlsx", "csv", "ndjson"]] = Query(None, alias="format", description="Defaults to xlsx when available"),
+    params: ItemFilterParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Export the items matching the list filters, with category names and current state.
+
+    Rows are streamed from one joined SELECT, so memory use does not grow with
+    the size of the catalog. Accessible to any authenticated user.
+    """
+    fmt = fmt or ("xlsx" if HAS_OPENPYXL else "csv")
+    if fmt == "xlsx" and not HAS_OPENPYXL:
+        raise HTTPException(status_code=400, detail="Excel export is not available on this server; use format=csv")
+
+    rows = ItemService(db).iter_export_rows(**params.filters)
+    if fmt == "xlsx":
+        body = iter_xlsx(ITEM_EXPORT_HEADERS, rows, title="Inventory")
+    elif fmt == "ndjson":
+        body = iter_ndjson(ITEM_EXPORT_HEADERS, rows)
+    else:
+        body = iter_csv(ITEM_EXPORT_HEADERS, rows)
+    filename = f"inventory_{datetime.now().date()}.{fmt}"
+    headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+@router.get("/suggest", response_model=List[ItemSuggestion])
+def suggest_items(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Type-ahead: items whose unique_id or name starts with `prefix`.
+
+    Answered from an in-memory index, so no query runs per keystroke.
+    """
+    suggest_index.ensure_built(db)
+    return suggest_index.suggest(prefix, limit=limit)
 
 @router.post("/", response_model=ItemRead)
 def create_item(item: ItemCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -27,6 +143,42 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db), current_user: U
     item_service = ItemService(db)
     return item_service.create(item=item, user_id=current_user.id)
 
+@router.post("/import", response_model=ItemImportReport)
+def import_items(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Bulk-create items from a CSV or XLSX file.
+
+    The first row holds column names: `unique_id`, `name`, `description`, `category`
+    (name) or `category_id`, `state`, `location`, `purchase_date`, `expiry_date`.
+    Valid rows are inserted in batches; the response lists every rejected row.
+    """
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can import items."
+        )
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension == ".csv":
+        rows = iter_csv_rows(file.file)
+    elif extension == ".xlsx":
+        rows = iter_xlsx_rows(file.file)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file type. Upload a .csv or .xlsx file."
+        )
+    item_service = ItemService(db)
+    try:
+        return item_service.import_items(rows, user_id=current_user.id)
+    except (csv.Error, UnicodeDecodeError, zipfile.BadZipFile, InvalidFileException) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read the uploaded file: {exc}"
+        )
+
 @router.put("/{item_id}", response_model=ItemRead)
 def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Update an item."""
@@ -54,3 +206,12 @@ def delete_item(item_id: int, db: Session = Depends(get_db), current_user: User
     if not deleted_item:
         raise HTTPException(status_code=404, detail="Item not found")
     return deleted_item
+
+
+@async_router.get("/", response_model=List[ItemRead])
+async def read_items_async(
+    response: Response, params: ItemListParams = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    """Async variant of `read_items` that awaits the page and count queries."""
+    item_service = AsyncItemService(db)
+    return page_response(await item_service.get_page(**params.paging, **params.filters), response)
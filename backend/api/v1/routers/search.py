@@ -0,0 +1,27 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend.dependencies import get_db, get_current_user
+from backend.models import User
+from backend.schemas import SearchPage
+from backend.services.search_service import SearchService
+
+router = APIRouter(tags=["search"])
+
+@router.get("/", response_model=SearchPage)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; each matches as a prefix"),
+    scope: Literal["items", "transactions"] = "items",
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Full-text search over item name, description, unique_id and location, or
+    over transaction notes, best matches first.
+
+    Pass `next_offset` back as `offset` to fetch the following page.
+    """
+    search_service = SearchService(db)
+    return search_service.search(q, scope=scope, limit=limit, offset=offset)
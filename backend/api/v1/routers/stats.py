@@ -0,0 +1,47 @@
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from backend.dependencies import get_db, get_current_user
+from backend.loop_monitor import loop_monitor
+from backend.models import User
+from backend.schemas import CacheStatsRead, ItemStatsRead, LoopStatsRead
+from backend.services.stats_service import StatsService, stats_cache
+from backend.services.user_service import user_cache
+from backend.shared_enums import UserRole
+
+router = APIRouter(tags=["stats"])
+
+@router.get("/items", response_model=ItemStatsRead)
+def read_item_stats(
+    days: int = Query(30, ge=1, le=366, description="Transaction window, in days up to now"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Item counts by state, category and location, and transaction totals by action
+    over the last `days` days. Results are cached briefly and refreshed on writes.
+    """
+    stats_service = StatsService(db)
+    return stats_service.item_stats(days=days)
+
+@router.get("/cache", response_model=Dict[str, CacheStatsRead])
+def read_cache_stats(current_user: User = Depends(get_current_user)):
+    """Size and hit rate of each in-process cache in this worker. Admins only."""
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can view cache statistics."
+        )
+    return {"users": user_cache.stats(), "stats": stats_cache.stats()}
+
+@router.get("/loop", response_model=LoopStatsRead)
+def read_loop_stats(current_user: User = Depends(get_current_user)):
+    """Event-loop lag, threadpool occupancy and recent loop stalls (with the stack
+    that caused each) in this worker. Admins only.
+    """
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can view event loop statistics."
+        )
+    return loop_monitor.stats()
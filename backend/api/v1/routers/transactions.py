@@ -1,38 +1,115 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
-import io
-import csv
-import json
-try:
-    from openpyxl import Workbook  # type: ignore
-    HAS_OPENPYXL = True
-except Exception:  # ImportError or other env issues
-    HAS_OPENPYXL = False
 from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.dependencies import get_db, get_current_user
-from backend.services.transaction_service import TransactionService
-from backend.schemas import TransactionRead, TransactionCreate
-from backend.models import User
+from backend.dependencies import get_db, get_async_db, get_current_user, get_current_user_or_device
+from backend.services.export_service import (
+    HAS_OPENPYXL,
+    MEDIA_TYPES,
+    TRANSACTION_EXPORT_HEADERS,
+    iter_xlsx,
+)
+from backend.services.export_partitions import ExportPartitions, get_export_partitions
+from backend.services.transaction_service import AsyncTransactionService, TransactionService
+from backend.services.transaction_writer import TransactionWriter, get_transaction_writer
+from backend.schemas import (
+    TransactionBatchCreate,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionPage,
+    TransactionRead,
+)
+from backend.models import User, ItemState, TransactionType
 from backend.shared_enums import UserRole
 
 router = APIRouter(tags=["transactions"])
+# Async read routes, mounted ahead of `router` when DB_ASYNC is enabled
+async_router = APIRouter(tags=["transactions"])
+# Group-commit create route, mounted ahead of `router` when TRANSACTION_WRITE_QUEUE is enabled
+queued_router = APIRouter(tags=["transactions"])
 
-@router.get("/", response_model=List[TransactionRead])
-def read_transactions(db: Session = Depends(get_db)):
-    """Retrieve all transactions."""
+def parse_iso(dt_str: Optional[str], default: Optional[datetime]) -> Optional[datetime]:
+    """Parse an ISO8601 datetime (or YYYY-MM-DD date) query parameter."""
+    if not dt_str:
+        return default
+    s = dt_str.strip()
+    # Allow trailing 'Z' from browsers
+    if s.endswith('Z'):
+        s = s[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        # Try date-only (YYYY-MM-DD)
+        try:
+            d = datetime.strptime(s, '%Y-%m-%d')
+            return d.replace(tzinfo=timezone.utc)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid datetime format. Use ISO8601, e.g. 2025-09-05T12:00:00+00:00")
+
+@router.get("/", response_model=TransactionPage)
+def read_transactions(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=500),
+    item_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[TransactionType] = None,
+    state: Optional[ItemState] = None,
+    start: Optional[str] = Query(None, description="Start datetime ISO8601 (inclusive)"),
+    end: Optional[str] = Query(None, description="End datetime ISO8601 (inclusive)"),
+    db: Session = Depends(get_db),
+):
+    """Retrieve transactions newest first, one keyset page at a time.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page;
+    it is null on the last page.
+    """
     transaction_service = TransactionService(db)
-    return transaction_service.get_all()
+    return transaction_service.get_page(
+        cursor=cursor,
+        limit=limit,
+        item_id=item_id,
+        user_id=user_id,
+        action=action,
+        state=state,
+        start=parse_iso(start, None),
+        end=parse_iso(end, None),
+    )
+
+@async_router.get("/", response_model=TransactionPage)
+async def read_transactions_async(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=500),
+    item_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[TransactionType] = None,
+    state: Optional[ItemState] = None,
+    start: Optional[str] = Query(None, description="Start datetime ISO8601 (inclusive)"),
+    end: Optional[str] = Query(None, description="End datetime ISO8601 (inclusive)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Async variant of `read_transactions` that awaits the page query."""
+    transaction_service = AsyncTransactionService(db)
+    return await transaction_service.get_page(
+        cursor=cursor,
+        limit=limit,
+        item_id=item_id,
+        user_id=user_id,
+        action=action,
+        state=state,
+        start=parse_iso(start, None),
+        end=parse_iso(end, None),
+    )
 
 @router.post("/", response_model=TransactionRead, status_code=status.HTTP_201_CREATED)
 def create_transaction(
     transaction: TransactionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_or_device)
 ):
-    """Create a new transaction."""
+    """Create a new transaction. Scanning stations may authenticate with a device key."""
     if current_user.role not in [UserRole.admin, UserRole.superadmin]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -42,112 +119,72 @@ def create_transaction(
     return transaction_service.create(transaction_in=transaction)
 
 
+@router.post("/batch", response_model=TransactionBatchResult, status_code=status.HTTP_201_CREATED)
+def create_transactions_batch(
+    batch: TransactionBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_or_device)
+):
+    """Create many transactions (e.g. a bulk sign-out) in a single commit.
+
+    Send either a list of `transactions`, or one `header` applied to every id in
+    `item_ids`. With `mode="all_or_nothing"` (default) nothing is written if any
+    row is invalid; with `mode="best_effort"` the valid rows are written and the
+    rest are listed in `errors`.
+    """
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can create transactions."
+        )
+    transaction_service = TransactionService(db)
+    return transaction_service.create_batch(batch)
+
+
+@queued_router.post("/", response_model=TransactionRead, status_code=status.HTTP_201_CREATED)
+async def create_transaction_queued(
+    transaction: TransactionCreate,
+    current_user: User = Depends(get_current_user_or_device),
+    writer: TransactionWriter = Depends(get_transaction_writer),
+):
+    """Create a new transaction through the single-writer group-commit queue."""
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and superadmins can create transactions."
+        )
+    return await writer.submit(transaction)
+
+
 @router.get("/export")
 def export_transactions(
     start: Optional[str] = Query(None, description="Start datetime ISO8601 (inclusive)"),
     end: Optional[str] = Query(None, description="End datetime ISO8601 (inclusive)"),
+    fmt: Optional[Literal["xlsx", "csv"]] = Query(None, alias="format", description="Defaults to xlsx when available"),
     db: Session = Depends(get_db),
+    partitions: ExportPartitions = Depends(get_export_partitions),
     current_user: User = Depends(get_current_user),
 ):
     """Export transactions within a date range as an Excel (.xlsx) file when possible,
     otherwise fall back to CSV if Excel dependencies are not available.
 
+    Rows are streamed from the database through a single join, so memory use
+    does not grow with the size of the range. Whole past days are read from
+    cached per-day files (see `ExportPartitions`).
     If no range is provided, defaults to the last 7 days.
     Accessible to any authenticated user.
     """
-    def parse_iso(dt_str: Optional[str], default: datetime) -> datetime:
-        if not dt_str:
-            return default
-        s = dt_str.strip()
-        # Allow trailing 'Z' from browsers
-        if s.endswith('Z'):
-            s = s[:-1] + '+00:00'
-        try:
-            return datetime.fromisoformat(s)
-        except ValueError:
-            # Try date-only (YYYY-MM-DD)
-            try:
-                d = datetime.strptime(s, '%Y-%m-%d')
-                return d.replace(tzinfo=timezone.utc)
-            except Exception:
-                raise HTTPException(status_code=400, detail="Invalid datetime format. Use ISO8601, e.g. 2025-09-05T12:00:00+00:00")
-
     now_utc = datetime.now(timezone.utc)
     start_dt = parse_iso(start, now_utc - timedelta(days=7))
     end_dt = parse_iso(end, now_utc)
+    fmt = fmt or ("xlsx" if HAS_OPENPYXL else "csv")
+    if fmt == "xlsx" and not HAS_OPENPYXL:
+        raise HTTPException(status_code=400, detail="Excel export is not available on this server; use format=csv")
 
-    service = TransactionService(db)
-    transactions = service.get_by_date_range(start_dt, end_dt)
-
-    def to_cell(val):
-        # Convert complex types to JSON strings; keep primitives; None -> ''
-        if val is None:
-            return ''
-        if isinstance(val, (dict, list)):
-            try:
-                return json.dumps(val, ensure_ascii=False)
-            except Exception:
-                return str(val)
-        if isinstance(val, (str, int, float, bool)):
-            return val
-        # Fallback to string for other objects (e.g., UUID, Decimal)
-        return str(val)
-
-    headers_list = [
-        "id", "item_id", "item_unique_id", "user_id", "username", "action", "state", "timestamp", "notes", "image_url",
-    ]
-
-    if HAS_OPENPYXL:
-        # Prepare Excel workbook in-memory
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Transactions"
-        ws.append(headers_list)
-        for t in transactions:
-            ws.append([
-                to_cell(t.id),
-                to_cell(getattr(t, 'item_id', '')),
-                to_cell(getattr(getattr(t, 'item', None), 'unique_id', '') if getattr(t, 'item', None) else ''),
-                to_cell(getattr(t, 'user_id', '')),
-                to_cell(getattr(getattr(t, 'user', None), 'username', '') if getattr(t, 'user', None) else ''),
-                to_cell(getattr(t, 'action', '')),
-                to_cell(getattr(t, 'state', '')),
-                to_cell(t.timestamp.isoformat() if getattr(t, 'timestamp', None) else ''),
-                to_cell(getattr(t, 'notes', '')),
-                to_cell(getattr(t, 'image_url', '')),
-            ])
-
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        filename = f"transactions_{start_dt.date()}_{end_dt.date()}.xlsx"
-        headers = {
-            "Content-Disposition": f"attachment; filename=\"{filename}\""
-        }
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers=headers,
-        )
+    if fmt == "xlsx":
+        body = iter_xlsx(TRANSACTION_EXPORT_HEADERS, partitions.iter_rows(db, start_dt, end_dt), title="Transactions")
     else:
-        # Fallback to CSV if Excel library isn't available on the server
-        sio = io.StringIO()
-        writer = csv.writer(sio)
-        writer.writerow(headers_list)
-        for t in transactions:
-            writer.writerow([
-                to_cell(t.id),
-                to_cell(getattr(t, 'item_id', '')),
-                to_cell(getattr(getattr(t, 'item', None), 'unique_id', '') if getattr(t, 'item', None) else ''),
-                to_cell(getattr(t, 'user_id', '')),
-                to_cell(getattr(getattr(t, 'user', None), 'username', '') if getattr(t, 'user', None) else ''),
-                to_cell(getattr(t, 'action', '')),
-                to_cell(getattr(t, 'state', '')),
-                to_cell(t.timestamp.isoformat() if getattr(t, 'timestamp', None) else ''),
-                to_cell(getattr(t, 'notes', '')),
-                to_cell(getattr(t, 'image_url', '')),
-            ])
-        sio.seek(0)
-        filename = f"transactions_{start_dt.date()}_{end_dt.date()}.csv"
-        headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
-        return StreamingResponse(iter([sio.getvalue()]), media_type="text/csv", headers=headers)
+        body = partitions.iter_csv(db, start_dt, end_dt)
+    filename = f"transactions_{start_dt.date()}_{end_dt.date()}.{fmt}"
+    headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
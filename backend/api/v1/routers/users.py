@@ -1,5 +1,6 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from backend import schemas, models
@@ -12,23 +13,23 @@ router = APIRouter()
 
 
 @router.post("/", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_in: schemas.UserCreate,
     db: Session = Depends(get_db),
     # This endpoint is public for now, but in a real app, you'd want protection
     # current_user: models.User = Depends(get_current_user) 
 ): 
     """
-    Create a new user.
+    Create a new user. The password is hashed on a process pool, off the event loop.
     """
     user_service = UserService(db)
-    user = user_service.get_by_username(username=user_in.username)
+    user = await run_in_threadpool(user_service.get_by_username, username=user_in.username)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
-    return user_service.create(user_in=user_in)
+    return await user_service.create_async(user_in=user_in)
 
 @router.get("/", response_model=List[schemas.UserRead])
 def read_users(
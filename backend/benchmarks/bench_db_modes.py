@@ -0,0 +1,132 @@
+"""Compare requests/sec of the sync and async (DB_ASYNC) list endpoints.
+
+Seeds a throwaway SQLite file, then drives the items and transactions list routes
+in-process through httpx's ASGI transport with a fixed number of concurrent clients.
+
+Usage:
+    python -m backend.benchmarks.bench_db_modes --items 2000 --transactions 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.api.v1.routers import items, transactions
+from backend.base import Base
+from backend.database import build_async_engine, build_engine, make_async_sessionmaker
+from backend.dependencies import get_async_db, get_db
+
+
+def seed(url: str, n_items: int, n_transactions: int) -> None:
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"username": "bench", "hashed_password": "x", "role": "admin"}])
+        conn.execute(models.Category.__table__.insert(), [{"name": "Bench"}])
+        conn.execute(models.Item.__table__.insert(), [
+            {"unique_id": f"BENCH-{i}", "name": f"Item {i}", "category_id": 1, "state": "good"}
+            for i in range(n_items)
+        ])
+        base = datetime(2025, 1, 1)
+        conn.execute(models.Transaction.__table__.insert(), [
+            {
+                "item_id": i % n_items + 1,
+                "user_id": 1,
+                "action": "sign_out" if i % 2 else "sign_in",
+                "timestamp": base + timedelta(seconds=i),
+            }
+            for i in range(n_transactions)
+        ])
+    engine.dispose()
+
+
+def build_sync_app(url: str) -> FastAPI:
+    SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=build_engine(url))
+
+    def _get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(items.router, prefix="/api/v1/items")
+    app.include_router(transactions.router, prefix="/api/v1/transactions")
+    app.dependency_overrides[get_db] = _get_db
+    return app
+
+
+def build_async_app(url: str) -> FastAPI:
+    async_engine = build_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    AsyncSession = make_async_sessionmaker(async_engine)
+
+    async def _get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(items.async_router, prefix="/api/v1/items")
+    app.include_router(transactions.async_router, prefix="/api/v1/transactions")
+    app.dependency_overrides[get_async_db] = _get_async_db
+    app.state.async_engine = async_engine
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await client.get(path)  # warm the pool and caches
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def run_all(url: str, requests: int, concurrency: int) -> None:
+    # One event loop for every run: async pooled connections are bound to the loop
+    apps = {"sync": build_sync_app(url), "async": build_async_app(url)}
+    paths = {"items": "/api/v1/items/", "transactions": "/api/v1/transactions/?limit=50"}
+
+    print(f"{'endpoint':<14}{'mode':<8}{'req/s':>10}", flush=True)
+    try:
+        for endpoint, path in paths.items():
+            for mode, app in apps.items():
+                rps = await measure(app, path, requests, concurrency)
+                print(f"{endpoint:<14}{mode:<8}{rps:>10.1f}", flush=True)
+    finally:
+        # aiosqlite connections hold non-daemon worker threads until closed
+        await apps["async"].state.async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(url, args.items, args.transactions)
+        asyncio.run(run_all(url, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Check that the transaction export keeps memory flat as the range grows.
+
+Seeds a throwaway SQLite file, then drains the CSV and XLSX export generators for
+ranges of increasing size under tracemalloc and reports peak Python allocations.
+openpyxl is much slower while tracemalloc is active, so XLSX timings are pessimistic.
+
+Usage:
+    python -m backend.benchmarks.bench_export_memory --sizes 10000 50000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.base import Base
+from backend.database import build_engine
+from backend.services.export_service import TRANSACTION_EXPORT_HEADERS, iter_csv, iter_xlsx
+from backend.services.transaction_service import TransactionService
+
+BASE = datetime(2024, 1, 1)
+
+
+def seed(engine, n_transactions: int, chunk: int = 50000) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"username": "bench", "hashed_password": "x", "role": "admin"}])
+        conn.execute(models.Item.__table__.insert(), [
+            {"unique_id": f"BENCH-{i}", "name": f"Item {i}", "state": "good"} for i in range(1000)
+        ])
+        for start in range(0, n_transactions, chunk):
+            conn.execute(models.Transaction.__table__.insert(), [
+                {
+                    "item_id": i % 1000 + 1,
+                    "user_id": 1,
+                    "action": "sign_out" if i % 2 else "sign_in",
+                    "timestamp": BASE + timedelta(seconds=i),
+                    "notes": f"note {i}",
+                    "state": "good",
+                }
+                for i in range(start, min(start + chunk, n_transactions))
+            ])
+
+
+def measure(Session, fmt: str, rows: int):
+    db = Session()
+    try:
+        source = TransactionService(db).iter_export_rows(BASE, BASE + timedelta(seconds=rows - 1))
+        body = iter_xlsx(TRANSACTION_EXPORT_HEADERS, source, "Transactions") if fmt == "xlsx" \
+            else iter_csv(TRANSACTION_EXPORT_HEADERS, source)
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = sum(len(chunk) for chunk in body)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size, elapsed, peak
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(engine, max(args.sizes))
+        Session = sessionmaker(bind=engine)
+        print(f"{'format':<8}{'rows':>9}{'MiB out':>10}{'seconds':>10}{'peak MiB':>10}", flush=True)
+        for fmt in ("csv", "xlsx"):
+            for rows in args.sizes:
+                size, elapsed, peak = measure(Session, fmt, rows)
+                print(f"{fmt:<8}{rows:>9}{size / 2**20:>10.1f}{elapsed:>10.2f}{peak / 2**20:>10.2f}", flush=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
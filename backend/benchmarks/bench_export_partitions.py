@@ -0,0 +1,90 @@
+"""Compare a 90-day CSV export with a cold and a warm per-day partition cache.
+
+Seeds a throwaway SQLite file with transactions spread over the last `--days`
+days, then drains `ExportPartitions.iter_csv` three times: with an empty cache
+(every closed day is built), with every closed day cached, and with one day
+made dirty by a new row.
+
+Usage:
+    python -m backend.benchmarks.bench_export_partitions --days 90 --per-day 3000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.base import Base
+from backend.database import build_engine
+from backend.services.export_partitions import ExportPartitions
+
+
+def seed(engine, start: datetime, days: int, per_day: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    step = timedelta(days=1) / per_day
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"username": "bench", "hashed_password": "x", "role": "admin"}])
+        conn.execute(models.Item.__table__.insert(), [
+            {"unique_id": f"BENCH-{i}", "name": f"Item {i}", "state": "good"} for i in range(1000)
+        ])
+        for day in range(days + 1):
+            base = start + timedelta(days=day)
+            conn.execute(models.Transaction.__table__.insert(), [
+                {
+                    "item_id": i % 1000 + 1,
+                    "user_id": 1,
+                    "action": "sign_out" if i % 2 else "sign_in",
+                    "timestamp": base + step * i,
+                    "notes": f"note {day}-{i}",
+                    "state": "good",
+                }
+                for i in range(per_day)
+            ])
+
+
+def drain(Session, partitions: ExportPartitions, start: datetime, end: datetime):
+    db = Session()
+    try:
+        started = time.perf_counter()
+        size = sum(len(chunk) for chunk in partitions.iter_csv(db, start, end))
+        return size, time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-day", type=int, default=3000)
+    args = parser.parse_args()
+
+    today = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=args.days)
+    end = today + timedelta(days=1, microseconds=-1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(engine, start, args.days, args.per_day)
+        Session = sessionmaker(bind=engine)
+        partitions = ExportPartitions(directory=os.path.join(tmp, "days"))
+
+        print(f"{'cache':<8}{'MiB out':>10}{'seconds':>10}", flush=True)
+        for label in ("cold", "warm"):
+            size, elapsed = drain(Session, partitions, start, end)
+            print(f"{label:<8}{size / 2**20:>10.1f}{elapsed:>10.2f}", flush=True)
+
+        with engine.begin() as conn:
+            conn.execute(models.Transaction.__table__.insert(), [{
+                "item_id": 1, "user_id": 1, "action": "sign_in", "state": "good",
+                "timestamp": start + timedelta(days=1, hours=12), "notes": "late entry",
+            }])
+        size, elapsed = drain(Session, partitions, start, end)
+        print(f"{'1 dirty':<8}{size / 2**20:>10.1f}{elapsed:>10.2f}", flush=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
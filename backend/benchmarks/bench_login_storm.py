@@ -0,0 +1,125 @@
+"""Measure other endpoints' latency while a storm of logins is running.
+
+Drives `POST /api/v1/auth/token` with concurrent clients in-process (httpx ASGI
+transport) and meanwhile probes a cheap async endpoint on the same event loop.
+The "inline" mode verifies passwords on the event loop, as login used to; the
+"pool" mode uses the password process pool.
+
+Usage:
+    python -m backend.benchmarks.bench_login_storm --seconds 5 --logins 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.api.v1.routers import auth
+from backend.base import Base
+from backend.database import build_engine
+from backend.dependencies import get_db
+from backend.password_utils import get_password_hash, get_password_pool, shutdown_password_pool
+from backend.services.user_service import UserService
+
+PASSWORD = "bench-password"
+
+
+def build_app(url: str) -> FastAPI:
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [
+            {"username": "bench", "hashed_password": get_password_hash(PASSWORD), "role": "admin"}
+        ])
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/v1/auth")
+    app.dependency_overrides[get_db] = _get_db
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def storm(app: FastAPI, seconds: float, logins: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + seconds
+        done = 0
+        latencies = []
+        form = {"grant_type": "password", "username": "bench", "password": PASSWORD, "scope": ""}
+
+        async def login_worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/v1/auth/token", data=form)
+                response.raise_for_status()
+                done += 1
+
+        async def probe():
+            # Latency is measured from when the probe was due, so time spent
+            # waiting for a blocked event loop counts against it
+            due = time.perf_counter()
+            while due < deadline:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                (await client.get("/ping")).raise_for_status()
+                latencies.append((time.perf_counter() - due) * 1000)
+                due = max(due + 0.01, time.perf_counter())
+
+        await asyncio.gather(probe(), *(login_worker() for _ in range(logins)))
+        return done / seconds, latencies
+
+
+async def inline_authenticate(self, username, password):
+    return self.authenticate(username, password)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login clients (stay under the 15-connection pool)")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("backend.repositories.user_repository").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        get_password_pool().submit(get_password_hash, "warm-up").result()
+
+        print(f"{'mode':<8}{'logins/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}", flush=True)
+        for mode in ("idle", "inline", "pool"):
+            if mode == "inline":
+                patch = mock.patch.object(UserService, "authenticate_async", inline_authenticate)
+            else:
+                patch = mock.patch.object(UserService, "authenticate_async", UserService.authenticate_async)
+            with patch:
+                rate, latencies = asyncio.run(storm(app, args.seconds, 0 if mode == "idle" else args.logins))
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"{mode:<8}{rate:>10.1f}{statistics.median(latencies):>10.1f}{p99:>10.1f}{latencies[-1]:>10.1f}",
+                flush=True,
+            )
+        shutdown_password_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure FTS5 search latency on a large synthetic catalog.
+
+Seeds a throwaway SQLite file with N items (the sync triggers index them as they
+are inserted), then times `SearchRepository.search_items` for a few query shapes.
+
+Usage:
+    python -m backend.benchmarks.bench_search --items 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.base import Base
+from backend.database import build_engine
+from backend.repositories.search_repository import SearchRepository
+
+WORDS = [
+    "drill", "ladder", "helmet", "harness", "radio", "torch", "battery", "cable", "rope", "saw",
+    "generator", "pump", "valve", "gauge", "tent", "stove", "filter", "sensor", "charger", "scanner",
+]
+LOCATIONS = ["Workshop", "Yard", "Store A", "Store B", "Site Office", "Van 1", "Van 2"]
+
+
+def seed(engine, n_items: int, chunk: int = 50000) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        for start in range(0, n_items, chunk):
+            conn.execute(models.Item.__table__.insert(), [
+                {
+                    "unique_id": f"SKU-{i:07d}",
+                    "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i % 997}",
+                    "description": " ".join(rng.choices(WORDS, k=6)),
+                    "location": rng.choice(LOCATIONS),
+                    "state": "good",
+                }
+                for i in range(start, min(start + chunk, n_items))
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        started = time.perf_counter()
+        seed(engine, args.items)
+        print(f"seeded {args.items} items in {time.perf_counter() - started:.1f}s", flush=True)
+
+        db = sessionmaker(bind=engine)()
+        repo = SearchRepository(db)
+        queries = {
+            "exact sku": f"SKU-{args.items // 2:07d}",
+            "sku prefix": f"SKU-{args.items // 2:07d}"[:-2],
+            "rare pair": "scanner 996",
+            "prefix": "gene",
+            "common word": "drill",
+        }
+        print(f"{'query':<14}{'p50 ms':>10}{'p95 ms':>10}", flush=True)
+        for label, q in queries.items():
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                repo.search_items(q, limit=20)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{label:<14}{statistics.median(timings):>10.2f}{p95:>10.2f}", flush=True)
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare transaction-create throughput: per-request commits vs the group-commit writer.
+
+Both modes run the same number of concurrent creates against a throwaway SQLite
+file. The direct mode calls `TransactionService.create` from worker threads (as the
+sync route does); the queued mode awaits `TransactionWriter.submit`.
+
+Usage:
+    python -m backend.benchmarks.bench_transaction_writes --writes 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.base import Base
+from backend.database import build_engine
+from backend.schemas import TransactionCreate
+from backend.services.transaction_service import TransactionService
+from backend.services.transaction_writer import TransactionWriter
+
+
+def payload(i: int) -> TransactionCreate:
+    return TransactionCreate(
+        item_id=1,
+        user_id=1,
+        action="sign_out" if i % 2 else "sign_in",
+        timestamp=datetime.now(timezone.utc),
+        notes=None,
+        state="good",
+    )
+
+
+async def run_direct(Session, writes: int, concurrency: int) -> float:
+    limiter = asyncio.Semaphore(concurrency)
+
+    def create(i: int) -> None:
+        db = Session()
+        try:
+            TransactionService(db).create(transaction_in=payload(i))
+        finally:
+            db.close()
+
+    async def one(i: int) -> None:
+        async with limiter:
+            await asyncio.to_thread(create, i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(writes)))
+    return writes / (time.perf_counter() - started)
+
+
+async def run_queued(Session, writes: int, concurrency: int) -> float:
+    writer = TransactionWriter(Session)
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with limiter:
+            await writer.submit(payload(i))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(writes)))
+    elapsed = time.perf_counter() - started
+    await writer.close()
+    print(f"  queued mode wrote {writer.rows} rows in {writer.batches} commits")
+    return writes / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(models.User.__table__.insert(), [{"username": "bench", "hashed_password": "x", "role": "admin"}])
+            conn.execute(models.Item.__table__.insert(), [{"unique_id": "BENCH-1", "name": "Item", "state": "good"}])
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        for mode, runner in (("direct", run_direct), ("queued", run_queued)):
+            rate = asyncio.run(runner(Session, args.writes, args.concurrency))
+            print(f"{mode:<8}{rate:>10.1f} writes/s", flush=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
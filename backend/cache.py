@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with a per-entry TTL and LRU eviction.
+
+    Entries expire `ttl` seconds after they are stored; once `maxsize` entries
+    are held the least recently used one is dropped. `invalidate()` clears one
+    key or everything, and `hits`/`misses` count lookups for monitoring.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._generation = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss.
+
+        A value computed while an `invalidate()` ran is returned but not stored,
+        so a slow read can't put pre-write data back into the cache.
+        """
+        sentinel = object()
+        generation = self._generation
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            with self._lock:
+                if generation == self._generation:
+                    self._store(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop `key`, or every entry when no key is given."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,6 +1,8 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 # --- Database Configuration ---
 # Prefer DATABASE_URL from environment (e.g., set by docker-compose). Fallback to a local sqlite file
@@ -11,11 +13,121 @@ SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL") or f"sqlite:///{DEFAULT
 
 print(f"INFO:     Using SQLALCHEMY_DATABASE_URL={SQLALCHEMY_DATABASE_URL}")
 
-# sqlite requires a special arg
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
+# --- Connection pool ---
+# Each pooled connection keeps its SQLite page cache and mmap, so reuse matters.
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+
+# --- SQLite profile ---
+# Applied to every new DBAPI connection. WAL lets readers proceed while a writer
+# commits, and synchronous=NORMAL is durable across application crashes in WAL mode.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    # Negative cache_size is in KiB rather than pages
+    "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", "65536")),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Apply `SQLITE_PRAGMAS` to a raw sqlite3 connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(sqlite_engine):
+    """Register the SQLite profile so it runs on every connection the engine opens."""
+    event.listen(sqlite_engine, "connect", apply_sqlite_pragmas)
+    return sqlite_engine
+
+
+def build_engine(url: str):
+    """Create the application engine with pool settings and, for SQLite, the tuned profile."""
+    url_obj = make_url(url)
+    if url_obj.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_recycle=POOL_RECYCLE,
+        )
+
+    # sqlite requires a special arg
+    kwargs = {"connect_args": {"check_same_thread": False}}
+    if url_obj.database not in (None, "", ":memory:"):
+        # File databases default to NullPool, which would re-open the file and
+        # re-run the pragmas on every checkout
+        kwargs.update(
+            poolclass=QueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_recycle=POOL_RECYCLE,
+        )
+    return configure_sqlite_engine(create_engine(url, **kwargs))
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Optional async engine ---
+# Opt-in with DB_ASYNC=1 (requires aiosqlite for SQLite). The async routes then
+# await their queries on the event loop instead of occupying threadpool workers.
+ASYNC_DB_ENABLED = os.environ.get("DB_ASYNC", "").lower() in ("1", "true", "yes")
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL's driver for its asyncio counterpart."""
+    url_obj = make_url(url)
+    backend_name = url_obj.get_backend_name()
+    if backend_name not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend_name}' databases")
+    return str(url_obj.set(drivername=ASYNC_DRIVERS[backend_name]))
+
+
+def build_async_engine(url: str):
+    """Create an AsyncEngine with the same pool settings and SQLite profile as `build_engine`."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url_obj = make_url(url)
+    kwargs = {}
+    if url_obj.get_backend_name() != "sqlite" or url_obj.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_recycle=POOL_RECYCLE,
+        )
+    async_engine = create_async_engine(url, **kwargs)
+    if url_obj.get_backend_name() == "sqlite":
+        configure_sqlite_engine(async_engine.sync_engine)
+    return async_engine
+
+
+def make_async_sessionmaker(async_engine):
+    """Session factory for AsyncSession; attributes stay loaded after commit."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    return sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL") or (
+    to_async_url(SQLALCHEMY_DATABASE_URL) if ASYNC_DB_ENABLED else None
+)
+async_engine = build_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL) if ASYNC_DB_ENABLED else None
+AsyncSessionLocal = make_async_sessionmaker(async_engine) if async_engine is not None else None
+
 # Initialize the database with all models
 def init_db():
     from backend.base import Base
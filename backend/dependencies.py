@@ -1,25 +1,35 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional, Union
 import os
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from datetime import datetime, timedelta, timezone
 
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
+from . import database
 from .database import SessionLocal
 from .repositories.user_repository import UserRepository
-from .services.user_service import UserService
-from .schemas import UserInDB
+from .services.device_key_service import DeviceKeyService, is_device_key
+from .services.token_epochs import token_epochs
+from .services.user_service import UserService, user_cache, user_snapshot
+from .schemas import TokenUser, UserInDB
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
+# Device API keys (see `DeviceKeyService`); also accepted as a bearer token
+device_key_header = APIKeyHeader(name="X-Device-Key", auto_error=False)
 
 # Read secrets from environment for production, with a safe fallback for dev
 SECRET_KEY = os.getenv("INVENTORY_SECRET_KEY", os.getenv("SECRET_KEY", "your-secret-key-here"))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Opt-in with JWT_CLAIMS_MODE=1: tokens carry uid/role/token_epoch and requests
+# are authorised from those claims without loading the user
+JWT_CLAIMS_MODE = os.environ.get("JWT_CLAIMS_MODE", "").lower() in ("1", "true", "yes")
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -30,6 +40,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def token_claims(user, db: Session) -> dict:
+    """Claims for a new access token: ``sub``, plus uid/role/token_epoch in claims mode."""
+    claims = {"sub": user.username}
+    if JWT_CLAIMS_MODE:
+        claims.update({
+            "uid": user.id,
+            "role": user.role.value,
+            "token_epoch": token_epochs.current(db, user.id),
+        })
+    return claims
+
 def get_db() -> Generator:
     """Dependency that provides DB session."""
     db = SessionLocal()
@@ -38,28 +59,98 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> UserInDB:
-    """Dependency to get the current authenticated user."""
-    credentials_exception = HTTPException(
+async def get_async_db() -> AsyncGenerator:
+    """Dependency that provides an AsyncSession (requires DB_ASYNC=1)."""
+    if database.AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled; set DB_ASYNC=1 to enable it")
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+def credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
+        detail=detail,
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str) -> dict:
+    """Decode and verify an access token; raises 401 if it is invalid or has no subject."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_username(username)
-    if user is None:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+def check_token_epoch(payload: dict, user_id: int, db: Session) -> None:
+    """Reject a claims-mode token issued before the user's tokens were last revoked."""
+    if payload.get("token_epoch") != token_epochs.current(db, user_id):
+        raise credentials_exception("Token has been revoked")
+
+def load_current_user(username: str, db: Session) -> UserInDB:
+    """Resolve a token subject to a user snapshot; raises 401 if the user is gone."""
+    def load_user() -> UserInDB:
+        user = UserRepository(db).get_by_username(username)
+        if user is None:
+            raise credentials_exception()
+        return user_snapshot(user)
+
+    # Served from `user_cache` when possible, so most requests skip the user lookup
+    return user_cache.get_or_set(username, load_user)
+
+def user_from_token(token: str, db: Session) -> Union[UserInDB, TokenUser]:
+    """The user an access token belongs to; see `get_current_user`."""
+    payload = decode_token(token)
+    if JWT_CLAIMS_MODE and "uid" in payload:
+        check_token_epoch(payload, payload["uid"], db)
+        return TokenUser(id=payload["uid"], username=payload["sub"], role=payload["role"])
+    return load_current_user(payload["sub"], db)
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Union[UserInDB, TokenUser]:
+    """Dependency to get the current authenticated user.
+
+    A plain function on purpose: FastAPI runs it in the threadpool, so the user
+    and epoch lookups never block the event loop.
+    Returns a detached `UserInDB` snapshot rather than a session-bound `User`.
+    In JWT claims mode, a token carrying claims yields a `TokenUser` built from
+    them, after checking its `token_epoch` against the in-memory epoch table.
+    """
+    return user_from_token(token, db)
+
+def get_current_user_or_device(
+    device_key: Optional[str] = Security(device_key_header),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Union[UserInDB, TokenUser]:
+    """`get_current_user` that also accepts a device API key, for scanner-facing routes.
+
+    The key may be sent as ``X-Device-Key`` or as the bearer token; the request
+    then acts as the user the key was issued for.
+    """
+    if device_key is None and token is not None and is_device_key(token):
+        device_key = token
+    if device_key is not None:
+        user = DeviceKeyService(db).authenticate(device_key)
+        if user is None:
+            raise credentials_exception("Invalid device key")
+        return user_snapshot(user)
+    if token is None:
+        raise credentials_exception("Not authenticated")
+    return user_from_token(token, db)
+
+def get_current_user_record(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UserInDB:
+    """Like `get_current_user`, but always returns the full user, even in claims mode."""
+    payload = decode_token(token)
+    user = load_current_user(payload["sub"], db)
+    if JWT_CLAIMS_MODE and "uid" in payload:
+        check_token_epoch(payload, user.id, db)
     return user
 
 def get_current_active_user(
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_ENABLED = os.environ.get("LOOP_MONITOR_ENABLED", "1").lower() in ("1", "true", "yes")
+LOOP_MONITOR_INTERVAL_MS = float(os.environ.get("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_BLOCK_THRESHOLD_MS = float(os.environ.get("LOOP_BLOCK_THRESHOLD_MS", "100"))
+# Threads for sync routes and dependencies (anyio's default limiter); unset keeps anyio's 40
+THREADPOOL_SIZE = int(os.environ["THREADPOOL_SIZE"]) if os.environ.get("THREADPOOL_SIZE") else None
+
+# Lag samples kept for percentiles; at the default interval, about the last minute
+_WINDOW = 600
+_MAX_BLOCKS = 20
+_STACK_FRAMES = 12
+
+
+def configure_threadpool(size: Optional[int] = THREADPOOL_SIZE) -> None:
+    """Resize the threadpool FastAPI runs sync code on; call from inside the event loop."""
+    if size:
+        to_thread.current_default_thread_limiter().total_tokens = size
+
+
+class LoopMonitor:
+    """Samples event-loop lag and threadpool use, and catches what blocks the loop.
+
+    A task on the loop sleeps `interval_ms` at a time; how late it wakes up is
+    the loop's lag. Each sample also records how many threadpool tokens are in
+    use and how many callers wait for one. A watchdog thread notices when the
+    sampler is overdue by more than `threshold_ms` and captures the loop
+    thread's stack at that moment, which names the code blocking it; the stall
+    is logged and kept in `recent_blocks` once the loop recovers.
+    """
+
+    def __init__(self, interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+                 threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.blocks = 0
+        self.recent_blocks: Deque[dict] = deque(maxlen=_MAX_BLOCKS)
+        self._lags: Deque[float] = deque(maxlen=_WINDOW)
+        self._max_lag = 0.0
+        self._threadpool = {"size": 0, "busy": 0, "waiting": 0, "peak_busy": 0, "peak_waiting": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._due = 0.0
+        self._stack: Optional[List[str]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._due = time.perf_counter() + self.interval
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._watchdog.join()
+        self._task = self._watchdog = None
+
+    async def _sample(self) -> None:
+        limiter = to_thread.current_default_thread_limiter()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - self._due)
+            self._due = now + self.interval
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            if lag > self.threshold:
+                self._record_block(lag)
+            else:
+                self._stack = None
+
+            stats = limiter.statistics()
+            pool = self._threadpool
+            pool["size"] = int(stats.total_tokens)
+            pool["busy"] = stats.borrowed_tokens
+            pool["waiting"] = stats.tasks_waiting
+            pool["peak_busy"] = max(pool["peak_busy"], stats.borrowed_tokens)
+            pool["peak_waiting"] = max(pool["peak_waiting"], stats.tasks_waiting)
+
+    def _record_block(self, lag: float) -> None:
+        stack, self._stack = self._stack, None
+        self.blocks += 1
+        self.recent_blocks.append({
+            "at": datetime.now(timezone.utc),
+            "duration_ms": round(lag * 1000, 1),
+            "stack": stack or [],
+        })
+        logger.warning(
+            "Event loop blocked for %.0f ms%s", lag * 1000,
+            "; blocking code:\n" + "".join(stack) if stack else "",
+        )
+
+    def _watch(self) -> None:
+        # Capture the loop thread's stack once per stall, while it is still stalled
+        captured_for = None
+        while not self._stop.wait(self.threshold / 2):
+            due = self._due
+            if time.perf_counter() - due > self.threshold and captured_for != due:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._stack = traceback.format_stack(frame, limit=_STACK_FRAMES)
+                captured_for = due
+
+    def stats(self) -> dict:
+        lags = sorted(self._lags)
+
+        def percentile(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))] * 1000, 1) if lags else 0.0
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(lags),
+            "lag_ms": {
+                "last": round(self._lags[-1] * 1000, 1) if lags else 0.0,
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(self._max_lag * 1000, 1),
+            },
+            "blocks": self.blocks,
+            "recent_blocks": list(self.recent_blocks),
+            "threadpool": dict(self._threadpool),
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import os
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -8,26 +10,56 @@ from typing import Generator
 
 # Import models first to ensure tables are created
 from backend import models
-from backend.database import engine, SessionLocal
+from backend.database import engine, SessionLocal, ASYNC_DB_ENABLED
 from backend.dependencies import get_db, get_current_user
+from backend.loop_monitor import LOOP_MONITOR_ENABLED, configure_threadpool, loop_monitor
+from backend.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+from backend.password_utils import shutdown_password_pool
+from backend.rate_limit import RATE_LIMIT_ENABLED, RateLimitMiddleware
+from backend.services.export_jobs import close_export_jobs
+from backend.services.suggest_index import suggest_index
+from backend.services.transaction_writer import WRITE_QUEUE_ENABLED, close_transaction_writer
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
 # Import routers
-from backend.api.v1.routers import auth, categories, items, transactions, users, uploads
+from backend.api.v1.routers import auth, categories, device_keys, exports, items, search, stats, transactions, users, uploads
 
 # Create uploads directory
 if not os.path.exists("uploads"):
     os.makedirs("uploads")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the item type-ahead index before the first request needs it
+    db = SessionLocal()
+    try:
+        suggest_index.build(db)
+    finally:
+        db.close()
+    configure_threadpool()
+    if LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+    yield
+    await loop_monitor.stop()
+    # Flush any queued transaction writes before the worker exits
+    await close_transaction_writer()
+    close_export_jobs()
+    shutdown_password_pool()
+
 # Create FastAPI app
 app = FastAPI(
     title="Inventory Management System API",
     description="API for managing inventory, items, and transactions",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Login brute-force protection; added before CORS so 429s still carry CORS headers
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -39,13 +71,27 @@ app.add_middleware(
     max_age=600  # Cache preflight request for 10 minutes
 )
 
+# Outermost, so rate-limited and CORS-handled requests are measured too
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
+# Opt-in variants are registered first so they take precedence over the sync routes
+if ASYNC_DB_ENABLED:
+    app.include_router(items.async_router, prefix="/api/v1/items", tags=["items"])
+    app.include_router(transactions.async_router, prefix="/api/v1/transactions", tags=["transactions"])
+if WRITE_QUEUE_ENABLED:
+    app.include_router(transactions.queued_router, prefix="/api/v1/transactions", tags=["transactions"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(categories.router, prefix="/api/v1/categories", tags=["categories"])
 app.include_router(items.router, prefix="/api/v1/items", tags=["items"])
 app.include_router(transactions.router, prefix="/api/v1/transactions", tags=["transactions"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(uploads.router, prefix="/api/v1/uploads", tags=["uploads"])
+app.include_router(stats.router, prefix="/api/v1/stats", tags=["stats"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["exports"])
+app.include_router(device_keys.router, prefix="/api/v1/device-keys", tags=["device-keys"])
 
 # Mount static files directory for uploads
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
@@ -64,6 +110,12 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Prometheus scrape endpoint
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Dependency
 def get_db() -> Generator:
     """
@@ -0,0 +1,223 @@
+"""Request metrics and a Prometheus text-format exposition for ``/metrics``.
+
+`MetricsMiddleware` times every HTTP request and files it under its method,
+route template (``/api/v1/items/{item_id}``, not the raw path, so the series
+stay bounded) and status code. `render_metrics()` adds gauges and counters
+that other modules already keep: the DB pool, the in-process caches, the
+login rate limiter, the event-loop monitor and the export caches.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+
+from . import database
+from .loop_monitor import loop_monitor
+from .rate_limit import ip_buckets, username_buckets
+from .services import export_jobs
+from .services.export_partitions import get_export_partitions
+from .services.stats_service import stats_cache
+from .services.user_service import user_cache
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Upper bounds in seconds, as in the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_UNMATCHED = "<unmatched>"
+# Any other method, and every method on an unmatched path, is counted as "other"
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class RequestMetrics:
+    """Per (method, route, status) request counts, latency histograms and bytes sent.
+
+    Each series is one list, ``[bucket counts, seconds sum, count, bytes sum]``,
+    updated from the event loop only, so recording a request takes no lock.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, str, str], list] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        key = (method, route, str(status))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0]
+        series[0][bisect_left(self.buckets, seconds)] += 1
+        series[1] += seconds
+        series[2] += 1
+        series[3] += size
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_requests_total HTTP requests by method, route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        series = sorted(self._series.items())
+        for (method, route, status), (_, _, count, _) in series:
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Time to send the full response.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), (counts, total, count, _) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _labels(method=method, route=route, status=status, le=le)
+                lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_request_duration_seconds_sum{labels} {total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{labels} {count}")
+
+        lines += [
+            "# HELP http_response_size_bytes_total Response body bytes sent.",
+            "# TYPE http_response_size_bytes_total counter",
+        ]
+        for (method, route, status), (_, _, _, size) in series:
+            lines.append(f"http_response_size_bytes_total{_labels(method=method, route=route, status=status)} {size}")
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request into `request_metrics`.
+
+    Latency runs until the last body chunk is sent, so streamed exports are
+    timed in full. Paths that match no route share one ``<unmatched>`` series
+    and non-standard methods are labelled ``other``, so clients can't create
+    series at will.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            method = scope["method"] if scope["method"] in _METHODS and route != _UNMATCHED else "other"
+            self.metrics.observe(method, route, response["status"],
+                                 time.perf_counter() - started, response["size"])
+
+
+def route_template(scope) -> str:
+    """The matched route's full path template, e.g. ``/api/v1/items/{item_id}``."""
+    # Newer FastAPI keeps included routers nested, so scope["route"] only holds the
+    # path inside its router; the effective context has the prefixed template
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    route = context or scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or _UNMATCHED
+
+
+class PoolCheckouts:
+    """Counts connection checkouts from an engine's pool."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def install(self, engine) -> None:
+        event.listen(engine, "checkout", self._on_checkout)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.count += 1
+
+
+pool_checkouts = PoolCheckouts()
+pool_checkouts.install(database.engine)
+
+
+def render_metrics() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = request_metrics.render()
+
+    pool = database.engine.pool
+    lines += _gauge("db_pool_checkouts_total", "Connections checked out of the pool.", pool_checkouts.count, "counter")
+    for name, attr, help_text in (
+        ("db_pool_size", "size", "Configured pool size."),
+        ("db_pool_checked_out", "checkedout", "Connections currently in use."),
+        ("db_pool_checked_in", "checkedin", "Idle connections held by the pool."),
+        ("db_pool_overflow", "overflow", "Connections open beyond the pool size."),
+    ):
+        if hasattr(pool, attr):
+            # QueuePool.overflow() goes negative while the pool is below its size
+            lines += _gauge(name, help_text, max(0, getattr(pool, attr)()))
+
+    lines += ["# HELP cache_hits_total In-process cache hits.", "# TYPE cache_hits_total counter"]
+    caches = {"users": user_cache.stats(), "stats": stats_cache.stats()}
+    lines += [f"cache_hits_total{_labels(cache=name)} {stats['hits']}" for name, stats in caches.items()]
+    lines += ["# HELP cache_misses_total In-process cache misses.", "# TYPE cache_misses_total counter"]
+    lines += [f"cache_misses_total{_labels(cache=name)} {stats['misses']}" for name, stats in caches.items()]
+    lines += ["# HELP cache_entries Entries held by in-process caches.", "# TYPE cache_entries gauge"]
+    lines += [f"cache_entries{_labels(cache=name)} {stats['size']}" for name, stats in caches.items()]
+
+    lines += [
+        "# HELP rate_limit_rejected_total Requests refused by the rate limiter.",
+        "# TYPE rate_limit_rejected_total counter",
+        f"rate_limit_rejected_total{_labels(key='ip')} {ip_buckets.rejected}",
+        f"rate_limit_rejected_total{_labels(key='username')} {username_buckets.rejected}",
+    ]
+
+    loop = loop_monitor.stats()
+    lines += _gauge("event_loop_lag_p99_seconds", "Event-loop lag, 99th percentile of recent samples.",
+                    loop["lag_ms"]["p99"] / 1000)
+    lines += _gauge("event_loop_lag_max_seconds", "Largest event-loop lag seen.", loop["lag_ms"]["max"] / 1000)
+    lines += _gauge("event_loop_blocks_total", "Event-loop stalls past the threshold.", loop["blocks"], "counter")
+    lines += _gauge("threadpool_busy", "Threadpool tokens in use.", loop["threadpool"]["busy"])
+    lines += _gauge("threadpool_waiting", "Callers waiting for a threadpool token.", loop["threadpool"]["waiting"])
+
+    partitions = get_export_partitions()
+    # Read the manager without creating it: a scrape must not start an export worker pool
+    jobs = export_jobs._manager
+    job_counters = jobs.counters() if jobs is not None else {"started": 0, "cached": 0, "done": 0, "failed": 0}
+    lines += [
+        "# HELP export_partition_days_total Transaction export days read from a cached file or rebuilt.",
+        "# TYPE export_partition_days_total counter",
+        f"export_partition_days_total{_labels(result='reused')} {partitions.days_reused}",
+        f"export_partition_days_total{_labels(result='built')} {partitions.days_built}",
+        "# HELP export_jobs_total Background export requests by outcome.",
+        "# TYPE export_jobs_total counter",
+    ]
+    lines += [f"export_jobs_total{_labels(result=result)} {count}" for result, count in job_counters.items()]
+    return "\n".join(lines) + "\n"
+
+
+def _gauge(name: str, help_text: str, value, kind: str = "gauge") -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
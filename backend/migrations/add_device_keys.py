@@ -0,0 +1,37 @@
+"""add device_keys table for scanner and integration API keys
+
+Revision ID: 7b2d4f9e1c36
+Revises: 3c9f6e1a2b84
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4f9e1c36'
+down_revision = '3c9f6e1a2b84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'device_keys',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('key_id', sa.String(), nullable=False),
+        sa.Column('key_hash', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_device_keys_id', 'device_keys', ['id'])
+    op.create_index('ix_device_keys_key_id', 'device_keys', ['key_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_device_keys_key_id', table_name='device_keys')
+    op.drop_index('ix_device_keys_id', table_name='device_keys')
+    op.drop_table('device_keys')
@@ -0,0 +1,31 @@
+"""add indexes for item list filters and sort keys
+
+Revision ID: 5d1a8f3c6b27
+Revises: 2b7c4e91d3f0
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1a8f3c6b27'
+down_revision = '2b7c4e91d3f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sort keys of the item list (keyset paging on (key, id))
+    op.create_index('ix_items_name', 'items', ['name'])
+    op.create_index('ix_items_purchase_date', 'items', ['purchase_date'])
+    op.create_index('ix_items_expiry_date', 'items', ['expiry_date'])
+    # Location filter
+    op.create_index('ix_items_location', 'items', ['location'])
+
+
+def downgrade():
+    op.drop_index('ix_items_location', table_name='items')
+    op.drop_index('ix_items_expiry_date', table_name='items')
+    op.drop_index('ix_items_purchase_date', table_name='items')
+    op.drop_index('ix_items_name', table_name='items')
@@ -0,0 +1,32 @@
+"""add composite indexes for transaction and item queries
+
+Revision ID: 2b7c4e91d3f0
+Revises: 1234567890ab
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7c4e91d3f0'
+down_revision = '1234567890ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset paging and date-range export on transactions
+    op.create_index('ix_transactions_timestamp_id', 'transactions', ['timestamp', 'id'])
+    # Per-item and per-user history ordered by time
+    op.create_index('ix_transactions_item_id_timestamp', 'transactions', ['item_id', 'timestamp'])
+    op.create_index('ix_transactions_user_id_timestamp', 'transactions', ['user_id', 'timestamp'])
+    # Item listing filtered by category and state
+    op.create_index('ix_items_category_id_state', 'items', ['category_id', 'state'])
+
+
+def downgrade():
+    op.drop_index('ix_items_category_id_state', table_name='items')
+    op.drop_index('ix_transactions_user_id_timestamp', table_name='transactions')
+    op.drop_index('ix_transactions_item_id_timestamp', table_name='transactions')
+    op.drop_index('ix_transactions_timestamp_id', table_name='transactions')
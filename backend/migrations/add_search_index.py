@@ -0,0 +1,34 @@
+"""add FTS5 search tables and sync triggers
+
+Revision ID: 8e4b2a7d91c5
+Revises: 5d1a8f3c6b27
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+from backend.search_index import ITEMS_FTS, TRANSACTIONS_FTS, create_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2a7d91c5'
+down_revision = '5d1a8f3c6b27'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = [
+    'items_fts_ai', 'items_fts_ad', 'items_fts_au',
+    'transactions_fts_ai', 'transactions_fts_ad', 'transactions_fts_au',
+]
+
+
+def upgrade():
+    # Creates the tables and triggers, and builds the index from existing rows
+    create_search_index(op.get_bind())
+
+
+def downgrade():
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute(f'DROP TABLE IF EXISTS {TRANSACTIONS_FTS}')
+    op.execute(f'DROP TABLE IF EXISTS {ITEMS_FTS}')
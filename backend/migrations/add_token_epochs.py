@@ -0,0 +1,28 @@
+"""add token_epochs table for access token revocation
+
+Revision ID: 3c9f6e1a2b84
+Revises: 8e4b2a7d91c5
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9f6e1a2b84'
+down_revision = '8e4b2a7d91c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'token_epochs',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('epoch', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade():
+    op.drop_table('token_epochs')
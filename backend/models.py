@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean, Index
 import enum
 from sqlalchemy.orm import relationship
 from backend.base import Base
@@ -17,6 +17,32 @@ class User(Base):
 
     actions = relationship("Transaction", back_populates="user")
 
+class TokenEpoch(Base):
+    """Per-user revocation counter; access tokens carrying an older epoch are rejected.
+
+    Users without a row are at epoch 0.
+    """
+    __tablename__ = "token_epochs"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
+
+class DeviceKey(Base):
+    """API key for a scanning station or integration, acting as `user`.
+
+    Keys look like ``dk_<key_id>_<secret>``; only `key_id` and an HMAC of the
+    whole key are stored, so a leaked table can't be replayed.
+    """
+    __tablename__ = "device_keys"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    key_id = Column(String, unique=True, index=True, nullable=False)
+    key_hash = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+    user = relationship("User")
+
 class Category(Base):
     __tablename__ = "categories"
     id = Column(Integer, primary_key=True, index=True)
@@ -47,6 +73,16 @@ class Item(Base):
 
     transactions = relationship("Transaction", back_populates="item", cascade="all, delete-orphan")
 
+    # Filter and sort keys of the item list; SQLite appends the rowid (id) to
+    # each index, so ``ORDER BY <key>, id`` pages straight off the index.
+    __table_args__ = (
+        Index("ix_items_category_id_state", "category_id", "state"),
+        Index("ix_items_name", "name"),
+        Index("ix_items_location", "location"),
+        Index("ix_items_purchase_date", "purchase_date"),
+        Index("ix_items_expiry_date", "expiry_date"),
+    )
+
 class TransactionType(enum.Enum):
     sign_in = "sign_in"
     sign_out = "sign_out"
@@ -68,6 +104,14 @@ class Transaction(Base):
     item = relationship("Item", back_populates="transactions")
     user = relationship("User", back_populates="actions")
 
+    # Composite indexes matching the list/export query shapes: keyset paging on
+    # (timestamp, id) and per-item / per-user history ordered by time.
+    __table_args__ = (
+        Index("ix_transactions_timestamp_id", "timestamp", "id"),
+        Index("ix_transactions_item_id_timestamp", "item_id", "timestamp"),
+        Index("ix_transactions_user_id_timestamp", "user_id", "timestamp"),
+    )
+
 class Notification(Base):
     __tablename__ = "notifications"
     id = Column(Integer, primary_key=True, index=True)
@@ -75,3 +119,6 @@ class Notification(Base):
     message = Column(String)
     sent_at = Column(DateTime)
     read = Column(Boolean, default=False)
+
+# Registers the FTS5 search tables and triggers with Base.metadata.create_all
+from backend import search_index  # noqa: E402,F401
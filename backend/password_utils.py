@@ -1,11 +1,57 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
 # Support multiple schemes to avoid local environment issues with bcrypt backends.
 # pbkdf2_sha256 is pure-Python and very reliable; bcrypt is kept for verifying existing hashes.
 pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
 
+# Hashing is deliberately slow CPU work; the async wrappers run it in worker processes
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def get_password_pool() -> ProcessPoolExecutor:
+    """The process pool used by the async wrappers, started on first use.
+
+    Workers are spawned rather than forked so they never inherit the server's
+    threads or locks.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+def shutdown_password_pool() -> None:
+    """Stop the worker processes, if they were started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash` on the process pool, so the event loop keeps serving requests."""
+    return await asyncio.get_running_loop().run_in_executor(get_password_pool(), get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the process pool, so the event loop keeps serving requests."""
+    return await asyncio.get_running_loop().run_in_executor(
+        get_password_pool(), verify_password, plain_password, hashed_password
+    )
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional
+
+from starlette.formparsers import MultiPartException
+from starlette.requests import Request
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1").lower() in ("1", "true", "yes")
+# Comma-separated paths that are limited; each path has its own buckets
+RATE_LIMIT_PATHS = [p.strip() for p in os.environ.get("RATE_LIMIT_PATHS", "/api/v1/auth/token").split(",") if p.strip()]
+RATE_LIMIT_IP_PER_MINUTE = float(os.environ.get("RATE_LIMIT_IP_PER_MINUTE", "30"))
+RATE_LIMIT_IP_BURST = int(os.environ.get("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_USERNAME_PER_MINUTE = float(os.environ.get("RATE_LIMIT_USERNAME_PER_MINUTE", "10"))
+RATE_LIMIT_USERNAME_BURST = int(os.environ.get("RATE_LIMIT_USERNAME_BURST", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Larger form posts to a limited path are refused with 413, so padding a login
+# form can't hide its username from the per-username buckets
+_MAX_FORM_BYTES = 16 * 1024
+# Both encodings OAuth2PasswordRequestForm accepts
+_FORM_TYPES = (b"application/x-www-form-urlencoded", b"multipart/form-data")
+
+
+class TokenBuckets:
+    """Thread-safe token buckets, one per key, refilled at `per_minute` up to `burst`.
+
+    Each bucket is a `(tokens, updated_at)` tuple kept in least-recently-used
+    order, so buckets idle long enough to be full again are evicted from the
+    front on every call; `max_keys` bounds memory when many keys are active.
+    """
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = RATE_LIMIT_MAX_KEYS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._clock = clock
+        self._idle = burst / self.rate if self.rate > 0 else math.inf
+        self._buckets: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: Hashable) -> float:
+        """Take a token for `key`: 0 if allowed, else the seconds until one is available."""
+        with self._lock:
+            now = self._clock()
+            self._evict(now)
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            return (1 - tokens) / self.rate if self.rate > 0 else math.inf
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self._idle and len(self._buckets) < self.max_keys:
+                break
+            del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+ip_buckets = TokenBuckets(RATE_LIMIT_IP_PER_MINUTE, RATE_LIMIT_IP_BURST)
+username_buckets = TokenBuckets(RATE_LIMIT_USERNAME_PER_MINUTE, RATE_LIMIT_USERNAME_BURST)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware rejecting over-limit requests to `paths` with 429.
+
+    Every request to a limited path takes a token from its client IP's bucket;
+    form posts carrying a `username` field (the login form, urlencoded or
+    multipart) also take one from that username's bucket, so one account can't be guessed at from many
+    addresses. Form posts over 16 KiB are refused with 413 rather than passed
+    through unchecked. The check runs before routing, so rejected requests
+    never reach the database or password hashing.
+    """
+
+    def __init__(self, app, paths: Optional[Iterable[str]] = None,
+                 by_ip: Optional[TokenBuckets] = None, by_username: Optional[TokenBuckets] = None):
+        self.app = app
+        self.paths = frozenset(RATE_LIMIT_PATHS if paths is None else paths)
+        self.by_ip = ip_buckets if by_ip is None else by_ip
+        self.by_username = username_buckets if by_username is None else by_username
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        client = scope.get("client")
+        retry_after = self.by_ip.take((path, client[0] if client else None))
+        if not retry_after and scope["method"] == "POST" and _is_form(scope):
+            body, receive = await _buffer_body(receive)
+            if body is None:
+                await _reject(send, 413, "Request body too large")
+                return
+            username = await _form_username(scope, body)
+            if username:
+                retry_after = self.by_username.take((path, username))
+
+        if retry_after:
+            retry_header = str(max(1, math.ceil(min(retry_after, 3600)))).encode()
+            await _reject(send, 429, "Too many requests, try again later", [(b"retry-after", retry_header)])
+            return
+        await self.app(scope, receive, send)
+
+
+def _is_form(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            return value.split(b";")[0].strip().lower() in _FORM_TYPES
+    return False
+
+
+async def _buffer_body(receive):
+    """Read the request body and return it with a `receive` that replays it.
+
+    The body is None if it is larger than `_MAX_FORM_BYTES`.
+    """
+    chunks, size, more = [], 0, True
+    messages = []
+    while more:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        more = message.get("more_body", False)
+        if size > _MAX_FORM_BYTES:
+            break
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return (b"".join(chunks) if size <= _MAX_FORM_BYTES else None), replay
+
+
+async def _form_username(scope, body: bytes) -> Optional[str]:
+    """The `username` the route will see in `body`.
+
+    Parsed with Starlette's own form parser, so a repeated field resolves to the
+    same (last) value the login route authenticates.
+    """
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def replay():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    try:
+        form = await Request(scope, replay).form()
+    except MultiPartException:
+        # The route fails to parse it as well
+        return None
+    try:
+        username = form.get("username")
+        return username.strip() if isinstance(username, str) and username.strip() else None
+    finally:
+        await form.close()
+
+
+async def _reject(send, status: int, detail: str, headers: Optional[list] = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *(headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
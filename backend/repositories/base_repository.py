@@ -1,11 +1,22 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Type, TypeVar, Union
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from .unit_of_work import in_unit_of_work
+
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
+def _to_update_data(obj_in: Any) -> Dict[str, Any]:
+    if hasattr(obj_in, "model_dump"):
+        return obj_in.model_dump(exclude_unset=True)
+    if hasattr(obj_in, "dict"):
+        return obj_in.dict(exclude_unset=True)
+    return obj_in
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base repository class with common CRUD operations."""
     
@@ -16,6 +27,22 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, id: Any) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
+    def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """Return which of `ids` exist, in one query."""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {row_id for (row_id,) in self.db.query(self.model.id).filter(self.model.id.in_(ids))}
+
+    def commit(self, db_obj: Optional[ModelType] = None) -> None:
+        """Commit and refresh `db_obj`, or only flush inside a `UnitOfWork`."""
+        if in_unit_of_work(self.db):
+            self.db.flush()
+            return
+        self.db.commit()
+        if db_obj is not None:
+            self.db.refresh(db_obj)
+
     def get_multi(
         self, *, skip: int = 0, limit: int = 100, **filters
     ) -> List[ModelType]:
@@ -29,34 +56,88 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = obj_in.model_dump() if hasattr(obj_in, "model_dump") else obj_in.dict()
         db_obj = self.model(**obj_in_data, **kwargs)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self.commit(db_obj)
         return db_obj
 
     def update(
         self, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        if hasattr(obj_in, "model_dump"):
-            obj_data = obj_in.model_dump(exclude_unset=True)
-        elif hasattr(obj_in, 'dict'):
-            obj_data = obj_in.dict(exclude_unset=True)
-        else:
-            obj_data = obj_in
+        obj_data = _to_update_data(obj_in)
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self.commit(db_obj)
+        # Relationships don't follow a changed foreign key until they are reloaded
+        for rel in inspect(self.model).relationships:
+            if any(col.key in obj_data for col in rel.local_columns):
+                self.db.expire(db_obj, [rel.key])
         return db_obj
 
     def remove(self, *, id: int) -> ModelType:
         obj = self.db.get(self.model, id)
         if obj:
             self.db.delete(obj)
-            self.db.commit()
+            self.commit()
         return obj
 
     def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
         if not hasattr(self.model, field):
             raise ValueError(f"{self.model.__name__} has no attribute {field}")
         return self.db.query(self.model).filter(getattr(self.model, field) == value).first()
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Async counterpart of `BaseRepository` built on an `AsyncSession`.
+
+    Relationships are never lazy-loaded under asyncio, so subclasses must eager-load
+    anything the caller will serialize.
+    """
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        return await self.db.get(self.model, id)
+
+    async def get_multi(
+        self, *, skip: int = 0, limit: int = 100, **filters
+    ) -> List[ModelType]:
+        stmt = select(self.model)
+        for field, value in filters.items():
+            if hasattr(self.model, field):
+                stmt = stmt.filter(getattr(self.model, field) == value)
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def create(self, obj_in: CreateSchemaType, **kwargs) -> ModelType:
+        obj_in_data = obj_in.model_dump() if hasattr(obj_in, "model_dump") else obj_in.dict()
+        db_obj = self.model(**obj_in_data, **kwargs)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        for field, value in _to_update_data(obj_in).items():
+            setattr(db_obj, field, value)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, *, id: int) -> ModelType:
+        obj = await self.db.get(self.model, id)
+        if obj:
+            await self.db.delete(obj)
+            await self.db.commit()
+        return obj
+
+    async def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
+        if not hasattr(self.model, field):
+            raise ValueError(f"{self.model.__name__} has no attribute {field}")
+        result = await self.db.execute(
+            select(self.model).filter(getattr(self.model, field) == value).limit(1)
+        )
+        return result.scalars().first()
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .base_repository import BaseRepository
 from ..models import Category
@@ -22,3 +22,7 @@ class CategoryRepository(BaseRepository[Category, CategoryCreate, CategoryUpdate
             List of Category objects
         """
         return self.db.query(self.model).offset(skip).limit(limit).all()
+
+    def get_ids_by_name(self) -> Dict[str, int]:
+        """Map lower-cased category names to ids with one query."""
+        return {name.lower(): category_id for category_id, name in self.db.query(self.model.id, self.model.name)}
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from .base_repository import BaseRepository
+from ..models import DeviceKey
+
+
+class DeviceKeyRepository(BaseRepository[DeviceKey, dict, dict]):
+    """Device API keys."""
+
+    def __init__(self, db: Session):
+        super().__init__(DeviceKey, db)
+
+    def get_active_by_key_id(self, key_id: str) -> Optional[DeviceKey]:
+        """The unrevoked key with `key_id` and its user, in one indexed query."""
+        return (
+            self.db.query(self.model)
+            .options(joinedload(self.model.user))
+            .filter(self.model.key_id == key_id, self.model.revoked_at.is_(None))
+            .first()
+        )
+
+    def list(self, user_id: Optional[int] = None) -> List[DeviceKey]:
+        query = self.db.query(self.model)
+        if user_id is not None:
+            query = query.filter(self.model.user_id == user_id)
+        return query.order_by(self.model.id).all()
+
+    def add(self, **values) -> DeviceKey:
+        device_key = DeviceKey(**values)
+        self.db.add(device_key)
+        self.commit(device_key)
+        return device_key
+
+    def revoke(self, device_key: DeviceKey) -> DeviceKey:
+        if device_key.revoked_at is None:
+            device_key.revoked_at = datetime.utcnow()
+            self.commit(device_key)
+        return device_key
@@ -1,10 +1,94 @@
+from datetime import datetime
+from sqlalchemy import and_, case, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from .base_repository import BaseRepository
-from ..models import Item
+from .base_repository import AsyncBaseRepository, BaseRepository
+from ..models import Category, Item, ItemState
 from ..schemas import ItemCreate, ItemUpdate
 
+# Sort keys accepted by the item list. Each column has an index whose implicit
+# trailing rowid makes ``ORDER BY key, id`` a plain index walk.
+SORT_COLUMNS = {
+    "id": Item.id,
+    "unique_id": Item.unique_id,
+    "name": Item.name,
+    "purchase_date": Item.purchase_date,
+    "expiry_date": Item.expiry_date,
+}
+
+# Columns of the item export, read through one join instead of ORM objects
+EXPORT_COLUMNS = (
+    Item.id,
+    Item.unique_id,
+    Item.name,
+    Item.description,
+    Category.name.label("category"),
+    Item.state,
+    Item.location,
+    Item.purchase_date,
+    Item.expiry_date,
+)
+
+
+def item_criteria(
+    *,
+    category_id: Optional[int] = None,
+    state: Optional[ItemState] = None,
+    location: Optional[str] = None,
+    name: Optional[str] = None,
+    purchase_from: Optional[datetime] = None,
+    purchase_to: Optional[datetime] = None,
+    expiry_from: Optional[datetime] = None,
+    expiry_to: Optional[datetime] = None,
+) -> list:
+    """WHERE clauses for the item list filters; shared by the sync and async repositories."""
+    criteria = []
+    if category_id is not None:
+        criteria.append(Item.category_id == category_id)
+    if state is not None:
+        criteria.append(Item.state == state)
+    if location is not None:
+        criteria.append(Item.location == location)
+    if name:
+        criteria.append(Item.name.ilike(f"%{name}%"))
+    if purchase_from is not None:
+        criteria.append(Item.purchase_date >= purchase_from)
+    if purchase_to is not None:
+        criteria.append(Item.purchase_date <= purchase_to)
+    if expiry_from is not None:
+        criteria.append(Item.expiry_date >= expiry_from)
+    if expiry_to is not None:
+        criteria.append(Item.expiry_date <= expiry_to)
+    return criteria
+
+
+def item_order(sort: str = "id", descending: bool = False) -> tuple:
+    """ORDER BY for a sort key, with id as tie-breaker.
+
+    NULLs sort first ascending and last descending (SQLite's native order, spelled
+    out so other backends page the same way).
+    """
+    column = SORT_COLUMNS[sort]
+    if descending:
+        return column.desc().nulls_last(), Item.id.desc()
+    return column.asc().nulls_first(), Item.id.asc()
+
+
+def item_keyset(sort: str, value: Any, last_id: int, descending: bool = False):
+    """WHERE clause selecting rows after `(value, last_id)` in `item_order(sort, descending)`."""
+    column = SORT_COLUMNS[sort]
+    if sort == "id":
+        return Item.id < last_id if descending else Item.id > last_id
+    if value is None:
+        if descending:
+            return and_(column.is_(None), Item.id < last_id)
+        return or_(and_(column.is_(None), Item.id > last_id), column.isnot(None))
+    if descending:
+        return or_(tuple_(column, Item.id) < (value, last_id), column.is_(None))
+    return tuple_(column, Item.id) > (value, last_id)
+
 class ItemRepository(BaseRepository[Item, ItemCreate, ItemUpdate]):
     """Repository for item-related database operations."""
 
@@ -28,3 +112,168 @@ class ItemRepository(BaseRepository[Item, ItemCreate, ItemUpdate]):
             .limit(limit)
             .all()
         )
+
+    def get_page(
+        self,
+        *,
+        limit: int = 100,
+        sort: str = "id",
+        descending: bool = False,
+        after: Optional[Tuple[Any, int]] = None,
+        **filters,
+    ) -> List[Item]:
+        """Get one keyset page of items with their categories.
+
+        Args:
+            limit: Maximum number of items to return
+            sort: Key from `SORT_COLUMNS`; ties are broken by id
+            descending: Reverse the sort order
+            after: ``(sort value, id)`` of the last row of the previous page
+            **filters: Keyword arguments of `item_criteria`
+
+        Returns:
+            List of Item objects with their categories loaded
+        """
+        criteria = item_criteria(**filters)
+        if after is not None:
+            criteria.append(item_keyset(sort, after[0], after[1], descending))
+        return (
+            self.db.query(self.model)
+            .options(joinedload(Item.category))
+            .filter(*criteria)
+            .order_by(*item_order(sort, descending))
+            .limit(limit)
+            .all()
+        )
+
+    def get_by_ids(self, ids: List[int]) -> List[Item]:
+        """Get items by id with categories loaded, in the order of `ids`."""
+        if not ids:
+            return []
+        rows = {
+            item.id: item
+            for item in self.db.query(self.model).options(joinedload(Item.category)).filter(self.model.id.in_(ids))
+        }
+        return [rows[i] for i in ids if i in rows]
+
+    def count(self, **filters) -> int:
+        """Count items matching `item_criteria` filters (no joins or ordering)."""
+        return self.db.query(func.count(self.model.id)).filter(*item_criteria(**filters)).scalar()
+
+    def iter_export_rows(self, batch_size: int = 1000, **filters) -> Iterator[tuple]:
+        """Stream `EXPORT_COLUMNS` tuples for items matching `item_criteria` filters, by id.
+
+        Rows are fetched from a streaming cursor `batch_size` at a time, so
+        memory stays flat however large the catalog is.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .outerjoin(Category, Category.id == Item.category_id)
+            .where(*item_criteria(**filters))
+            .order_by(Item.id)
+        )
+        result = self.db.execute(stmt, execution_options={"stream_results": True})
+        try:
+            yield from result.yield_per(batch_size)
+        finally:
+            result.close()
+
+    def get_existing_unique_ids(self, unique_ids: Iterable[str]) -> Set[str]:
+        """Return which of `unique_ids` are already taken, in one query."""
+        unique_ids = list(unique_ids)
+        if not unique_ids:
+            return set()
+        rows = self.db.query(self.model.unique_id).filter(self.model.unique_id.in_(unique_ids))
+        return {unique_id for (unique_id,) in rows}
+
+    def bulk_insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert many items with a single executemany INSERT (no ORM objects)."""
+        if rows:
+            self.db.execute(self.model.__table__.insert(), rows)
+            self.commit()
+
+    def set_states(self, states: Dict[int, ItemState]) -> None:
+        """Set each item's state with one UPDATE ... CASE statement."""
+        if not states:
+            return
+        # The Enum column stores member names; CASE branches are plain literals
+        self.db.execute(
+            update(self.model)
+            .where(self.model.id.in_(states))
+            .values(state=case({i: s.name for i, s in states.items()}, value=self.model.id))
+            .execution_options(synchronize_session=False)
+        )
+        # Items already loaded in this session would otherwise keep their old state
+        for item_id in states:
+            item = self.db.identity_map.get(self.db.identity_key(self.model, item_id))
+            if item is not None:
+                self.db.expire(item, ["state"])
+        self.commit()
+
+    def count_by_state(self) -> Dict[ItemState, int]:
+        """Number of items per state (GROUP BY, served by the category/state index)."""
+        rows = self.db.query(self.model.state, func.count(self.model.id)).group_by(self.model.state)
+        return dict(rows.all())
+
+    def count_by_category(self) -> List[Tuple[Optional[int], Optional[str], int]]:
+        """`(category_id, category_name, count)` per category; uncategorised items have None."""
+        return (
+            self.db.query(self.model.category_id, Category.name, func.count(self.model.id))
+            .outerjoin(Category, Category.id == self.model.category_id)
+            .group_by(self.model.category_id, Category.name)
+            .order_by(func.count(self.model.id).desc())
+            .all()
+        )
+
+    def count_by_location(self) -> List[Tuple[Optional[str], int]]:
+        """`(location, count)` per distinct location, largest first."""
+        return (
+            self.db.query(self.model.location, func.count(self.model.id))
+            .group_by(self.model.location)
+            .order_by(func.count(self.model.id).desc())
+            .all()
+        )
+
+
+class AsyncItemRepository(AsyncBaseRepository[Item, ItemCreate, ItemUpdate]):
+    """Async repository for item reads on an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Item, db)
+
+    async def get_all_items(self, skip: int = 0, limit: int = 100) -> List[Item]:
+        """Async variant of `ItemRepository.get_all_items`."""
+        result = await self.db.execute(
+            select(self.model)
+            .options(joinedload(Item.category))
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def get_page(
+        self,
+        *,
+        limit: int = 100,
+        sort: str = "id",
+        descending: bool = False,
+        after: Optional[Tuple[Any, int]] = None,
+        **filters,
+    ) -> List[Item]:
+        """Async variant of `ItemRepository.get_page`."""
+        criteria = item_criteria(**filters)
+        if after is not None:
+            criteria.append(item_keyset(sort, after[0], after[1], descending))
+        result = await self.db.execute(
+            select(self.model)
+            .options(joinedload(Item.category))
+            .filter(*criteria)
+            .order_by(*item_order(sort, descending))
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def count(self, **filters) -> int:
+        """Async variant of `ItemRepository.count`."""
+        result = await self.db.execute(select(func.count(self.model.id)).filter(*item_criteria(**filters)))
+        return result.scalar_one()
@@ -0,0 +1,65 @@
+import os
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Tuple
+
+from ..search_index import ITEMS_FTS, TRANSACTIONS_FTS
+
+# bm25 column weights for items_fts (name, description, unique_id, location)
+ITEM_WEIGHTS = (10.0, 1.0, 10.0, 2.0)
+
+# Ranking scores every candidate row, so it is bounded: only the newest
+# SEARCH_RANK_CANDIDATES matches are ranked. Selective queries are ranked exactly.
+SEARCH_RANK_CANDIDATES = int(os.environ.get("SEARCH_RANK_CANDIDATES", "2000"))
+
+# (rowid, score); higher scores rank first
+SearchRow = Tuple[int, float]
+
+
+def to_match_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every term must match as a prefix.
+
+    Terms are runs of word characters, '-' and '_' (the index's token
+    characters). Each is quoted, so user input can't inject FTS5 syntax
+    (quotes, NEAR, column filters) or fail to parse.
+    """
+    terms = (term.strip("-_") for term in re.findall(r"[\w-]+", q))
+    return " ".join(f'"{term}"*' for term in terms if term)
+
+
+class SearchRepository:
+    """Ranked full-text lookups against the FTS5 tables in `backend.search_index`."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _search(self, table: str, weights: Tuple[float, ...], match: str, limit: int, offset: int) -> List[SearchRow]:
+        bm25_args = "".join(f", {w}" for w in weights)
+        # The inner query walks the doclist newest-first and stops at the
+        # candidate cap; only those rows are scored and sorted.
+        rows = self.db.execute(
+            text(
+                f"SELECT rowid, -score FROM ("
+                f"SELECT rowid, bm25({table}{bm25_args}) AS score FROM {table} "
+                f"WHERE {table} MATCH :match ORDER BY rowid DESC LIMIT :candidates"
+                f") ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset"
+            ),
+            {
+                "match": match,
+                "candidates": max(SEARCH_RANK_CANDIDATES, offset + limit),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return [tuple(row) for row in rows]
+
+    def search_items(self, q: str, limit: int = 20, offset: int = 0) -> List[SearchRow]:
+        """Items whose name, description, unique_id or location match `q`, best first."""
+        match = to_match_query(q)
+        return self._search(ITEMS_FTS, ITEM_WEIGHTS, match, limit, offset) if match else []
+
+    def search_transactions(self, q: str, limit: int = 20, offset: int = 0) -> List[SearchRow]:
+        """Transactions whose notes match `q`, best first."""
+        match = to_match_query(q)
+        return self._search(TRANSACTIONS_FTS, (), match, limit, offset) if match else []
@@ -0,0 +1,40 @@
+from typing import Dict
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .base_repository import BaseRepository
+from ..models import TokenEpoch
+
+
+class TokenEpochRepository(BaseRepository[TokenEpoch, dict, dict]):
+    """Per-user access token epochs."""
+
+    def __init__(self, db: Session):
+        super().__init__(TokenEpoch, db)
+
+    def get_all(self) -> Dict[int, int]:
+        """Every stored epoch as ``{user_id: epoch}``; users not listed are at 0."""
+        return dict(self.db.query(self.model.user_id, self.model.epoch).all())
+
+    def bump(self, user_id: int) -> int:
+        """Increment a user's epoch, creating the row at 1, and return the new value."""
+        for _ in range(2):
+            result = self.db.execute(
+                update(self.model)
+                .where(self.model.user_id == user_id)
+                .values(epoch=self.model.epoch + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                break
+            try:
+                # A concurrent first bump may insert the row first; the retry then updates it
+                with self.db.begin_nested():
+                    self.db.add(TokenEpoch(user_id=user_id, epoch=1))
+                break
+            except IntegrityError:
+                continue
+        self.commit()
+        return self.db.query(self.model.epoch).filter(self.model.user_id == user_id).scalar()
@@ -1,26 +1,264 @@
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime
 
-from .base_repository import BaseRepository
-from ..models import Transaction
+from .base_repository import AsyncBaseRepository, BaseRepository
+from ..models import Item, ItemState, Transaction, TransactionType, User
 from ..schemas import TransactionCreate, TransactionUpdate
 
+# ``TransactionRead`` nests ``ItemRead``/``CategoryRead``/``UserRead``; loading
+# them in the same SELECT avoids one lazy load per relationship per row.
+EAGER_RELATIONS = (
+    joinedload(Transaction.item).joinedload(Item.category),
+    joinedload(Transaction.user),
+)
+
+# Columns of the transaction export, read through one join instead of ORM objects
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.item_id,
+    Item.unique_id.label("item_unique_id"),
+    Transaction.user_id,
+    User.username,
+    Transaction.action,
+    Transaction.state,
+    Transaction.timestamp,
+    Transaction.notes,
+    Transaction.image_url,
+)
+
+# Rows per multi-row INSERT; keeps bound parameters well under SQLite's limit
+BULK_INSERT_CHUNK = 100
+
+# Newest first; matches the (timestamp, id) index so pages need no sort step
+PAGE_ORDER = (Transaction.timestamp.desc(), Transaction.id.desc())
+
+
+def page_criteria(
+    *,
+    after: Optional[Tuple[datetime, int]] = None,
+    item_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[TransactionType] = None,
+    state: Optional[ItemState] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> list:
+    """WHERE clauses for one keyset page; shared by the sync and async repositories."""
+    criteria = []
+    if item_id is not None:
+        criteria.append(Transaction.item_id == item_id)
+    if user_id is not None:
+        criteria.append(Transaction.user_id == user_id)
+    if action is not None:
+        criteria.append(Transaction.action == action)
+    if state is not None:
+        criteria.append(Transaction.state == state)
+    if start is not None:
+        criteria.append(Transaction.timestamp >= start)
+    if end is not None:
+        criteria.append(Transaction.timestamp <= end)
+    if after is not None:
+        criteria.append(tuple_(Transaction.timestamp, Transaction.id) < tuple(after))
+    return criteria
+
 class TransactionRepository(BaseRepository[Transaction, TransactionCreate, TransactionUpdate]):
     """Repository for transaction-related database operations."""
 
     def __init__(self, db: Session):
         super().__init__(Transaction, db)
 
+    def _query_with_relations(self):
+        """Base query that eagerly loads the item (with its category) and the user."""
+        return self.db.query(self.model).options(*EAGER_RELATIONS)
+
     def get_all_transactions(self) -> List[Transaction]:
         """Get all transactions from the database."""
-        return self.db.query(self.model).all()
+        return self._query_with_relations().all()
+
+    def get_transactions(self, skip: int = 0, limit: int = 100) -> List[Transaction]:
+        """Get paginated transactions, eagerly loading item, category and user.
+
+        Args:
+            skip: Number of transactions to skip (for pagination)
+            limit: Maximum number of transactions to return (for pagination)
+
+        Returns:
+            List of Transaction objects with their relationships loaded
+        """
+        return (
+            self._query_with_relations()
+            .order_by(self.model.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
     def get_by_date_range(self, start: datetime, end: datetime) -> List[Transaction]:
         """Get transactions within an inclusive datetime range."""
         return (
-            self.db.query(self.model)
-            .filter(self.model.timestamp >= start)
-            .filter(self.model.timestamp <= end)
+            self._query_with_relations()
+            .filter(*page_criteria(start=start, end=end))
             .all()
         )
+
+    def count_by_action(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[TransactionType, int]:
+        """Number of transactions per action within an optional inclusive time range."""
+        rows = (
+            self.db.query(self.model.action, func.count(self.model.id))
+            .filter(*page_criteria(start=start, end=end))
+            .group_by(self.model.action)
+        )
+        return dict(rows.all())
+
+    def range_version(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """``(row count, highest id)`` of a time range, read from the timestamp index.
+
+        Transactions are append-only, so the pair changes whenever the range's
+        rows do and serves as its data version.
+        """
+        count, max_id = (
+            self.db.query(func.count(self.model.id), func.max(self.model.id))
+            .filter(*page_criteria(start=start, end=end))
+            .one()
+        )
+        return count, max_id or 0
+
+    def day_versions(self, start: datetime, end: datetime) -> Dict[date, Tuple[int, int]]:
+        """``(row count, highest id)`` per calendar day of a time range; days without rows are absent."""
+        day = func.date(self.model.timestamp)
+        rows = (
+            self.db.query(day, func.count(self.model.id), func.max(self.model.id))
+            .filter(*page_criteria(start=start, end=end))
+            .group_by(day)
+        )
+        return {date.fromisoformat(str(d)): (count, max_id) for d, count, max_id in rows}
+
+    def iter_export_rows(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[tuple]:
+        """Stream `EXPORT_COLUMNS` tuples for a time range, oldest first.
+
+        Rows are fetched from a streaming cursor `batch_size` at a time, so
+        memory stays flat however many rows the range holds.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .outerjoin(Item, Item.id == Transaction.item_id)
+            .outerjoin(User, User.id == Transaction.user_id)
+            .where(*page_criteria(start=start, end=end))
+            .order_by(Transaction.timestamp, Transaction.id)
+        )
+        result = self.db.execute(stmt, execution_options={"stream_results": True})
+        try:
+            yield from result.yield_per(batch_size)
+        finally:
+            result.close()
+
+    def get_by_ids(self, ids: List[int]) -> List[Transaction]:
+        """Get transactions by id with relationships loaded, in the order of `ids`."""
+        if not ids:
+            return []
+        rows = {t.id: t for t in self._query_with_relations().filter(self.model.id.in_(ids))}
+        return [rows[i] for i in ids if i in rows]
+
+    def bulk_insert(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many transactions with multi-row INSERTs and return their ids in order.
+
+        Each chunk is a single ``INSERT ... VALUES (...), (...)`` statement. SQLite
+        assigns rowids sequentially within a statement, so the ids of a chunk are
+        the ``len(chunk)`` values ending at ``lastrowid``; other backends use RETURNING.
+        """
+        ids: List[int] = []
+        returning = self.db.get_bind().dialect.name != "sqlite"
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            chunk = rows[start:start + BULK_INSERT_CHUNK]
+            stmt = insert(self.model).values(chunk)
+            if returning:
+                ids.extend(self.db.execute(stmt.returning(self.model.id)).scalars())
+            else:
+                last = self.db.execute(stmt).lastrowid
+                ids.extend(range(last - len(chunk) + 1, last + 1))
+        self.commit()
+        return ids
+
+    def get_page(
+        self,
+        *,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
+        item_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[TransactionType] = None,
+        state: Optional[ItemState] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Transaction]:
+        """Get one keyset page of transactions, newest first.
+
+        Rows are ordered by ``(timestamp, id)`` descending and ``after`` is the
+        ``(timestamp, id)`` of the last row of the previous page, so every page
+        is a bounded index range scan instead of an ever-growing OFFSET.
+
+        Args:
+            limit: Maximum number of transactions to return
+            after: Keyset position to continue from (exclusive)
+            item_id, user_id, action, state: Optional equality filters
+            start, end: Optional inclusive timestamp bounds
+
+        Returns:
+            List of Transaction objects with their relationships loaded
+        """
+        return (
+            self._query_with_relations()
+            .filter(*page_criteria(
+                after=after, item_id=item_id, user_id=user_id,
+                action=action, state=state, start=start, end=end,
+            ))
+            .order_by(*PAGE_ORDER)
+            .limit(limit)
+            .all()
+        )
+
+
+class AsyncTransactionRepository(AsyncBaseRepository[Transaction, TransactionCreate, TransactionUpdate]):
+    """Async repository for transaction reads on an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Transaction, db)
+
+    async def get_page(
+        self,
+        *,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
+        item_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[TransactionType] = None,
+        state: Optional[ItemState] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Transaction]:
+        """Async variant of `TransactionRepository.get_page`."""
+        result = await self.db.execute(
+            select(self.model)
+            .options(*EAGER_RELATIONS)
+            .filter(*page_criteria(
+                after=after, item_id=item_id, user_id=user_id,
+                action=action, state=state, start=start, end=end,
+            ))
+            .order_by(*PAGE_ORDER)
+            .limit(limit)
+        )
+        return result.unique().scalars().all()
+
+    async def get_by_date_range(self, start: datetime, end: datetime) -> List[Transaction]:
+        """Async variant of `TransactionRepository.get_by_date_range`."""
+        result = await self.db.execute(
+            select(self.model)
+            .options(*EAGER_RELATIONS)
+            .filter(*page_criteria(start=start, end=end))
+        )
+        return result.unique().scalars().all()
@@ -0,0 +1,53 @@
+from sqlalchemy.orm import Session
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """True while `db` is inside a `UnitOfWork` block."""
+    return db.info.get(_DEPTH_KEY, 0) > 0
+
+
+class UnitOfWork:
+    """Group repository writes on one session into a single commit.
+
+    Inside the block repositories only flush (which assigns primary keys and
+    surfaces constraint errors), and the outermost block commits once on a clean
+    exit or rolls back on an exception. Nested blocks join the outer one, so a
+    service that opens its own unit of work can still be composed into a larger one.
+
+    Usage:
+        with UnitOfWork(db):
+            transaction = repo.create(obj_in)
+            item.state = obj_in.state
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def __enter__(self) -> "UnitOfWork":
+        self.db.info[_DEPTH_KEY] = self.db.info.get(_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        depth = self.db.info[_DEPTH_KEY] - 1
+        self.db.info[_DEPTH_KEY] = depth
+        if depth > 0:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.db.rollback()
+
+    def commit(self) -> None:
+        """Commit without expiring loaded objects.
+
+        Everything in the identity map was just flushed by this session, so the
+        values are already current and no refresh SELECTs are needed afterwards.
+        """
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
@@ -29,20 +29,30 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
     
     def authenticate(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user with username and password."""
+        user = self.get_for_login(username)
+        if not user:
+            return None
+        return user if self.check_login_password(user, verify_password(password, user.hashed_password)) else None
+    
+    def get_for_login(self, username: str) -> Optional[User]:
+        """Look up the user for a login attempt, logging the attempt and a missing user."""
         logger.info(f"Attempting to authenticate user: {username}")
         user = self.get_by_username(username)
         if not user:
             logger.warning(f"Authentication failed: User '{username}' not found.")
             return None
-        
         logger.info(f"User '{username}' found. Verifying password.")
-        if not verify_password(password, user.hashed_password):
-            logger.warning(f"Authentication failed: Incorrect password for user '{username}'.")
-            return None
-            
-        logger.info(f"Password verification successful for user '{username}'.")
         return user
     
+    @staticmethod
+    def check_login_password(user: User, verified: bool) -> bool:
+        """Log the outcome of a login's password check and return it."""
+        if not verified:
+            logger.warning(f"Authentication failed: Incorrect password for user '{user.username}'.")
+            return False
+        logger.info(f"Password verification successful for user '{user.username}'.")
+        return True
+    
     def create(self, obj_in: UserCreate, hashed_password: str) -> User:
         """Create a new user with hashed password."""
         db_user = User(
@@ -54,8 +64,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             is_active=obj_in.is_active
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        self.commit(db_user)
         return db_user
     
     def update_password(self, user_id: int, hashed_password: str) -> Optional[User]:
@@ -64,6 +73,5 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         if not user:
             return None
         user.hashed_password = hashed_password
-        self.db.commit()
-        self.db.refresh(user)
+        self.commit(user)
         return user
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from pydantic.config import ConfigDict
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from datetime import datetime
 from .models import ItemState, TransactionType
 from .shared_enums import UserRole
@@ -38,6 +38,34 @@ class UserInDB(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TokenUser(BaseModel):
+    """The current user as described by access token claims (JWT claims mode)."""
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool = True
+
+
+class DeviceKeyCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    # Superadmins may issue keys acting as another user; defaults to the caller
+    user_id: Optional[int] = None
+
+class DeviceKeyRead(BaseModel):
+    id: int
+    name: str
+    key_id: str
+    user_id: int
+    created_at: datetime
+    revoked_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class DeviceKeyIssued(DeviceKeyRead):
+    """A newly issued key; `key` is only ever shown in this response."""
+    key: str
+
+
 class CategoryBase(BaseModel):
     name: str
     description: Optional[str]
@@ -83,6 +111,78 @@ class ItemUpdate(BaseModel):
     purchase_date: Optional[datetime] = None
     expiry_date: Optional[datetime] = None
 
+class ItemSuggestion(BaseModel):
+    id: int
+    unique_id: str
+    name: str
+
+class ItemPage(BaseModel):
+    items: List[ItemRead]
+    next_cursor: Optional[str] = None
+    total: int
+
+class ItemImportError(BaseModel):
+    row: int
+    unique_id: Optional[str] = None
+    error: str
+
+class ItemImportReport(BaseModel):
+    created: int = 0
+    failed: int = 0
+    errors: List[ItemImportError] = []
+
+class CategoryCount(BaseModel):
+    category_id: Optional[int] = None
+    name: Optional[str] = None
+    count: int
+
+class LocationCount(BaseModel):
+    location: Optional[str] = None
+    count: int
+
+class ItemStatsRead(BaseModel):
+    total: int
+    by_state: Dict[str, int]
+    by_category: List[CategoryCount]
+    by_location: List[LocationCount]
+    window_days: int
+    transactions_by_action: Dict[str, int]
+
+class CacheStatsRead(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+class LoopLagRead(BaseModel):
+    last: float
+    p50: float
+    p99: float
+    max: float
+
+class LoopBlockRead(BaseModel):
+    at: datetime
+    duration_ms: float
+    stack: List[str]
+
+class ThreadpoolStatsRead(BaseModel):
+    size: int
+    busy: int
+    waiting: int
+    peak_busy: int
+    peak_waiting: int
+
+class LoopStatsRead(BaseModel):
+    running: bool
+    interval_ms: float
+    threshold_ms: float
+    samples: int
+    lag_ms: LoopLagRead
+    blocks: int
+    recent_blocks: List[LoopBlockRead]
+    threadpool: ThreadpoolStatsRead
+
 class TransactionBase(BaseModel):
     item_id: int
     user_id: int
@@ -102,6 +202,75 @@ class TransactionRead(TransactionBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TransactionPage(BaseModel):
+    items: List[TransactionRead]
+    next_cursor: Optional[str] = None
+
+class TransactionBatchHeader(BaseModel):
+    """Fields shared by every transaction in a batch; the item varies."""
+    user_id: int
+    action: TransactionType
+    timestamp: datetime
+    notes: Optional[str] = None
+    state: Optional[ItemState] = None
+    image_url: Optional[str] = None
+
+class TransactionBatchCreate(BaseModel):
+    """Either explicit `transactions`, or a `header` applied to each of `item_ids`."""
+    transactions: List[TransactionCreate] = Field(default_factory=list, max_length=1000)
+    header: Optional[TransactionBatchHeader] = None
+    item_ids: List[int] = Field(default_factory=list, max_length=1000)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+    @model_validator(mode="after")
+    def check_one_form(self):
+        if self.transactions and (self.header or self.item_ids):
+            raise ValueError("Send either 'transactions' or 'header' with 'item_ids', not both")
+        if not self.transactions and not (self.header and self.item_ids):
+            raise ValueError("Send 'transactions', or 'header' with at least one item id")
+        return self
+
+    def entries(self) -> List[TransactionCreate]:
+        if self.transactions:
+            return list(self.transactions)
+        shared = self.header.model_dump()
+        return [TransactionCreate(item_id=item_id, **shared) for item_id in self.item_ids]
+
+class TransactionBatchError(BaseModel):
+    index: int
+    item_id: int
+    error: str
+
+class TransactionBatchResult(BaseModel):
+    created: List[TransactionRead]
+    errors: List[TransactionBatchError] = []
+
+class SearchHit(BaseModel):
+    score: float
+    item: Optional[ItemRead] = None
+    transaction: Optional[TransactionRead] = None
+
+class SearchPage(BaseModel):
+    hits: List[SearchHit]
+    next_offset: Optional[int] = None
+
+class ExportJobCreate(BaseModel):
+    """Range defaults to the last 7 days; format defaults to xlsx when available."""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    format: Optional[Literal["xlsx", "csv"]] = None
+
+class ExportJobRead(BaseModel):
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    format: Literal["xlsx", "csv"]
+    start: datetime
+    end: datetime
+    rows_total: int
+    rows_done: int
+    download_url: Optional[str] = None
+    error: Optional[str] = None
+
 class TransactionUpdate(BaseModel):
     item_id: Optional[int] = None
     user_id: Optional[int] = None
@@ -0,0 +1,83 @@
+"""SQLite FTS5 index over item text fields and transaction notes.
+
+Both tables are external-content FTS5 tables: they store only the inverted
+index and read column values from ``items``/``transactions`` by rowid. Triggers
+keep them in sync, so ORM writes, bulk Core inserts and raw SQL are all covered.
+"""
+from sqlalchemy import event, text
+
+from backend.base import Base
+
+ITEMS_FTS = "items_fts"
+TRANSACTIONS_FTS = "transactions_fts"
+
+# unicode61 folds case and diacritics. '-' and '_' are token characters so an
+# id like "SKU-0042" is one rare token rather than a very common "sku" plus a
+# number. The prefix indexes make short "ab*" lookups a direct index probe.
+_TOKENIZE = "tokenize=\"unicode61 remove_diacritics 2 tokenchars '-_'\", prefix='2 3'"
+
+SEARCH_TABLES = {
+    ITEMS_FTS: (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {ITEMS_FTS} USING fts5("
+        f"name, description, unique_id, location, content='items', content_rowid='id', {_TOKENIZE})"
+    ),
+    TRANSACTIONS_FTS: (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TRANSACTIONS_FTS} USING fts5("
+        f"notes, content='transactions', content_rowid='id', {_TOKENIZE})"
+    ),
+}
+
+SEARCH_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO {ITEMS_FTS}(rowid, name, description, unique_id, location)
+        VALUES (new.id, new.name, new.description, new.unique_id, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO {ITEMS_FTS}({ITEMS_FTS}, rowid, name, description, unique_id, location)
+        VALUES ('delete', old.id, old.name, old.description, old.unique_id, old.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_au
+        AFTER UPDATE OF name, description, unique_id, location ON items BEGIN
+        INSERT INTO {ITEMS_FTS}({ITEMS_FTS}, rowid, name, description, unique_id, location)
+        VALUES ('delete', old.id, old.name, old.description, old.unique_id, old.location);
+        INSERT INTO {ITEMS_FTS}(rowid, name, description, unique_id, location)
+        VALUES (new.id, new.name, new.description, new.unique_id, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {TRANSACTIONS_FTS}(rowid, notes) VALUES (new.id, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {TRANSACTIONS_FTS}({TRANSACTIONS_FTS}, rowid, notes) VALUES ('delete', old.id, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF notes ON transactions BEGIN
+        INSERT INTO {TRANSACTIONS_FTS}({TRANSACTIONS_FTS}, rowid, notes) VALUES ('delete', old.id, old.notes);
+        INSERT INTO {TRANSACTIONS_FTS}(rowid, notes) VALUES (new.id, new.notes);
+    END""",
+]
+
+
+def create_search_index(connection) -> None:
+    """Create the FTS5 tables and sync triggers if they are missing (SQLite only).
+
+    A newly created table is rebuilt from its content table, so existing
+    databases get a complete index the first time this runs.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    existing = {
+        name for (name,) in connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (:items, :transactions)"),
+            {"items": ITEMS_FTS, "transactions": TRANSACTIONS_FTS},
+        )
+    }
+    for name, ddl in SEARCH_TABLES.items():
+        connection.execute(text(ddl))
+        if name not in existing:
+            connection.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+    for ddl in SEARCH_TRIGGERS:
+        connection.execute(text(ddl))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_search_index(connection)
@@ -1,6 +1,6 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 from sqlalchemy.orm import Session
-from ..repositories.base_repository import BaseRepository
+from ..repositories.base_repository import AsyncBaseRepository, BaseRepository
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -42,3 +42,41 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
         """Get an item by a specific field."""
         return self.repository.get_by_field(field, value)
+
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Async counterpart of `BaseService` that awaits an `AsyncBaseRepository`."""
+
+    def __init__(self, repository: AsyncBaseRepository[ModelType, CreateSchemaType, UpdateSchemaType]):
+        self.repository = repository
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        """Get a single item by ID."""
+        return await self.repository.get(id)
+
+    async def get_multi(
+        self, *, skip: int = 0, limit: int = 100, **filters
+    ) -> List[ModelType]:
+        """Get multiple items with optional filtering and pagination."""
+        return await self.repository.get_multi(skip=skip, limit=limit, **filters)
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new item."""
+        return await self.repository.create(obj_in)
+
+    async def update(
+        self, *, id: int, obj_in: UpdateSchemaType
+    ) -> Optional[ModelType]:
+        """Update an existing item."""
+        db_obj = await self.repository.get(id)
+        if not db_obj:
+            return None
+        return await self.repository.update(db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, *, id: int) -> Optional[ModelType]:
+        """Remove an item."""
+        return await self.repository.remove(id=id)
+
+    async def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
+        """Get an item by a specific field."""
+        return await self.repository.get_by_field(field, value)
@@ -7,6 +7,7 @@ from .base_service import BaseService
 from ..models import Category
 from ..schemas import CategoryCreate, CategoryRead, CategoryUpdate
 from ..repositories.category_repository import CategoryRepository
+from ..repositories.unit_of_work import UnitOfWork
 
 class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate]):
     """Service for category-related operations."""
@@ -23,10 +24,10 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate]):
         If a category with the same name already exists, returns 409 Conflict.
         """
         try:
-            db_obj = self.repository.create(obj_in, created_by=creator_id)
+            with UnitOfWork(self.repository.db):
+                db_obj = self.repository.create(obj_in, created_by=creator_id)
         except IntegrityError:
-            # Likely UNIQUE constraint on name; ensure session is rolled back
-            self.repository.db.rollback()
+            # Likely UNIQUE constraint on name; the unit of work has rolled back
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Category with name '{obj_in.name}' already exists",
@@ -0,0 +1,69 @@
+import hashlib
+import hmac
+import os
+import secrets
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import DeviceKey, User
+from ..repositories.device_key_repository import DeviceKeyRepository
+
+# Keys are stored as HMAC-SHA256 under this secret (defaults to the JWT secret)
+DEVICE_KEY_SECRET = os.getenv(
+    "DEVICE_KEY_SECRET", os.getenv("INVENTORY_SECRET_KEY", os.getenv("SECRET_KEY", "your-secret-key-here"))
+)
+DEVICE_KEY_PREFIX = "dk"
+
+
+def hash_device_key(key: str) -> str:
+    return hmac.new(DEVICE_KEY_SECRET.encode(), key.encode(), hashlib.sha256).hexdigest()
+
+
+def is_device_key(credential: str) -> bool:
+    return credential.startswith(DEVICE_KEY_PREFIX + "_")
+
+
+class DeviceKeyService:
+    """Issue, list, revoke and check device API keys.
+
+    Keys are high-entropy random strings, so a keyed hash is enough to store
+    them: checking one costs an indexed lookup on `key_id` and a constant-time
+    compare, with no password-style stretching.
+    """
+
+    def __init__(self, db: Session):
+        self.repository = DeviceKeyRepository(db)
+
+    def issue(self, name: str, user_id: int) -> Tuple[DeviceKey, str]:
+        """Create a key acting as `user_id`; returns the row and the key, which is not stored."""
+        key_id = secrets.token_hex(8)
+        key = f"{DEVICE_KEY_PREFIX}_{key_id}_{secrets.token_urlsafe(32)}"
+        device_key = self.repository.add(
+            name=name,
+            key_id=key_id,
+            key_hash=hash_device_key(key),
+            user_id=user_id,
+            created_at=datetime.utcnow(),
+        )
+        return device_key, key
+
+    def get(self, id: int) -> Optional[DeviceKey]:
+        return self.repository.get(id)
+
+    def list(self, user_id: Optional[int] = None) -> List[DeviceKey]:
+        return self.repository.list(user_id=user_id)
+
+    def revoke(self, device_key: DeviceKey) -> DeviceKey:
+        return self.repository.revoke(device_key)
+
+    def authenticate(self, key: str) -> Optional[User]:
+        """The active user a valid, unrevoked key acts as, or None."""
+        parts = key.split("_", 2)
+        if len(parts) != 3 or parts[0] != DEVICE_KEY_PREFIX:
+            return None
+        device_key = self.repository.get_active_by_key_id(parts[1])
+        if device_key is None or not hmac.compare_digest(device_key.key_hash, hash_device_key(key)):
+            return None
+        return device_key.user if device_key.user.is_active else None
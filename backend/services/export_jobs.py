@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from ..repositories.transaction_repository import TransactionRepository
+from ..schemas import ExportJobRead
+from .export_partitions import ExportPartitions, get_export_partitions
+from .export_service import MEDIA_TYPES, TRANSACTION_EXPORT_HEADERS, write_xlsx
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = os.environ.get("EXPORT_CACHE_DIR", "exports")
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "2"))
+# Item unique_ids and usernames are joined in when a file is built; expiry bounds how stale they get
+EXPORT_CACHE_TTL_SECONDS = float(os.environ.get("EXPORT_CACHE_TTL_SECONDS", "86400"))
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: str
+    start: datetime
+    end: datetime
+    rows_total: int
+    rows_done: int = 0
+    status: str = "queued"
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def advance(self, rows: int) -> None:
+        self.rows_done += rows
+
+    def to_read(self) -> ExportJobRead:
+        return ExportJobRead(
+            id=self.id,
+            status=self.status,
+            format=self.format,
+            start=self.start,
+            end=self.end,
+            rows_total=self.rows_total,
+            rows_done=self.rows_done,
+            download_url=f"/api/v1/exports/{self.id}/download" if self.status == "done" else None,
+            error=self.error,
+        )
+
+
+def export_key(fmt: str, start: datetime, end: datetime, version) -> str:
+    """Job id for a (range, format, data version); equal requests share one file."""
+    raw = f"transactions|{fmt}|{start.isoformat()}|{end.isoformat()}|{version[0]}|{version[1]}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+class ExportJobManager:
+    """Builds transaction exports on a small thread pool and caches the files on disk.
+
+    A job's id is derived from its range, format and the range's data version,
+    so repeating a request for unchanged data returns the finished file at once.
+    Progress is tracked in memory by the worker that runs the job; finished
+    files and their metadata are on disk, so any worker sharing `directory` can
+    report and serve them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        directory: str = EXPORT_CACHE_DIR,
+        max_workers: int = EXPORT_WORKERS,
+        ttl: float = EXPORT_CACHE_TTL_SECONDS,
+        partitions: Optional[ExportPartitions] = None,
+    ):
+        self.session_factory = session_factory
+        self.partitions = partitions or get_export_partitions()
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ExportJob] = {}
+        self._counters = {"started": 0, "cached": 0, "done": 0, "failed": 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+
+    def submit(self, db: Session, fmt: str, start: datetime, end: datetime) -> ExportJob:
+        """Return the job for this export, starting one unless it is running or cached."""
+        version = TransactionRepository(db).range_version(start, end)
+        job_id = export_key(fmt, start, end, version)
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is not None and job.status != "failed":
+                if job.status == "done":
+                    self._counters["cached"] += 1
+                return job
+            job = self._load(job_id)
+            if job is not None:
+                self._counters["cached"] += 1
+                return job
+            job = ExportJob(id=job_id, format=fmt, start=start, end=end, rows_total=version[0])
+            self._jobs[job_id] = job
+            self._counters["started"] += 1
+            job.future = self._executor.submit(self._run, job)
+            return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        with self._lock:
+            return self._jobs.get(job_id) or self._load(job_id)
+
+    def counters(self) -> Dict[str, int]:
+        """Jobs started, served from a finished file, and finished or failed by this process."""
+        with self._lock:
+            return dict(self._counters)
+
+    def path(self, job: ExportJob) -> str:
+        return os.path.join(self.directory, f"{job.id}.{job.format}")
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ExportJob]:
+        """Block until a job started by this process finishes (for tests and scripts)."""
+        job = self.get(job_id)
+        if job is not None and job.future is not None:
+            try:
+                job.future.result(timeout)
+            except Exception:
+                pass
+        return job
+
+    def close(self) -> None:
+        """Let running jobs finish and drop queued ones."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: ExportJob) -> None:
+        job.status = "running"
+        target = self.path(job)
+        partial = f"{target}.part"
+        db = self.session_factory()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(partial, "wb") as fileobj:
+                if job.format == "xlsx":
+                    rows = self._counted(job, self.partitions.iter_rows(db, job.start, job.end))
+                    write_xlsx(TRANSACTION_EXPORT_HEADERS, rows, fileobj, title="Transactions")
+                else:
+                    for chunk in self.partitions.iter_csv(db, job.start, job.end, progress=job.advance):
+                        fileobj.write(chunk)
+            os.replace(partial, target)
+            with open(f"{target}.json", "w") as meta:
+                json.dump({
+                    "format": job.format,
+                    "start": job.start.isoformat(),
+                    "end": job.end.isoformat(),
+                    "rows": job.rows_done,
+                }, meta)
+            job.status = "done"
+        except Exception as exc:
+            logger.exception("Export job %s failed", job.id)
+            job.status = "failed"
+            job.error = str(exc)
+            if os.path.exists(partial):
+                os.remove(partial)
+        finally:
+            db.close()
+            job.finished_at = time.time()
+            if job.status in ("done", "failed"):
+                with self._lock:
+                    self._counters[job.status] += 1
+
+    @staticmethod
+    def _counted(job: ExportJob, rows: Iterable[tuple]) -> Iterator[tuple]:
+        for row in rows:
+            yield row
+            job.advance(1)
+
+    def _load(self, job_id: str) -> Optional[ExportJob]:
+        """Rebuild a finished job from its metadata file, if it is on disk and fresh."""
+        meta_path = None
+        for fmt in MEDIA_TYPES:
+            candidate = os.path.join(self.directory, f"{job_id}.{fmt}.json")
+            if os.path.exists(candidate):
+                meta_path = candidate
+                break
+        if meta_path is None or time.time() - os.path.getmtime(meta_path) > self.ttl:
+            return None
+        try:
+            with open(meta_path) as meta:
+                data = json.load(meta)
+        except (OSError, ValueError):
+            return None
+        return ExportJob(
+            id=job_id,
+            format=data["format"],
+            start=datetime.fromisoformat(data["start"]),
+            end=datetime.fromisoformat(data["end"]),
+            rows_total=data["rows"],
+            rows_done=data["rows"],
+            status="done",
+        )
+
+    def _prune(self) -> None:
+        """Forget finished jobs and delete files older than the TTL; call under the lock."""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+_manager: Optional[ExportJobManager] = None
+
+
+def get_export_jobs() -> ExportJobManager:
+    """Dependency that provides the process-wide export job manager."""
+    global _manager
+    if _manager is None:
+        from ..database import SessionLocal
+        _manager = ExportJobManager(SessionLocal)
+    return _manager
+
+
+def close_export_jobs() -> None:
+    """Stop the process-wide manager, if it was started."""
+    if _manager is not None:
+        _manager.close()
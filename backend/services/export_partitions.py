@@ -0,0 +1,165 @@
+"""Per-day CSV partitions of the transaction export, cached on disk.
+
+Past days rarely change, so each closed day is written once as a gzip'd CSV
+chunk named after its date and version, and later exports covering that day
+read the file instead of the database. The version is the day's
+``(row count, highest id)``: transactions are append-only, so any new row
+changes it and the day is rebuilt. Today, partial days at the edges of a range
+and days with a stale file are queried live.
+"""
+import csv
+import gzip
+import os
+import tempfile
+import threading
+import time as _time
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..repositories.transaction_repository import TransactionRepository
+from .export_service import STREAM_CHUNK_BYTES, TRANSACTION_EXPORT_HEADERS, iter_csv
+
+EXPORT_PARTITION_DIR = os.environ.get("EXPORT_PARTITION_DIR", os.path.join("exports", "days"))
+# Joined item unique_ids and usernames are frozen into a file; expiry bounds how stale they get
+EXPORT_PARTITION_TTL_SECONDS = float(os.environ.get("EXPORT_PARTITION_TTL_SECONDS", "86400"))
+
+# Export columns holding integers; CSV partitions read them back as text
+_INT_COLUMNS = {TRANSACTION_EXPORT_HEADERS.index(name) for name in ("id", "item_id", "user_id")}
+
+# ("live", start, end) or ("day", day, version)
+Segment = Tuple[str, object, object]
+
+
+class ExportPartitions:
+    """Reads the transaction export as live segments plus cached day files."""
+
+    def __init__(self, directory: str = EXPORT_PARTITION_DIR, ttl: float = EXPORT_PARTITION_TTL_SECONDS):
+        self.directory = directory
+        self.ttl = ttl
+        self.days_reused = 0
+        self.days_built = 0
+        self._lock = threading.Lock()
+
+    def plan(self, db: Session, start: datetime, end: datetime) -> List[Segment]:
+        """Split `[start, end]` into whole closed days served from files and live edges.
+
+        Timestamps are stored in UTC, so aware bounds are converted to naive UTC
+        to line up with the stored calendar days.
+        """
+        start, end = _naive_utc(start), _naive_utc(end)
+        first = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last = end.date() if end.time() == time.max else end.date() - timedelta(days=1)
+        last = min(last, datetime.now(timezone.utc).date() - timedelta(days=1))
+        if first > last:
+            return [("live", start, end)]
+
+        first_start = datetime.combine(first, time.min)
+        after_last = datetime.combine(last + timedelta(days=1), time.min)
+        versions = TransactionRepository(db).day_versions(first_start, after_last - timedelta(microseconds=1))
+        segments: List[Segment] = []
+        if start < first_start:
+            segments.append(("live", start, first_start - timedelta(microseconds=1)))
+        day = first
+        while day <= last:
+            if day in versions:
+                segments.append(("day", day, versions[day]))
+            day += timedelta(days=1)
+        if after_last <= end:
+            segments.append(("live", after_last, end))
+        return segments
+
+    def iter_csv(
+        self, db: Session, start: datetime, end: datetime, progress: Optional[Callable[[int], None]] = None
+    ) -> Iterator[bytes]:
+        """Yield the export as CSV bytes; cached days are copied without parsing.
+
+        `progress(n)` is called as rows are produced, for job progress reporting.
+        """
+        yield from iter_csv(TRANSACTION_EXPORT_HEADERS, [])
+        for kind, a, b in self.plan(db, start, end):
+            if kind == "live":
+                rows = TransactionRepository(db).iter_export_rows(a, b)
+                if progress:
+                    rows = _counted(rows, progress)
+                yield from iter_csv(TRANSACTION_EXPORT_HEADERS, rows, header=False)
+                continue
+            with gzip.open(self._day_path(db, a, b), "rb") as day_file:
+                while True:
+                    chunk = day_file.read(STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    yield chunk
+            if progress:
+                progress(b[0])
+
+    def iter_rows(self, db: Session, start: datetime, end: datetime) -> Iterator[tuple]:
+        """Yield export row tuples, reading cached days back from their CSV files."""
+        for kind, a, b in self.plan(db, start, end):
+            if kind == "live":
+                yield from TransactionRepository(db).iter_export_rows(a, b)
+                continue
+            with gzip.open(self._day_path(db, a, b), "rt", encoding="utf-8", newline="") as day_file:
+                for row in csv.reader(day_file):
+                    yield tuple(int(v) if i in _INT_COLUMNS and v else v for i, v in enumerate(row))
+
+    def _day_path(self, db: Session, day: date, version: Tuple[int, int]) -> str:
+        """Path of the day's file at `version`, building it first if missing or expired."""
+        path = os.path.join(self.directory, f"{day.isoformat()}.{version[0]}.{version[1]}.csv.gz")
+        try:
+            if _time.time() - os.path.getmtime(path) <= self.ttl:
+                with self._lock:
+                    self.days_reused += 1
+                return path
+        except OSError:
+            pass
+        self._build(db, day, path)
+        with self._lock:
+            self.days_built += 1
+        return path
+
+    def _build(self, db: Session, day: date, path: str) -> None:
+        """Write one day's rows to `path` atomically and drop its older versions."""
+        os.makedirs(self.directory, exist_ok=True)
+        start = datetime.combine(day, time.min)
+        rows = TransactionRepository(db).iter_export_rows(start, start + timedelta(days=1, microseconds=-1))
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as out:
+                for chunk in iter_csv(TRANSACTION_EXPORT_HEADERS, rows, header=False):
+                    out.write(chunk)
+            os.replace(partial, path)
+        except BaseException:
+            os.remove(partial)
+            raise
+        prefix = f"{day.isoformat()}."
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(".csv.gz") and os.path.join(self.directory, name) != path:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _counted(rows, progress: Callable[[int], None]) -> Iterator[tuple]:
+    for row in rows:
+        yield row
+        progress(1)
+
+
+_partitions: Optional[ExportPartitions] = None
+
+
+def get_export_partitions() -> ExportPartitions:
+    """Dependency that provides the process-wide partition cache."""
+    global _partitions
+    if _partitions is None:
+        _partitions = ExportPartitions()
+    return _partitions
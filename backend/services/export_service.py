@@ -0,0 +1,132 @@
+"""Streaming CSV / NDJSON / XLSX writers shared by the export endpoints.
+
+All take an iterable of row tuples and never hold more than a bounded buffer:
+CSV and NDJSON are yielded in blocks of rows, and XLSX is written with openpyxl's
+write-only workbook into a spooled temp file that is then streamed back in chunks.
+"""
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from enum import Enum
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+try:
+    from openpyxl import Workbook  # type: ignore
+    from openpyxl.cell import WriteOnlyCell  # type: ignore
+    HAS_OPENPYXL = True
+except Exception:  # ImportError or other env issues
+    HAS_OPENPYXL = False
+
+TRANSACTION_EXPORT_HEADERS = [
+    "id", "item_id", "item_unique_id", "user_id", "username", "action", "state", "timestamp", "notes", "image_url",
+]
+
+ITEM_EXPORT_HEADERS = [
+    "id", "unique_id", "name", "description", "category", "state", "location", "purchase_date", "expiry_date",
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+CSV_FLUSH_ROWS = 1000
+STREAM_CHUNK_BYTES = 64 * 1024
+# XLSX files smaller than this are zipped in memory; larger ones roll over to disk
+XLSX_SPOOL_BYTES = 1024 * 1024
+
+
+def to_cell(val: Any) -> Any:
+    """Convert a column value to something both CSV and Excel cells accept."""
+    if val is None:
+        return ''
+    if isinstance(val, Enum):
+        return val.value
+    if isinstance(val, (datetime, date)):
+        return val.isoformat()
+    if isinstance(val, (dict, list)):
+        try:
+            return json.dumps(val, ensure_ascii=False)
+        except Exception:
+            return str(val)
+    if isinstance(val, (str, int, float, bool)):
+        return val
+    # Fallback to string for other objects (e.g., UUID, Decimal)
+    return str(val)
+
+
+def iter_csv(headers: Sequence[str], rows: Iterable[Sequence[Any]], header: bool = True) -> Iterator[bytes]:
+    """Yield UTF-8 CSV in blocks of `CSV_FLUSH_ROWS` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(headers)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([to_cell(value) for value in row])
+        if count % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """Yield one JSON object per line, keyed by `headers`, in blocks of `CSV_FLUSH_ROWS` rows.
+
+    Unlike CSV, missing values stay ``null`` rather than becoming empty strings.
+    """
+    lines = []
+    for row in rows:
+        record = {name: None if value is None else to_cell(value) for name, value in zip(headers, row)}
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= CSV_FLUSH_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def write_xlsx(
+    headers: Sequence[str], rows: Iterable[Sequence[Any]], fileobj: IO[bytes], title: str, header_style=None
+) -> None:
+    """Write one sheet with openpyxl's write-only workbook (rows are not kept in memory).
+
+    `header_style`, if given, is called with each header cell to style it.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title)
+    if header_style is None:
+        ws.append(list(headers))
+    else:
+        cells = [WriteOnlyCell(ws, value=name) for name in headers]
+        for cell in cells:
+            header_style(cell)
+        ws.append(cells)
+    for row in rows:
+        ws.append([to_cell(value) for value in row])
+    wb.save(fileobj)
+
+
+def iter_file(fileobj: IO[bytes]) -> Iterator[bytes]:
+    """Yield a file's remaining content in `STREAM_CHUNK_BYTES` chunks."""
+    while True:
+        chunk = fileobj.read(STREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_xlsx(headers: Sequence[str], rows: Iterable[Sequence[Any]], title: str) -> Iterator[bytes]:
+    """Build an XLSX into a spooled temp file, then yield it in chunks.
+
+    The zip container needs its central directory written last, so the file is
+    completed before the first byte goes out; it lives on disk, not in memory.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as tmp:
+        write_xlsx(headers, rows, tmp, title)
+        tmp.seek(0)
+        yield from iter_file(tmp)
@@ -1,10 +1,49 @@
-from typing import List
+import base64
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .base_service import BaseService
+from .base_service import AsyncBaseService, BaseService
 from ..models import Item
-from ..schemas import ItemCreate, ItemUpdate, ItemRead, CategoryRead
-from ..repositories.item_repository import ItemRepository
+from ..schemas import ItemCreate, ItemUpdate, ItemRead, ItemPage, CategoryRead, ItemImportError, ItemImportReport
+from ..repositories.category_repository import CategoryRepository
+from ..repositories.item_repository import AsyncItemRepository, ItemRepository
+from ..repositories.unit_of_work import UnitOfWork
+from .stats_service import invalidate_stats, stats_cache
+from .suggest_index import suggest_index
+
+IMPORT_BATCH_SIZE = 1000
+DATE_SORT_KEYS = ("purchase_date", "expiry_date")
+
+
+def _clean(value: Any) -> Any:
+    """Normalise a spreadsheet cell: strip strings and treat blanks as missing."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _batched(rows: Iterator, size: int) -> Iterator[list]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _describe_error(exc: ValueError) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+    return str(exc)
+
 
 class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
     """Service for item-related operations."""
@@ -14,7 +53,11 @@ class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
 
     def create(self, item: ItemCreate, user_id: int) -> ItemRead:
         """Create a new item."""
-        db_obj = self.repository.create(obj_in=item, created_by=user_id)
+        self._check_category(item.category_id)
+        with UnitOfWork(self.repository.db):
+            db_obj = self.repository.create(obj_in=item, created_by=user_id)
+        invalidate_stats()
+        suggest_index.upsert(db_obj.id, db_obj.unique_id, db_obj.name)
         return self._convert_to_read_model(db_obj)
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ItemRead]:
@@ -22,6 +65,78 @@ class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
         db_objs = self.repository.get_all_items(skip=skip, limit=limit)
         return [self._convert_to_read_model(db_obj) for db_obj in db_objs]
 
+    def iter_export_rows(self, **filters) -> Iterator[tuple]:
+        """Stream item export rows (see `ITEM_EXPORT_HEADERS`) matching the list filters, by id."""
+        return self.repository.iter_export_rows(**filters)
+
+    def get_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "id",
+        order: str = "asc",
+        **filters,
+    ) -> ItemPage:
+        """Get one keyset page of items matching `filters`, continuing from `cursor`.
+
+        `total` counts every matching item; it is cached per filter set and
+        cleared by item writes, so paging through a catalog doesn't recount it.
+        """
+        descending = order == "desc"
+        rows = self.repository.get_page(
+            limit=limit + 1,
+            sort=sort,
+            descending=descending,
+            after=self.decode_cursor(cursor, sort, order) if cursor else None,
+            **filters,
+        )
+        total = stats_cache.get_or_set(
+            ("item_count", tuple(sorted(filters.items()))),
+            lambda: self.repository.count(**filters),
+        )
+        return self.to_page(rows, limit, sort, order, total)
+
+    @classmethod
+    def to_page(cls, rows: List[Item], limit: int, sort: str, order: str, total: int) -> ItemPage:
+        """Build a page from up to `limit + 1` rows; the extra row only signals more data."""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls.encode_cursor(rows[-1], sort, order)
+        return ItemPage(
+            items=[cls._convert_to_read_model(row) for row in rows],
+            next_cursor=next_cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def encode_cursor(item: Item, sort: str, order: str) -> str:
+        """Encode the `(sort value, id)` keyset position of a row as an opaque string."""
+        value = getattr(item, sort)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([sort, order, value, item.id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+        """Decode a cursor from `encode_cursor`; raises 400 if it is malformed or
+        was issued for a different sort."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            cursor_sort, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            if (cursor_sort, cursor_order) != (sort, order):
+                raise ValueError("cursor sort mismatch")
+            if sort in DATE_SORT_KEYS and value is not None:
+                value = datetime.fromisoformat(value)
+            return value, int(row_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+
     def update(self, item_id: int, item_update: ItemUpdate, user_id: int) -> ItemRead:
         """Update an item."""
         db_obj = self.repository.get(item_id)
@@ -31,16 +146,110 @@ class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
         # Add last_modified_by to the update data
         update_data = item_update.model_dump(exclude_unset=True)
         update_data['last_modified_by'] = user_id
+        self._check_category(update_data.get('category_id'))
         
-        updated_obj = self.repository.update(db_obj=db_obj, obj_in=update_data)
+        with UnitOfWork(self.repository.db):
+            updated_obj = self.repository.update(db_obj=db_obj, obj_in=update_data)
+        invalidate_stats()
+        suggest_index.upsert(updated_obj.id, updated_obj.unique_id, updated_obj.name)
         return self._convert_to_read_model(updated_obj)
 
+    def _check_category(self, category_id: Optional[int]) -> None:
+        """Raise 400 if `category_id` is set but names no category."""
+        if category_id is not None and not CategoryRepository(self.repository.db).get_existing_ids([category_id]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Category not found",
+            )
+
     def delete(self, item_id: int) -> ItemRead:
         """Delete an item."""
-        db_obj = self.repository.remove(id=item_id)
+        with UnitOfWork(self.repository.db):
+            db_obj = self.repository.remove(id=item_id)
+        invalidate_stats()
+        suggest_index.remove(item_id)
         return self._convert_to_read_model(db_obj)
         
-    def _convert_to_read_model(self, db_obj: Item) -> ItemRead:
+    def import_items(
+        self, rows: Iterable[Tuple[int, Dict[str, Any]]], user_id: int, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ItemImportReport:
+        """Bulk-create items from parsed spreadsheet rows.
+
+        Category names and ids are checked against a single lookup, `unique_id` conflicts are
+        checked per batch with one IN query, and each batch is one executemany
+        INSERT. The whole import commits once; invalid rows are skipped and
+        reported by their spreadsheet row number.
+        """
+        report = ItemImportReport()
+        category_ids = CategoryRepository(self.repository.db).get_ids_by_name()
+        known_category_ids = set(category_ids.values())
+        seen = set()
+
+        def reject(row_number: int, unique_id, error: str) -> None:
+            report.failed += 1
+            report.errors.append(ItemImportError(row=row_number, unique_id=unique_id, error=error))
+
+        with UnitOfWork(self.repository.db):
+            for batch in _batched(iter(rows), batch_size):
+                candidates = []
+                for row_number, raw in batch:
+                    unique_id = _clean(raw.get("unique_id"))
+                    try:
+                        item = self._parse_import_row(raw, category_ids, known_category_ids)
+                    except ValueError as exc:
+                        reject(row_number, unique_id, _describe_error(exc))
+                        continue
+                    if item.unique_id in seen:
+                        reject(row_number, item.unique_id, "Duplicate unique_id in file")
+                        continue
+                    seen.add(item.unique_id)
+                    candidates.append((row_number, item))
+
+                taken = self.repository.get_existing_unique_ids(item.unique_id for _, item in candidates)
+                values = []
+                for row_number, item in candidates:
+                    if item.unique_id in taken:
+                        reject(row_number, item.unique_id, "unique_id already exists")
+                        continue
+                    values.append({**item.model_dump(), "created_by": user_id})
+                self.repository.bulk_insert(values)
+                report.created += len(values)
+        invalidate_stats()
+        # Core inserts don't hand back ids; rebuild on the next lookup instead
+        if report.created:
+            suggest_index.invalidate()
+        return report
+
+    @staticmethod
+    def _parse_import_row(
+        raw: Dict[str, Any], category_ids: Dict[str, int], known_category_ids: Set[int]
+    ) -> ItemCreate:
+        """Validate one spreadsheet row, resolving a `category` name to its id
+        and checking that a given `category_id` exists."""
+        data = {
+            field: _clean(raw.get(field))
+            for field in ("unique_id", "name", "description", "category_id", "state",
+                          "location", "purchase_date", "expiry_date")
+        }
+        category = _clean(raw.get("category"))
+        if category is not None and data["category_id"] is None:
+            category_id = category_ids.get(str(category).lower())
+            if category_id is None:
+                raise ValueError(f"Unknown category '{category}'")
+            data["category_id"] = category_id
+        # Spreadsheet cells may hold numbers (e.g. numeric barcodes) in text columns
+        for field in ("unique_id", "name", "description", "location"):
+            if data[field] is not None and not isinstance(data[field], str):
+                data[field] = str(data[field])
+        if data["state"] is not None:
+            data["state"] = str(data["state"]).lower()
+        item = ItemCreate(**{k: v for k, v in data.items() if v is not None or k == "description"})
+        if item.category_id is not None and item.category_id not in known_category_ids:
+            raise ValueError(f"Unknown category_id {item.category_id}")
+        return item
+
+    @staticmethod
+    def _convert_to_read_model(db_obj: Item) -> ItemRead:
         """Convert SQLAlchemy model to Pydantic model."""
         # Create a dict with the object's attributes
         item_data = {}
@@ -66,3 +275,39 @@ class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
         
         # Create and return the Pydantic model
         return ItemRead(**item_data)
+
+
+class AsyncItemService(AsyncBaseService[Item, ItemCreate, ItemUpdate]):
+    """Async service for item reads on an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncItemRepository(db)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ItemRead]:
+        """Get all items."""
+        db_objs = await self.repository.get_all_items(skip=skip, limit=limit)
+        return [ItemService._convert_to_read_model(db_obj) for db_obj in db_objs]
+
+    async def get_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "id",
+        order: str = "asc",
+        **filters,
+    ) -> ItemPage:
+        """Get one keyset page of items; semantics match `ItemService.get_page`."""
+        rows = await self.repository.get_page(
+            limit=limit + 1,
+            sort=sort,
+            descending=order == "desc",
+            after=ItemService.decode_cursor(cursor, sort, order) if cursor else None,
+            **filters,
+        )
+        key = ("item_count", tuple(sorted(filters.items())))
+        total = stats_cache.get(key)
+        if total is None:
+            total = await self.repository.count(**filters)
+            stats_cache.set(key, total)
+        return ItemService.to_page(rows, limit, sort, order, total)
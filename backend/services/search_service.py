@@ -0,0 +1,50 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..repositories.item_repository import ItemRepository
+from ..repositories.search_repository import SearchRepository
+from ..repositories.transaction_repository import TransactionRepository
+from ..schemas import SearchHit, SearchPage, TransactionRead
+from .item_service import ItemService
+
+
+class SearchService:
+    """Full-text search over items and transaction notes."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = SearchRepository(db)
+
+    def search(self, q: str, scope: str = "items", limit: int = 20, offset: int = 0) -> SearchPage:
+        """Rank matches for `q` in `scope` ("items" or "transactions") and load one page.
+
+        The FTS query returns only rowids and scores; the matching rows
+        are then fetched with one eager SELECT and kept in rank order.
+        """
+        if self.db.get_bind().dialect.name != "sqlite":
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Full-text search requires SQLite with FTS5",
+            )
+
+        if scope == "transactions":
+            rows = self.repository.search_transactions(q, limit=limit + 1, offset=offset)
+        else:
+            rows = self.repository.search_items(q, limit=limit + 1, offset=offset)
+        next_offset = offset + limit if len(rows) > limit else None
+        rows = rows[:limit]
+        ids = [row_id for row_id, _ in rows]
+
+        if scope == "transactions":
+            loaded = {t.id: t for t in TransactionRepository(self.db).get_by_ids(ids)}
+            hits = [
+                SearchHit(score=score, transaction=TransactionRead.model_validate(loaded[row_id], from_attributes=True))
+                for row_id, score in rows if row_id in loaded
+            ]
+        else:
+            loaded = {item.id: item for item in ItemRepository(self.db).get_by_ids(ids)}
+            hits = [
+                SearchHit(score=score, item=ItemService._convert_to_read_model(loaded[row_id]))
+                for row_id, score in rows if row_id in loaded
+            ]
+        return SearchPage(hits=hits, next_offset=next_offset)
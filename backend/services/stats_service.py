@@ -0,0 +1,52 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from ..cache import TTLCache
+from ..models import ItemState, TransactionType
+from ..repositories.item_repository import ItemRepository
+from ..repositories.transaction_repository import TransactionRepository
+from ..schemas import CategoryCount, ItemStatsRead, LocationCount
+
+STATS_CACHE_TTL_SECONDS = float(os.environ.get("STATS_CACHE_TTL_SECONDS", "30"))
+
+# Keyed by window length; cleared by `invalidate_stats()` after item and transaction writes
+stats_cache = TTLCache(ttl=STATS_CACHE_TTL_SECONDS, maxsize=32)
+
+
+def invalidate_stats() -> None:
+    """Drop cached stats; call after committing an item or transaction write."""
+    stats_cache.invalidate()
+
+
+class StatsService:
+    """Aggregate counts for the dashboard, computed with GROUP BY queries."""
+
+    def __init__(self, db: Session):
+        self.items = ItemRepository(db)
+        self.transactions = TransactionRepository(db)
+
+    def item_stats(self, days: int = 30) -> ItemStatsRead:
+        """Item counts by state, category and location, plus transactions by action
+        over the last `days` days. Served from a short-TTL cache."""
+        return stats_cache.get_or_set(("items", days), lambda: self._compute_item_stats(days))
+
+    def _compute_item_stats(self, days: int) -> ItemStatsRead:
+        by_state = self.items.count_by_state()
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        by_action = self.transactions.count_by_action(start=since)
+        return ItemStatsRead(
+            total=sum(by_state.values()),
+            by_state={state.value: by_state.get(state, 0) for state in ItemState},
+            by_category=[
+                CategoryCount(category_id=category_id, name=name, count=count)
+                for category_id, name, count in self.items.count_by_category()
+            ],
+            by_location=[
+                LocationCount(location=location, count=count)
+                for location, count in self.items.count_by_location()
+            ],
+            window_days=days,
+            transactions_by_action={action.value: by_action.get(action, 0) for action in TransactionType},
+        )
@@ -0,0 +1,126 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Item
+from ..schemas import ItemSuggestion
+
+
+class _PrefixArray:
+    """Sorted ``(key, item_id)`` pairs; a prefix lookup is one bisect plus a short scan."""
+
+    def __init__(self, pairs: Optional[List[Tuple[str, int]]] = None):
+        self.pairs = sorted(pairs or [])
+
+    def add(self, key: str, item_id: int) -> None:
+        insort(self.pairs, (key, item_id))
+
+    def remove(self, key: str, item_id: int) -> None:
+        i = bisect_left(self.pairs, (key, item_id))
+        if i < len(self.pairs) and self.pairs[i] == (key, item_id):
+            del self.pairs[i]
+
+    def scan(self, prefix: str):
+        """Yield item ids whose key starts with `prefix`, in key order."""
+        for i in range(bisect_left(self.pairs, (prefix,)), len(self.pairs)):
+            key, item_id = self.pairs[i]
+            if not key.startswith(prefix):
+                return
+            yield item_id
+
+
+def _name_keys(name: str) -> List[str]:
+    """The whole name and each later word, so "dri" finds "Cordless Drill"."""
+    name = (name or "").lower()
+    words = name.split()
+    return [name] + words[1:]
+
+
+class SuggestIndex:
+    """In-process prefix index over item unique_id and name for type-ahead.
+
+    Built once from the database, then kept current by `ItemService` through
+    `upsert`/`remove`, so lookups never touch the database. Each worker process
+    holds its own copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._items: Dict[int, Tuple[str, str]] = {}
+        self._by_unique_id = _PrefixArray()
+        self._by_name = _PrefixArray()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, db: Session) -> None:
+        """(Re)load every item; writers wait on the lock so none are lost mid-build."""
+        with self._lock:
+            items = {item_id: (unique_id, name) for item_id, unique_id, name in db.query(Item.id, Item.unique_id, Item.name)}
+            self._items = items
+            self._by_unique_id = _PrefixArray([(unique_id.lower(), i) for i, (unique_id, _) in items.items()])
+            self._by_name = _PrefixArray([(key, i) for i, (_, name) in items.items() for key in _name_keys(name)])
+            self._built = True
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._built:
+            self.build(db)
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup rebuilds it (used after bulk imports)."""
+        with self._lock:
+            self._built = False
+            self._items = {}
+            self._by_unique_id = _PrefixArray()
+            self._by_name = _PrefixArray()
+
+    def upsert(self, item_id: int, unique_id: str, name: str) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            self._discard(item_id)
+            self._items[item_id] = (unique_id, name)
+            self._by_unique_id.add(unique_id.lower(), item_id)
+            for key in _name_keys(name):
+                self._by_name.add(key, item_id)
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            if self._built:
+                self._discard(item_id)
+
+    def _discard(self, item_id: int) -> None:
+        old = self._items.pop(item_id, None)
+        if old is None:
+            return
+        unique_id, name = old
+        self._by_unique_id.remove(unique_id.lower(), item_id)
+        for key in _name_keys(name):
+            self._by_name.remove(key, item_id)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[ItemSuggestion]:
+        """Items whose unique_id, name or a later name word starts with `prefix`
+        (case-insensitive); unique_id matches come first."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        results: List[ItemSuggestion] = []
+        seen = set()
+        with self._lock:
+            for index in (self._by_unique_id, self._by_name):
+                for item_id in index.scan(prefix):
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                    unique_id, name = self._items[item_id]
+                    results.append(ItemSuggestion(id=item_id, unique_id=unique_id, name=name))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+
+suggest_index = SuggestIndex()
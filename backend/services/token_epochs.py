@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..repositories.token_epoch_repository import TokenEpochRepository
+
+TOKEN_EPOCH_REFRESH_SECONDS = float(os.environ.get("TOKEN_EPOCH_REFRESH_SECONDS", "30"))
+
+
+class TokenEpochTable:
+    """In-memory copy of the ``token_epochs`` table used to check claims-mode tokens.
+
+    The whole table (one small row per user who ever had tokens revoked) is
+    reloaded at most every `refresh_seconds`, so checking a token normally costs
+    no query. A bump made by this process applies at once; one made by another
+    worker applies after that worker's next refresh here.
+    """
+
+    def __init__(self, refresh_seconds: float = TOKEN_EPOCH_REFRESH_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._epochs: Dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+
+    def current(self, db: Session, user_id: int) -> int:
+        """The user's epoch, reloading the table first if the copy is stale."""
+        if self._loaded_at is None or self._clock() - self._loaded_at >= self.refresh_seconds:
+            self.refresh(db)
+        return self._epochs.get(user_id, 0)
+
+    def refresh(self, db: Session) -> None:
+        epochs = TokenEpochRepository(db).get_all()
+        with self._lock:
+            # Epochs only grow; keeping the larger value stops a read that started
+            # before a local `bump()` from undoing it
+            for user_id, epoch in self._epochs.items():
+                if epoch > epochs.get(user_id, 0):
+                    epochs[user_id] = epoch
+            self._epochs = epochs
+            self._loaded_at = self._clock()
+
+    def bump(self, db: Session, user_id: int) -> int:
+        """Revoke every token issued to the user so far."""
+        epoch = TokenEpochRepository(db).bump(user_id)
+        with self._lock:
+            self._epochs = {**self._epochs, user_id: epoch}
+        return epoch
+
+    def clear(self) -> None:
+        """Forget the loaded copy; the next check reloads it."""
+        with self._lock:
+            self._epochs = {}
+            self._loaded_at = None
+
+
+token_epochs = TokenEpochTable()
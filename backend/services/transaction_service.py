@@ -1,11 +1,27 @@
+import base64
+import json
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from fastapi import HTTPException, status
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 
-from .base_service import BaseService
-from ..models import Transaction, Item
-from ..schemas import TransactionCreate, TransactionUpdate
-from ..repositories.transaction_repository import TransactionRepository
+from .base_service import AsyncBaseService, BaseService
+from ..models import Transaction, Item, ItemState, TransactionType
+from ..schemas import (
+    TransactionBatchCreate,
+    TransactionBatchError,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionPage,
+    TransactionRead,
+    TransactionUpdate,
+)
+from ..repositories.item_repository import ItemRepository
+from ..repositories.transaction_repository import AsyncTransactionRepository, TransactionRepository
+from ..repositories.user_repository import UserRepository
+from ..repositories.unit_of_work import UnitOfWork
+from .stats_service import invalidate_stats
 
 class TransactionService(BaseService[Transaction, TransactionCreate, TransactionUpdate]):
     """Service for transaction-related operations."""
@@ -14,25 +30,176 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         self.repository = TransactionRepository(db)
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Transaction]:
-        """Get all transactions."""
-        return self.repository.get_multi(skip=skip, limit=limit)
+        """Get all transactions with their item, category and user loaded."""
+        return self.repository.get_transactions(skip=skip, limit=limit)
+
+    def get_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        item_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[TransactionType] = None,
+        state: Optional[ItemState] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> TransactionPage:
+        """Get one page of transactions, newest first, continuing from `cursor`.
+
+        `next_cursor` is set only when more rows exist after this page.
+        """
+        rows = self.repository.get_page(
+            limit=limit + 1,
+            after=self.decode_cursor(cursor) if cursor else None,
+            item_id=item_id,
+            user_id=user_id,
+            action=action,
+            state=state,
+            start=start,
+            end=end,
+        )
+        return self.to_page(rows, limit)
+
+    @classmethod
+    def to_page(cls, rows: List[Transaction], limit: int) -> TransactionPage:
+        """Build a page from up to `limit + 1` rows; the extra row only signals more data."""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls.encode_cursor(rows[-1])
+        return TransactionPage(
+            items=[TransactionRead.model_validate(row, from_attributes=True) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def encode_cursor(transaction: Transaction) -> str:
+        """Encode the `(timestamp, id)` keyset position of a row as an opaque string."""
+        timestamp = transaction.timestamp.isoformat() if transaction.timestamp else None
+        raw = json.dumps([timestamp, transaction.id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a cursor produced by `encode_cursor`; raises 400 if it is malformed."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(timestamp), int(row_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
 
     def get_by_date_range(self, start: datetime, end: datetime) -> List[Transaction]:
         """Get transactions within an inclusive datetime range."""
         return self.repository.get_by_date_range(start, end)
 
+    def iter_export_rows(self, start: datetime, end: datetime) -> Iterator[tuple]:
+        """Stream export rows (see `TRANSACTION_EXPORT_HEADERS`) for a range, oldest first."""
+        return self.repository.iter_export_rows(start, end)
+
     def create(self, transaction_in: TransactionCreate) -> Transaction:
-        """Create a new transaction and update the item's state."""
-        # Create the transaction
-        transaction = self.repository.create(obj_in=transaction_in)
-
-        # If the transaction includes a state update, apply it to the item
-        if transaction_in.state:
-            item = self.repository.db.query(Item).filter(Item.id == transaction_in.item_id).first()
-            if item:
-                item.state = transaction_in.state
-                self.repository.db.add(item)
-                self.repository.db.commit()
-                self.repository.db.refresh(item)
+        """Create a new transaction and update the item's state.
+
+        Both writes share one unit of work, so they commit together (one fsync)
+        or not at all. A missing item or user is refused with 400.
+        """
+        db = self.repository.db
+        if not ItemRepository(db).get_existing_ids([transaction_in.item_id]):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item not found")
+        if not UserRepository(db).get_existing_ids([transaction_in.user_id]):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not found")
+
+        with UnitOfWork(db):
+            # Create the transaction
+            transaction = self.repository.create(obj_in=transaction_in)
+
+            # If the transaction includes a state update, apply it to the item
+            if transaction_in.state:
+                item = self.repository.db.query(Item).filter(Item.id == transaction_in.item_id).first()
+                if item:
+                    item.state = transaction_in.state
+                    self.repository.db.add(item)
+                    self.repository.commit()
+        invalidate_stats()
 
         return transaction
+
+    def create_batch(self, batch: TransactionBatchCreate) -> TransactionBatchResult:
+        """Create many transactions with one bulk INSERT, one item UPDATE and one commit.
+
+        Rows referencing a missing item or user are rejected up front (two
+        queries in total). In ``all_or_nothing`` mode any rejection fails the
+        whole batch with 400; in ``best_effort`` mode the valid rows are written
+        and the rejected ones are reported in ``errors``.
+        """
+        db = self.repository.db
+        entries = batch.entries()
+        items = ItemRepository(db).get_existing_ids(e.item_id for e in entries)
+        users = UserRepository(db).get_existing_ids(e.user_id for e in entries)
+
+        valid, errors = [], []
+        for index, entry in enumerate(entries):
+            if entry.item_id not in items:
+                errors.append(TransactionBatchError(index=index, item_id=entry.item_id, error="Item not found"))
+            elif entry.user_id not in users:
+                errors.append(TransactionBatchError(index=index, item_id=entry.item_id, error="User not found"))
+            else:
+                valid.append(entry)
+
+        if errors and batch.mode == "all_or_nothing":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=[error.model_dump() for error in errors],
+            )
+
+        with UnitOfWork(db):
+            ids = self.repository.bulk_insert([entry.model_dump() for entry in valid])
+            # Later entries win when the same item appears more than once
+            ItemRepository(db).set_states({e.item_id: e.state for e in valid if e.state})
+        invalidate_stats()
+
+        created = self.repository.get_by_ids(ids)
+        return TransactionBatchResult(
+            created=[TransactionRead.model_validate(row, from_attributes=True) for row in created],
+            errors=errors,
+        )
+
+
+class AsyncTransactionService(AsyncBaseService[Transaction, TransactionCreate, TransactionUpdate]):
+    """Async service for transaction reads; pagination semantics match `TransactionService`."""
+
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncTransactionRepository(db)
+
+    async def get_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        item_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[TransactionType] = None,
+        state: Optional[ItemState] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> TransactionPage:
+        """Get one page of transactions, newest first, continuing from `cursor`."""
+        rows = await self.repository.get_page(
+            limit=limit + 1,
+            after=TransactionService.decode_cursor(cursor) if cursor else None,
+            item_id=item_id,
+            user_id=user_id,
+            action=action,
+            state=state,
+            start=start,
+            end=end,
+        )
+        return TransactionService.to_page(rows, limit)
+
+    async def get_by_date_range(self, start: datetime, end: datetime) -> List[Transaction]:
+        """Get transactions within an inclusive datetime range."""
+        return await self.repository.get_by_date_range(start, end)
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..models import Item, Transaction, User
+from ..repositories.transaction_repository import EAGER_RELATIONS
+from ..schemas import TransactionCreate, TransactionRead
+from .stats_service import invalidate_stats
+
+logger = logging.getLogger(__name__)
+
+# Opt-in with TRANSACTION_WRITE_QUEUE=1
+WRITE_QUEUE_ENABLED = os.environ.get("TRANSACTION_WRITE_QUEUE", "").lower() in ("1", "true", "yes")
+BATCH_MAX_ROWS = int(os.environ.get("TRANSACTION_BATCH_MAX_ROWS", "64"))
+BATCH_MAX_DELAY_MS = float(os.environ.get("TRANSACTION_BATCH_MAX_DELAY_MS", "5"))
+
+_Pending = Tuple[TransactionCreate, "asyncio.Future[TransactionRead]"]
+
+
+class TransactionWriter:
+    """Single-writer queue that group-commits transaction creates.
+
+    Requests are queued and one writer task drains them in batches of up to
+    `max_batch` rows or `max_delay_ms`, whichever comes first. Each batch is
+    written on one dedicated thread in a single DB transaction, so N concurrent
+    sign-in/outs cost one commit (one fsync) instead of N competing for the
+    SQLite write lock. Every caller's future resolves with its own created row.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int = BATCH_MAX_ROWS,
+        max_delay_ms: float = BATCH_MAX_DELAY_MS,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def submit(self, transaction_in: TransactionCreate) -> TransactionRead:
+        """Queue a transaction create and wait for the batch that commits it."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((transaction_in, future))
+        return await future
+
+    async def close(self) -> None:
+        """Flush queued requests, then stop the writer task and its thread."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown(wait=True)
+        self._queue = self._task = self._executor = None
+
+    def _ensure_started(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transaction-writer")
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await loop.run_in_executor(self._executor, self._write_batch, batch)
+            except Exception as exc:  # _write_batch reports row errors itself; this guards the thread
+                results = [exc] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: List[_Pending]) -> list:
+        """Write a batch in one commit; on failure retry row by row to isolate bad rows.
+
+        Rows referencing a missing item or user are refused with 400 up front
+        (two queries per batch) rather than failing the insert.
+        """
+        payloads = [transaction_in for transaction_in, _ in batch]
+        db = self.session_factory()
+        try:
+            rejected = self._check_references(db, payloads)
+            valid = [payload for index, payload in enumerate(payloads) if index not in rejected]
+            try:
+                ids = self._insert(db, valid) if valid else []
+            except Exception as exc:
+                db.rollback()
+                if len(valid) == 1:
+                    ids = [exc]
+                else:
+                    logger.warning("Transaction batch of %d failed; retrying rows individually", len(valid))
+                    ids = []
+                    for payload in valid:
+                        try:
+                            ids.extend(self._insert(db, [payload]))
+                        except Exception as row_exc:
+                            db.rollback()
+                            ids.append(row_exc)
+            written = iter(ids)
+            return self._load(db, [rejected.get(index) or next(written) for index in range(len(payloads))])
+        finally:
+            db.close()
+
+    @staticmethod
+    def _check_references(db: Session, payloads: List[TransactionCreate]) -> Dict[int, HTTPException]:
+        """Map the index of each row whose item or user doesn't exist to its 400 error."""
+        items = {row_id for (row_id,) in db.query(Item.id).filter(Item.id.in_({p.item_id for p in payloads}))}
+        users = {row_id for (row_id,) in db.query(User.id).filter(User.id.in_({p.user_id for p in payloads}))}
+        rejected = {}
+        for index, payload in enumerate(payloads):
+            if payload.item_id not in items:
+                rejected[index] = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item not found")
+            elif payload.user_id not in users:
+                rejected[index] = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not found")
+        return rejected
+
+    def _insert(self, db: Session, payloads: List[TransactionCreate]) -> List[int]:
+        """Insert the rows and apply item state changes in a single commit."""
+        transactions = [Transaction(**payload.model_dump()) for payload in payloads]
+        db.add_all(transactions)
+
+        # Apply state changes in arrival order so the last write for an item wins
+        new_states = {p.item_id: p.state for p in payloads if p.state}
+        if new_states:
+            for item in db.query(Item).filter(Item.id.in_(new_states)):
+                item.state = new_states[item.id]
+
+        db.flush()
+        ids = [t.id for t in transactions]
+        db.commit()
+        invalidate_stats()
+        self.batches += 1
+        self.rows += len(ids)
+        return ids
+
+    def _load(self, db: Session, ids: list) -> list:
+        """Fetch the committed rows with one eager SELECT; failed slots keep their exception."""
+        wanted = [i for i in ids if not isinstance(i, Exception)]
+        rows = {
+            t.id: t
+            for t in db.query(Transaction).options(*EAGER_RELATIONS).filter(Transaction.id.in_(wanted))
+        } if wanted else {}
+        results = []
+        for i in ids:
+            if isinstance(i, Exception):
+                results.append(i)
+                continue
+            try:
+                results.append(TransactionRead.model_validate(rows[i], from_attributes=True))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+
+_writer: Optional[TransactionWriter] = None
+
+
+def get_transaction_writer() -> TransactionWriter:
+    """Dependency that provides the process-wide transaction writer."""
+    global _writer
+    if _writer is None:
+        from ..database import SessionLocal
+        _writer = TransactionWriter(SessionLocal)
+    return _writer
+
+
+async def close_transaction_writer() -> None:
+    """Flush and stop the process-wide writer, if it was started."""
+    if _writer is not None:
+        await _writer.close()
@@ -1,10 +1,35 @@
+import os
 from typing import Optional, List
+from ..cache import TTLCache
 from ..models import User
 from ..schemas import UserCreate, UserUpdate, UserInDB, UserRoleUpdate
 from ..shared_enums import UserRole
 from .base_service import BaseService
 from ..repositories.user_repository import UserRepository
-from ..password_utils import get_password_hash, verify_password
+from fastapi.concurrency import run_in_threadpool
+
+from ..password_utils import get_password_hash, get_password_hash_async, verify_password, verify_password_async
+from .token_epochs import token_epochs
+
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAXSIZE = int(os.environ.get("USER_CACHE_MAXSIZE", "1024"))
+
+# Users resolved from access tokens, keyed by username; cleared by `invalidate_user()`
+user_cache = TTLCache(ttl=USER_CACHE_TTL_SECONDS, maxsize=USER_CACHE_MAXSIZE)
+
+
+def invalidate_user(user: User) -> None:
+    """Drop a user's cached entry; call after committing a change to the user."""
+    user_cache.invalidate(user.username)
+
+
+def user_snapshot(user: User) -> UserInDB:
+    """Detached copy of a user that is safe to share between requests.
+
+    Built without validation: the values come straight from the database.
+    """
+    return UserInDB.model_construct(**{name: getattr(user, name) for name in UserInDB.model_fields})
+
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
     """Service for user operations."""
@@ -24,12 +49,27 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """Authenticate a user with username and password."""
         return self.repository.authenticate(username, password)
     
+    async def authenticate_async(self, username: str, password: str) -> Optional[User]:
+        """`authenticate` for async routes: the lookup runs in the threadpool and the
+        password check on the hashing process pool, never on the event loop.
+        Attempts are logged the same way as in `authenticate`."""
+        user = await run_in_threadpool(self.repository.get_for_login, username)
+        if user is None:
+            return None
+        verified = await verify_password_async(password, user.hashed_password)
+        return user if self.repository.check_login_password(user, verified) else None
+    
     def create(self, user_in: UserCreate) -> User:
         """Create a new user with hashed password."""
         hashed_password = get_password_hash(user_in.password)
         db_user = self.repository.create(user_in, hashed_password)
         return db_user
     
+    async def create_async(self, user_in: UserCreate) -> User:
+        """`create` for async routes, hashing the password on the process pool."""
+        hashed_password = await get_password_hash_async(user_in.password)
+        return await run_in_threadpool(self.repository.create, user_in, hashed_password)
+    
     def update_password(self, user_id: int, current_password: str, new_password: str) -> bool:
         """Update user's password after verifying current password."""
         user = self.get(user_id)
@@ -38,6 +78,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         
         hashed_password = get_password_hash(new_password)
         self.repository.update_password(user_id, hashed_password)
+        self._user_changed(user)
         return True
     
     def update_role(self, user_id: int, role: UserRole) -> Optional[User]:
@@ -47,8 +88,8 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             return None
         
         user.role = role
-        self.repository.db.commit()
-        self.repository.db.refresh(user)
+        self.repository.commit(user)
+        self._user_changed(user)
         return user
     
     def update_user_active(self, user_id: int, is_active: bool) -> Optional[User]:
@@ -58,10 +99,15 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             return None
         
         user.is_active = is_active
-        self.repository.db.commit()
-        self.repository.db.refresh(user)
+        self.repository.commit(user)
+        self._user_changed(user)
         return user
     
+    def _user_changed(self, user: User) -> None:
+        """Drop the cached user and revoke their access tokens after a committed change."""
+        invalidate_user(user)
+        token_epochs.bump(self.repository.db, user.id)
+
     def get_active_users(self) -> list[User]:
         """Get all active users."""
         return self.repository.get_active_users()
@@ -1,6 +1,15 @@
 import os
+import shutil
+import tempfile
+
+# backend.main connects to DATABASE_URL (and creates its tables) on import, so
+# point it at a throwaway file before then instead of the tracked default one
+_APP_DB_DIR = tempfile.mkdtemp(prefix="inventory-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_APP_DB_DIR, 'app.db')}"
+
 import pytest
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
@@ -9,16 +18,20 @@ from datetime import datetime
 from backend.main import app
 from backend import models
 from backend.base import Base
+from backend.database import configure_sqlite_engine
 from backend.dependencies import get_db
+from backend.services.export_partitions import ExportPartitions, get_export_partitions
 from backend.shared_enums import UserRole
 from backend.password_utils import get_password_hash
+from backend.rate_limit import ip_buckets, username_buckets
 
-# Create an in-memory SQLite database shared across threads
-TEST_ENGINE = create_engine(
+# Create an in-memory SQLite database shared across threads, with the app's
+# SQLite profile so foreign keys are enforced as in production
+TEST_ENGINE = configure_sqlite_engine(create_engine(
     "sqlite://",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
-)
+))
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=TEST_ENGINE)
 
@@ -28,6 +41,7 @@ def create_test_db():
     Base.metadata.create_all(bind=TEST_ENGINE)
     yield
     Base.metadata.drop_all(bind=TEST_ENGINE)
+    shutil.rmtree(_APP_DB_DIR, ignore_errors=True)
 
 # Override get_db dependency to use the in-memory DB
 @pytest.fixture(scope="function")
@@ -38,14 +52,22 @@ def db_session():
     finally:
         session.close()
 
+@pytest.fixture(scope="function")
+def export_partitions(tmp_path):
+    return ExportPartitions(directory=str(tmp_path / "days"))
+
 @pytest.fixture(scope="function", autouse=True)
-def override_dependencies(db_session):
+def override_dependencies(db_session, export_partitions):
     def _get_db():
         try:
             yield db_session
         finally:
             pass
     app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_export_partitions] = lambda: export_partitions
+    # Every test logs in afresh; don't let one test's logins throttle the next
+    ip_buckets.clear()
+    username_buckets.clear()
     yield
     app.dependency_overrides.clear()
 
@@ -86,3 +108,20 @@ def auth_header(client, create_user):
         token = response.json()["access_token"]
         return {"Authorization": f"Bearer {token}"}
     return _auth_header
+
+@pytest.fixture()
+def count_queries():
+    """Context manager that records the SQL statements issued on the test engine."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_cursor_execute)
+    return _count_queries
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("aiosqlite")
+
+from backend import models
+from backend.api.v1.routers import items, transactions
+from backend.base import Base
+from backend.database import build_async_engine, build_engine, make_async_sessionmaker
+from backend.dependencies import get_async_db
+
+
+@pytest.fixture()
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = build_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+
+    session = sessionmaker(bind=sync_engine)()
+    user = models.User(username="async_admin", hashed_password="x")
+    category = models.Category(name="Async")
+    session.add_all([user, category])
+    session.flush()
+    base = datetime(2025, 3, 1, 9, 0, 0)
+    for i in range(5):
+        item = models.Item(unique_id=f"SKU-ASYNC-{i}", name=f"Async {i}", category_id=category.id)
+        session.add(item)
+        session.flush()
+        session.add(models.Transaction(
+            item_id=item.id,
+            user_id=user.id,
+            action=models.TransactionType.sign_out,
+            timestamp=base + timedelta(minutes=i),
+        ))
+    session.commit()
+    session.close()
+    sync_engine.dispose()
+
+    async_engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    AsyncTestingSession = make_async_sessionmaker(async_engine)
+
+    async def _get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(items.async_router, prefix="/api/v1/items")
+    app.include_router(transactions.async_router, prefix="/api/v1/transactions")
+    app.dependency_overrides[get_async_db] = _get_async_db
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(async_engine.dispose)
+
+
+def test_async_items_list(async_client):
+    r = async_client.get("/api/v1/items/")
+    assert r.status_code == 200, r.text
+    rows = r.json()
+    assert len(rows) == 5
+    assert all(row["category"]["name"] == "Async" for row in rows)
+
+
+def test_async_transactions_pages_match_sync_semantics(async_client):
+    r = async_client.get("/api/v1/transactions/", params={"limit": 3})
+    assert r.status_code == 200, r.text
+    first = r.json()
+    assert [t["item"]["unique_id"] for t in first["items"]] == [
+        "SKU-ASYNC-4", "SKU-ASYNC-3", "SKU-ASYNC-2",
+    ]
+    assert first["items"][0]["user"]["username"] == "async_admin"
+    assert first["next_cursor"]
+
+    r = async_client.get("/api/v1/transactions/", params={"limit": 3, "cursor": first["next_cursor"]})
+    second = r.json()
+    assert [t["item"]["unique_id"] for t in second["items"]] == ["SKU-ASYNC-1", "SKU-ASYNC-0"]
+    assert second["next_cursor"] is None
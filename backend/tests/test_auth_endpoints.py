@@ -34,3 +34,244 @@ def test_create_user_and_login_flow(client: TestClient):
     assert r.status_code == 200, r.text
     me = r.json()
     assert me["username"] == "testuser"
+
+
+def test_claims_mode_authorises_from_token_and_revokes_by_epoch(client: TestClient, create_user, auth_header,
+                                                                count_queries, monkeypatch):
+    from jose import jwt
+    from backend import dependencies
+    from backend.services.token_epochs import token_epochs
+
+    monkeypatch.setattr(dependencies, "JWT_CLAIMS_MODE", True)
+    token_epochs.clear()
+    create_user("super_claims", "pass123", role=UserRole.superadmin)
+    target = create_user("admin_claims", "pass123", role=UserRole.admin)
+    super_headers = auth_header("super_claims", "pass123")
+    admin_headers = auth_header("admin_claims", "pass123")
+
+    claims = jwt.get_unverified_claims(admin_headers["Authorization"].split()[1])
+    assert claims["uid"] == target.id
+    assert claims["role"] == "admin"
+    assert claims["token_epoch"] == 0
+
+    # Role checks run on the claims alone: no user or epoch lookups
+    with count_queries() as statements:
+        r = client.get("/api/v1/users/", headers=admin_headers)
+    assert r.status_code == 403
+    assert statements == []
+
+    r = client.get("/api/v1/auth/me", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["full_name"] == "Admin_Claims"
+
+    # Changing the role bumps the epoch, so tokens carrying the old role stop working
+    r = client.put(f"/api/v1/users/{target.id}/role", json={"role": "superadmin"}, headers=super_headers)
+    assert r.status_code == 200, r.text
+    r = client.get("/api/v1/users/", headers=admin_headers)
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Token has been revoked"
+
+    r = client.get("/api/v1/users/", headers=auth_header("admin_claims", "pass123"))
+    assert r.status_code == 200, r.text
+
+
+def test_async_password_helpers_use_the_process_pool():
+    import asyncio
+    from backend.password_utils import get_password_hash_async, verify_password, verify_password_async
+
+    async def run():
+        hashed = await get_password_hash_async("s3cret")
+        return hashed, await verify_password_async("s3cret", hashed), await verify_password_async("nope", hashed)
+
+    hashed, ok, wrong = asyncio.run(run())
+    assert verify_password("s3cret", hashed)
+    assert ok is True
+    assert wrong is False
+
+
+def test_login_is_rate_limited_per_username_and_ip(client: TestClient, create_user, monkeypatch):
+    from backend.password_utils import verify_password
+    from backend.services import user_service
+
+    verified = []
+
+    async def counting_verify(plain, hashed):
+        verified.append(plain)
+        return verify_password(plain, hashed)
+
+    monkeypatch.setattr(user_service, "verify_password_async", counting_verify)
+    create_user("limited", "pass123")
+
+    def login(username, password):
+        form = {"grant_type": "password", "username": username, "password": password, "scope": ""}
+        return client.post("/api/v1/auth/token", data=form)
+
+    # The username bucket holds 5 attempts; the next is refused before any hashing
+    for _ in range(5):
+        assert login("limited", "wrong").status_code == 401
+    r = login("limited", "pass123")
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+    assert len(verified) == 5
+
+    # Other usernames are unaffected until the client IP's bucket of 10 runs out
+    create_user("other", "pass123")
+    for _ in range(4):
+        assert login("other", "pass123").status_code == 200
+    assert login("other", "pass123").status_code == 429
+    assert len(verified) == 9
+
+
+def test_authentication_does_not_block_the_event_loop(create_user, monkeypatch):
+    import asyncio
+    import time
+
+    import httpx
+    from backend import models
+    from backend.main import app
+    from backend.repositories.user_repository import UserRepository
+    from backend.services.user_service import user_cache
+
+    user = create_user("loop_user", "pass123", role=UserRole.admin)
+    detached = models.User(id=user.id, username=user.username, full_name=user.full_name, email=None,
+                           hashed_password=user.hashed_password, role=user.role, is_active=True)
+    token = None
+
+    # A slow user lookup: 50 ms that must be spent off the event loop
+    def slow_get_by_username(self, username):
+        time.sleep(0.05)
+        return detached
+
+    async def run():
+        nonlocal token
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            form = {"grant_type": "password", "username": "loop_user", "password": "pass123", "scope": ""}
+            token = (await client.post("/api/v1/auth/token", data=form)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            # Warm up the route and the threadpool before measuring
+            assert (await client.get("/api/v1/stats/cache", headers=headers)).status_code == 200
+            monkeypatch.setattr(UserRepository, "get_by_username", slow_get_by_username)
+
+            gaps = []
+            running = True
+
+            async def ticker():
+                while running:
+                    started = time.perf_counter()
+                    await asyncio.sleep(0.002)
+                    gaps.append(time.perf_counter() - started)
+
+            async def request():
+                user_cache.invalidate()
+                r = await client.get("/api/v1/stats/cache", headers=headers)
+                assert r.status_code == 200, r.text
+
+            tick = asyncio.create_task(ticker())
+            await asyncio.gather(*(request() for _ in range(8)))
+            running = False
+            await tick
+            return gaps
+
+    gaps = asyncio.run(run())
+    assert len(gaps) > 10
+    assert max(gaps) < 0.04, f"event loop blocked for {max(gaps) * 1000:.0f} ms"
+
+
+def test_token_epoch_refresh_never_undoes_a_local_bump(db_session, create_user, monkeypatch):
+    from backend.repositories.token_epoch_repository import TokenEpochRepository
+    from backend.services.token_epochs import TokenEpochTable
+
+    user = create_user("epoch_race", "pass123")
+    table = TokenEpochTable()
+    table.refresh(db_session)
+    stale = TokenEpochRepository(db_session).get_all()
+
+    # A refresh whose read finished before the bump committed must not roll it back
+    epoch = table.bump(db_session, user.id)
+    monkeypatch.setattr(TokenEpochRepository, "get_all", lambda self: dict(stale))
+    table.refresh(db_session)
+    assert table.current(db_session, user.id) == epoch >= 1
+
+
+def test_failed_logins_are_logged(client: TestClient, create_user, caplog):
+    import logging
+
+    create_user("logged_user", "pass123")
+    form = {"grant_type": "password", "username": "logged_user", "password": "wrong", "scope": ""}
+    with caplog.at_level(logging.INFO, logger="backend.repositories.user_repository"):
+        assert client.post("/api/v1/auth/token", data=form).status_code == 401
+        form["username"] = "nobody_here"
+        assert client.post("/api/v1/auth/token", data=form).status_code == 401
+
+    messages = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert "Authentication failed: Incorrect password for user 'logged_user'." in messages
+    assert "Authentication failed: User 'nobody_here' not found." in messages
+
+
+def test_padded_login_form_cannot_skip_the_username_limit(client: TestClient, create_user, monkeypatch):
+    from backend.services import user_service
+
+    verified = []
+
+    async def counting_verify(plain, hashed):
+        verified.append(plain)
+        return False
+
+    monkeypatch.setattr(user_service, "verify_password_async", counting_verify)
+    create_user("padded", "pass123")
+    form = {"grant_type": "password", "username": "padded", "password": "wrong", "scope": ""}
+
+    r = client.post("/api/v1/auth/token", data={**form, "pad": "x" * 17_000})
+    assert r.status_code == 413
+    assert verified == []
+
+    for _ in range(5):
+        assert client.post("/api/v1/auth/token", data=form).status_code == 401
+    assert client.post("/api/v1/auth/token", data={**form, "pad": "x" * 17_000}).status_code in (413, 429)
+    assert client.post("/api/v1/auth/token", data=form).status_code == 429
+    assert len(verified) == 5
+
+
+def test_repeated_username_field_is_limited_on_the_value_the_route_uses(client: TestClient, create_user, monkeypatch):
+    from backend.services import user_service
+
+    verified = []
+
+    async def counting_verify(plain, hashed):
+        verified.append(plain)
+        return False
+
+    monkeypatch.setattr(user_service, "verify_password_async", counting_verify)
+    create_user("victim", "pass123")
+
+    def login(decoy):
+        body = f"grant_type=password&username={decoy}&username=victim&password=wrong&scope="
+        return client.post("/api/v1/auth/token", content=body,
+                           headers={"Content-Type": "application/x-www-form-urlencoded"})
+
+    statuses = [login(f"decoy{i}").status_code for i in range(8)]
+    assert statuses == [401] * 5 + [429] * 3
+    assert len(verified) == 5
+
+
+def test_multipart_logins_are_limited_per_username(client: TestClient, create_user, monkeypatch):
+    from backend.services import user_service
+
+    verified = []
+
+    async def counting_verify(plain, hashed):
+        verified.append(plain)
+        return False
+
+    monkeypatch.setattr(user_service, "verify_password_async", counting_verify)
+    create_user("multipart_user", "pass123")
+    form = {"grant_type": "password", "username": "multipart_user", "password": "wrong", "scope": ""}
+
+    statuses = [
+        # Sending a file makes httpx encode the form as multipart/form-data
+        client.post("/api/v1/auth/token", data=form, files={"pad": ("pad.txt", b"x")}).status_code
+        for _ in range(8)
+    ]
+    assert statuses == [401] * 5 + [429] * 3
+    assert len(verified) == 5
@@ -0,0 +1,31 @@
+from sqlalchemy.pool import QueuePool
+
+from backend.database import build_engine, POOL_SIZE, SQLITE_PRAGMAS
+
+
+def test_sqlite_file_engine_applies_profile(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == POOL_SIZE
+        with engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+            assert pragma("foreign_keys") == 1
+            assert pragma("temp_store") == 2  # MEMORY
+            assert pragma("cache_size") < 0
+            assert pragma("mmap_size") > 0
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_memory_engine_keeps_default_pool():
+    engine = build_engine("sqlite://")
+    try:
+        assert not isinstance(engine.pool, QueuePool)
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    finally:
+        engine.dispose()
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from backend.shared_enums import UserRole
+
+
+def test_device_key_issue_use_and_revoke(client: TestClient, db_session, create_user, auth_header, count_queries):
+    from backend import models
+
+    admin = create_user("admin_dk", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_dk", "pass123")
+    item = models.Item(unique_id="SKU-DK-1", name="Scanner target")
+    db_session.add(item)
+    db_session.commit()
+
+    r = client.post("/api/v1/device-keys/", json={"name": "Dock scanner"}, headers=headers)
+    assert r.status_code == 201, r.text
+    issued = r.json()
+    key = issued["key"]
+    assert issued["user_id"] == admin.id
+    assert key.startswith(f"dk_{issued['key_id']}_")
+
+    # Only a keyed hash is stored, and listings never show the key
+    stored = db_session.get(models.DeviceKey, issued["id"])
+    assert key not in (stored.key_hash, stored.key_id)
+    r = client.get("/api/v1/device-keys/", headers=headers)
+    assert r.status_code == 200
+    assert [k["id"] for k in r.json()] == [issued["id"]]
+    assert "key" not in r.json()[0]
+
+    tx = {
+        "item_id": item.id,
+        "user_id": admin.id,
+        "action": "sign_out",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "notes": "Scanned at dock",
+        "state": "good",
+    }
+    # The key is checked with a single query that also loads its user
+    with count_queries() as statements:
+        r = client.post("/api/v1/transactions/", json=tx, headers={"X-Device-Key": key})
+    assert r.status_code == 201, r.text
+    assert sum("device_keys" in s for s in statements) == 1
+    r = client.post("/api/v1/transactions/", json=tx, headers={"Authorization": f"Bearer {key}"})
+    assert r.status_code == 201, r.text
+
+    r = client.post("/api/v1/transactions/", json=tx, headers={"X-Device-Key": key[:-1] + "x"})
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Invalid device key"
+
+    r = client.delete(f"/api/v1/device-keys/{issued['id']}", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["revoked_at"] is not None
+    r = client.post("/api/v1/transactions/", json=tx, headers={"X-Device-Key": key})
+    assert r.status_code == 401
+
+
+def test_only_superadmins_issue_keys_for_other_users(client: TestClient, create_user, auth_header):
+    create_user("super_dk", "pass123", role=UserRole.superadmin)
+    admin = create_user("admin_dk2", "pass123", role=UserRole.admin)
+
+    r = client.post("/api/v1/device-keys/", json={"name": "x", "user_id": 1_000_000},
+                    headers=auth_header("admin_dk2", "pass123"))
+    assert r.status_code == 403
+
+    r = client.post("/api/v1/device-keys/", json={"name": "Integration", "user_id": admin.id},
+                    headers=auth_header("super_dk", "pass123"))
+    assert r.status_code == 201, r.text
+    assert r.json()["user_id"] == admin.id
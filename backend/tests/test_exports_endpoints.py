@@ -0,0 +1,81 @@
+import csv
+import io
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.main import app
+from backend.services.export_jobs import ExportJobManager, get_export_jobs
+from backend.shared_enums import UserRole
+
+
+@pytest.fixture()
+def export_jobs(db_session, export_partitions, tmp_path):
+    jobs = ExportJobManager(
+        sessionmaker(bind=db_session.get_bind()),
+        directory=str(tmp_path / "jobs"),
+        max_workers=1,
+        partitions=export_partitions,
+    )
+    app.dependency_overrides[get_export_jobs] = lambda: jobs
+    yield jobs
+    jobs.close()
+
+
+def test_export_job_builds_and_reuses_cached_file(client: TestClient, db_session, create_user, auth_header, export_jobs):
+    admin = create_user("admin_export_job", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_export_job", "pass123")
+    item = models.Item(unique_id="SKU-EXPORT-JOB", name="Export Job Item")
+    db_session.add(item)
+    db_session.commit()
+    for day in (5, 6):
+        db_session.add(models.Transaction(
+            item_id=item.id, user_id=admin.id, action=models.TransactionType.sign_in,
+            timestamp=datetime(2024, 3, day, 9, 0), notes=f"job day {day}", state=models.ItemState.good,
+        ))
+    db_session.commit()
+    payload = {"start": "2024-03-05T00:00:00", "end": "2024-03-06T23:59:59", "format": "csv"}
+
+    r = client.post("/api/v1/exports/", json=payload, headers=headers)
+    assert r.status_code == 202, r.text
+    job = r.json()
+    assert job["rows_total"] == 2
+    export_jobs.wait(job["id"], timeout=10)
+
+    r = client.get(f"/api/v1/exports/{job['id']}", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "done"
+    assert r.json()["rows_done"] == 2
+
+    r = client.get(r.json()["download_url"], headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["notes"] for row in rows] == ["job day 5", "job day 6"]
+    assert rows[0]["item_unique_id"] == "SKU-EXPORT-JOB"
+
+    # Same range and data: served from the cached file without a new job
+    r = client.post("/api/v1/exports/", json=payload, headers=headers)
+    assert r.json()["id"] == job["id"] and r.json()["status"] == "done"
+
+    # A new row in the range changes the data version, so a new file is built
+    db_session.add(models.Transaction(
+        item_id=item.id, user_id=admin.id, action=models.TransactionType.sign_out,
+        timestamp=datetime(2024, 3, 6, 10, 0), notes="job day 6 again", state=models.ItemState.good,
+    ))
+    db_session.commit()
+    r = client.post("/api/v1/exports/", json=payload, headers=headers)
+    assert r.json()["id"] != job["id"]
+    assert r.json()["rows_total"] == 3
+
+
+def test_export_job_unknown_and_unfinished(client: TestClient, create_user, auth_header, export_jobs):
+    create_user("admin_export_missing", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_export_missing", "pass123")
+    r = client.get("/api/v1/exports/does-not-exist", headers=headers)
+    assert r.status_code == 404
+    r = client.get("/api/v1/exports/does-not-exist/download", headers=headers)
+    assert r.status_code == 404
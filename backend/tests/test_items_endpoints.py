@@ -29,3 +29,251 @@ def test_items_crud_flow_minimal(client: TestClient, create_user, auth_header):
     r = client.delete(f"/api/v1/items/{item_id}", headers=headers)
     assert r.status_code == 200
     assert r.json()["id"] == item_id
+
+
+def test_items_with_unknown_category_are_refused(client: TestClient, create_user, auth_header):
+    create_user("admin_items_fk", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_items_fk", "pass123")
+
+    payload = {"unique_id": "SKU-FK-1", "name": "Rope", "description": None, "category_id": 999999}
+    r = client.post("/api/v1/items/", json=payload, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Category not found"
+
+    r = client.post("/api/v1/items/", json={**payload, "category_id": None}, headers=headers)
+    assert r.status_code == 200, r.text
+    r = client.put(f"/api/v1/items/{r.json()['id']}", json={"category_id": 999999}, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Category not found"
+
+
+def test_items_bulk_import_csv(client: TestClient, create_user, auth_header):
+    import io
+
+    create_user("admin_import", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_import", "pass123")
+    r = client.post("/api/v1/categories/", json={"name": "Import Tools", "description": None}, headers=headers)
+    assert r.status_code == 201, r.text
+    r = client.post("/api/v1/items/", json={"unique_id": "SKU-IMP-TAKEN", "name": "Taken", "description": None}, headers=headers)
+    assert r.status_code == 200, r.text
+
+    csv_body = (
+        "unique_id,name,description,category,state,location,purchase_date\n"
+        "SKU-IMP-1,Hammer,Claw hammer,import tools,good,Shelf A,2025-01-15\n"
+        "SKU-IMP-2,Saw,,Import Tools,MODERATE,Shelf B,\n"
+        "SKU-IMP-1,Hammer again,,,good,,\n"
+        "SKU-IMP-TAKEN,Clash,,,good,,\n"
+        "SKU-IMP-3,Wrench,,No Such Category,good,,\n"
+        "SKU-IMP-4,Pliers,,,broken,,\n"
+        ",Nameless,,,good,,\n"
+    )
+    files = {"file": ("items.csv", io.BytesIO(csv_body.encode()), "text/csv")}
+    r = client.post("/api/v1/items/import", files=files, headers=headers)
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["created"] == 2
+    assert report["failed"] == 5
+    assert {e["row"]: e["unique_id"] for e in report["errors"]} == {
+        4: "SKU-IMP-1", 5: "SKU-IMP-TAKEN", 6: "SKU-IMP-3", 7: "SKU-IMP-4", 8: None,
+    }
+
+    items = {row["unique_id"]: row for row in client.get("/api/v1/items/", params={"limit": 500}).json()}
+    assert items["SKU-IMP-1"]["category"]["name"] == "Import Tools"
+    assert items["SKU-IMP-2"]["state"] == "moderate"
+
+
+def test_items_bulk_import_reports_unknown_category_ids(client: TestClient, create_user, auth_header):
+    import io
+
+    create_user("admin_import_ids", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_import_ids", "pass123")
+    r = client.post("/api/v1/categories/", json={"name": "Import By Id", "description": None}, headers=headers)
+    assert r.status_code == 201, r.text
+    category_id = r.json()["id"]
+
+    csv_body = (
+        "unique_id,name,category_id\n"
+        f"SKU-IMPID-1,Level,{category_id}\n"
+        "SKU-IMPID-2,Square,999999\n"
+        "SKU-IMPID-3,Chisel,\n"
+    )
+    files = {"file": ("items.csv", io.BytesIO(csv_body.encode()), "text/csv")}
+    r = client.post("/api/v1/items/import", files=files, headers=headers)
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["created"] == 2
+    assert report["errors"] == [{"row": 3, "unique_id": "SKU-IMPID-2", "error": "Unknown category_id 999999"}]
+
+
+def test_items_bulk_import_xlsx_and_rejects_unknown_format(client: TestClient, create_user, auth_header):
+    import io
+    from openpyxl import Workbook
+
+    create_user("admin_import_x", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_import_x", "pass123")
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Unique_ID", "Name", "State"])
+    ws.append([90001, "Numeric barcode", "good"])
+    ws.append(["SKU-IMP-X2", "Lamp", "bad"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    files = {"file": ("items.xlsx", buf, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+    r = client.post("/api/v1/items/import", files=files, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"created": 2, "failed": 0, "errors": []}
+
+    files = {"file": ("items.txt", io.BytesIO(b"nope"), "text/plain")}
+    r = client.post("/api/v1/items/import", files=files, headers=headers)
+    assert r.status_code == 400
+
+
+def test_items_list_filters_sorts_and_pages(client: TestClient, db_session, create_user, auth_header):
+    from datetime import datetime
+    from backend import models
+
+    create_user("admin_items_page", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_items_page", "pass123")
+    category = models.Category(name="Paging Category")
+    db_session.add(category)
+    db_session.commit()
+    purchase_dates = [datetime(2024, 1, 5), None, datetime(2024, 3, 1), datetime(2024, 1, 5), None, datetime(2023, 7, 9)]
+    for i, purchased in enumerate(purchase_dates):
+        r = client.post("/api/v1/items/", json={
+            "unique_id": f"SKU-PAGE-{i}",
+            "name": f"Paging {i}",
+            "description": None,
+            "category_id": category.id,
+            "state": "bad" if i % 2 else "good",
+            "location": "Shelf P",
+            "purchase_date": purchased.isoformat() if purchased else None,
+        }, headers=headers)
+        assert r.status_code == 200, r.text
+
+    def walk(**params):
+        rows, cursor, totals = [], None, set()
+        while True:
+            query = {"category_id": category.id, "limit": 2, **params}
+            if cursor:
+                query["cursor"] = cursor
+            r = client.get("/api/v1/items/", params=query)
+            assert r.status_code == 200, r.text
+            totals.add(r.headers["X-Total-Count"])
+            rows.extend(row["unique_id"] for row in r.json())
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                return rows, totals
+
+    # NULLs first ascending, last descending; ties broken by id
+    rows, totals = walk(sort="purchase_date")
+    assert rows == [f"SKU-PAGE-{i}" for i in (1, 4, 5, 0, 3, 2)]
+    assert totals == {"6"}
+    rows, _ = walk(sort="purchase_date", order="desc")
+    assert rows == [f"SKU-PAGE-{i}" for i in (2, 3, 0, 5, 4, 1)]
+    rows, _ = walk(sort="name", order="desc")
+    assert rows == [f"SKU-PAGE-{i}" for i in range(5, -1, -1)]
+
+    rows, totals = walk(state="bad", purchase_from="2024-01-01")
+    assert rows == ["SKU-PAGE-3"]
+    assert totals == {"1"}
+    rows, _ = walk(location="Shelf P", name="paging 4")
+    assert rows == ["SKU-PAGE-4"]
+
+    # A cursor only continues the sort it was issued for
+    r = client.get("/api/v1/items/", params={"category_id": category.id, "limit": 2, "sort": "name"})
+    r = client.get("/api/v1/items/", params={"cursor": r.headers["X-Next-Cursor"], "sort": "id"})
+    assert r.status_code == 400
+
+
+def test_items_suggest_tracks_item_writes(client: TestClient, create_user, auth_header, count_queries):
+    from backend.services.suggest_index import suggest_index
+
+    create_user("admin_items_suggest", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_items_suggest", "pass123")
+    suggest_index.invalidate()
+
+    ids = {}
+    for unique_id, name in [("BC-7781", "Cordless Drill"), ("BC-7790", "Drill Press"), ("BC-8800", "Ladder")]:
+        r = client.post("/api/v1/items/", json={"unique_id": unique_id, "name": name, "description": None}, headers=headers)
+        ids[unique_id] = r.json()["id"]
+
+    r = client.get("/api/v1/items/suggest", params={"prefix": "bc-77"})
+    assert r.status_code == 200, r.text
+    assert [s["unique_id"] for s in r.json()] == ["BC-7781", "BC-7790"]
+
+    # Name and later-word prefixes, case-insensitive; answered without SQL
+    with count_queries() as statements:
+        r = client.get("/api/v1/items/suggest", params={"prefix": "DRIL"})
+    assert {s["unique_id"] for s in r.json()} == {"BC-7781", "BC-7790"}
+    assert statements == []
+
+    client.put(f"/api/v1/items/{ids['BC-8800']}", json={"unique_id": "BC-7700", "name": "Step Ladder"}, headers=headers)
+    client.delete(f"/api/v1/items/{ids['BC-7781']}", headers=headers)
+    r = client.get("/api/v1/items/suggest", params={"prefix": "bc-77"})
+    assert [s["unique_id"] for s in r.json()] == ["BC-7700", "BC-7790"]
+    r = client.get("/api/v1/items/suggest", params={"prefix": "lad"})
+    assert [s["name"] for s in r.json()] == ["Step Ladder"]
+    r = client.get("/api/v1/items/suggest", params={"prefix": "bc-", "limit": 1})
+    assert len(r.json()) == 1
+
+
+def test_items_export_formats_use_category_names(client: TestClient, db_session, create_user, auth_header,
+                                                 count_queries, tmp_path):
+    import csv
+    import io
+    import json
+    from openpyxl import load_workbook
+    from backend import models
+    from backend.utils import export_inventory_to_excel
+
+    create_user("admin_items_export", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_items_export", "pass123")
+    category = models.Category(name="Export Category")
+    db_session.add(category)
+    db_session.commit()
+    for i, state in enumerate(["good", "bad"]):
+        r = client.post("/api/v1/items/", json={
+            "unique_id": f"SKU-ITEM-EXPORT-{i}",
+            "name": f"Item Export {i}",
+            "description": None,
+            "category_id": category.id,
+            "state": state,
+            "location": "Shelf E",
+        }, headers=headers)
+        assert r.status_code == 200, r.text
+    params = {"category_id": category.id}
+
+    with count_queries() as statements:
+        r = client.get("/api/v1/items/export", params={**params, "format": "csv"}, headers=headers)
+    assert r.status_code == 200, r.text
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [(row["unique_id"], row["category"], row["state"]) for row in rows] == [
+        ("SKU-ITEM-EXPORT-0", "Export Category", "good"),
+        ("SKU-ITEM-EXPORT-1", "Export Category", "bad"),
+    ]
+    # One joined SELECT, no per-item category lookups
+    assert sum("FROM items" in s for s in statements) == 1
+
+    r = client.get("/api/v1/items/export", params={**params, "format": "ndjson", "state": "bad"}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 1
+    assert records[0]["unique_id"] == "SKU-ITEM-EXPORT-1" and records[0]["description"] is None
+
+    r = client.get("/api/v1/items/export", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    values = list(load_workbook(io.BytesIO(r.content), read_only=True)["Inventory"].iter_rows(values_only=True))
+    assert values[0][4] == "category"
+    assert [row[4] for row in values[1:]] == ["Export Category", "Export Category"]
+
+    r = client.get("/api/v1/items/export", params={"format": "csv"})
+    assert r.status_code == 401
+
+    # The standalone report writes category names too
+    path = export_inventory_to_excel(db_session, str(tmp_path / "report.xlsx"))
+    values = list(load_workbook(path, read_only=True)["Inventory"].iter_rows(values_only=True))
+    assert values[0][4] == "Category"
+    assert ("SKU-ITEM-EXPORT-0", "Export Category") in {(row[1], row[4]) for row in values[1:]}
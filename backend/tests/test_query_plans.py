@@ -0,0 +1,103 @@
+import re
+from datetime import datetime
+
+from sqlalchemy import event
+
+from backend.models import ItemState
+from backend.repositories.item_repository import ItemRepository
+from backend.repositories.transaction_repository import TransactionRepository
+
+# A plain "SCAN <table>" (no index) means SQLite walks every row of the table
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?(transactions|items)\b(?!.*USING)")
+
+
+def explain_queries(db_session, run):
+    """Run `run()` and return the EXPLAIN QUERY PLAN details of every statement it issued."""
+    captured = []
+    engine = db_session.get_bind()
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    assert captured, "expected the repository call to issue SQL"
+
+    connection = db_session.connection()
+    plans = []
+    for statement, parameters in captured:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plans.append([row[-1] for row in rows])
+    return plans
+
+
+def assert_no_full_scan(plans):
+    for plan in plans:
+        for detail in plan:
+            assert not FULL_SCAN.match(detail), f"full table scan in plan: {plan}"
+
+
+def test_transaction_page_uses_keyset_index(db_session):
+    repo = TransactionRepository(db_session)
+    plans = explain_queries(db_session, lambda: repo.get_page(limit=50))
+    assert_no_full_scan(plans)
+    assert any("ix_transactions_timestamp_id" in d for plan in plans for d in plan)
+    assert not any("TEMP B-TREE" in d for plan in plans for d in plan)
+
+
+def test_transaction_page_after_cursor_uses_keyset_index(db_session):
+    repo = TransactionRepository(db_session)
+    plans = explain_queries(
+        db_session,
+        lambda: repo.get_page(limit=50, after=(datetime(2025, 1, 1), 10)),
+    )
+    assert_no_full_scan(plans)
+    assert not any("TEMP B-TREE" in d for plan in plans for d in plan)
+
+
+def test_transaction_history_by_item_and_user_uses_index(db_session):
+    repo = TransactionRepository(db_session)
+    plans = explain_queries(db_session, lambda: repo.get_page(item_id=1))
+    assert_no_full_scan(plans)
+    assert any("ix_transactions_item_id_timestamp" in d for plan in plans for d in plan)
+
+    plans = explain_queries(db_session, lambda: repo.get_page(user_id=1))
+    assert_no_full_scan(plans)
+    assert any("ix_transactions_user_id_timestamp" in d for plan in plans for d in plan)
+
+
+def test_transaction_date_range_uses_index(db_session):
+    repo = TransactionRepository(db_session)
+    plans = explain_queries(
+        db_session,
+        lambda: repo.get_by_date_range(datetime(2025, 1, 1), datetime(2025, 1, 8)),
+    )
+    assert_no_full_scan(plans)
+    assert any("ix_transactions_timestamp_id" in d for plan in plans for d in plan)
+
+
+def test_items_by_category_and_state_uses_index(db_session):
+    repo = ItemRepository(db_session)
+    plans = explain_queries(
+        db_session,
+        lambda: repo.get_multi(category_id=1, state=ItemState.good),
+    )
+    assert_no_full_scan(plans)
+    assert any("ix_items_category_id_state" in d for plan in plans for d in plan)
+
+
+def test_item_page_sort_keys_use_index(db_session):
+    repo = ItemRepository(db_session)
+    for sort, index in [("name", "ix_items_name"), ("purchase_date", "ix_items_purchase_date"),
+                        ("expiry_date", "ix_items_expiry_date")]:
+        for descending in (False, True):
+            plans = explain_queries(
+                db_session,
+                lambda: repo.get_page(sort=sort, descending=descending, after=("x", 10)),
+            )
+            assert_no_full_scan(plans)
+            assert any(index in d for plan in plans for d in plan), plans
+            assert not any("TEMP B-TREE" in d for plan in plans for d in plan), plans
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from backend.repositories.search_repository import to_match_query
+from backend.shared_enums import UserRole
+
+
+def test_match_query_quotes_terms():
+    assert to_match_query('SKU-001 "drill') == '"SKU-001"* "drill"*'
+    assert to_match_query('NEAR( * ') == '"NEAR"*'
+    assert to_match_query("-- ()") == ""
+
+
+def test_search_items_ranked_and_synced(client: TestClient, create_user, auth_header):
+    create_user("admin_search", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_search", "pass123")
+
+    def add(unique_id, name, description=None, location=None):
+        r = client.post("/api/v1/items/", json={
+            "unique_id": unique_id, "name": name, "description": description, "location": location,
+        }, headers=headers)
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+
+    drill = add("SKU-FTS-1", "Cordless Drill", "Zephyrine 18V drill with case", "Workshop")
+    add("SKU-FTS-2", "Ladder", "Mentions a zephyrine drill bit set", "Yard")
+    add("SKU-FTS-3", "Zephyrine Torch", None, "Workshop")
+
+    r = client.get("/api/v1/search/", params={"q": "zephyrine dril"}, headers=headers)
+    assert r.status_code == 200, r.text
+    hits = r.json()["hits"]
+    # Name matches outweigh description-only matches
+    assert [h["item"]["unique_id"] for h in hits] == ["SKU-FTS-1", "SKU-FTS-2"]
+    assert hits[0]["score"] > hits[1]["score"]
+
+    r = client.get("/api/v1/search/", params={"q": "sku-fts-", "limit": 2}, headers=headers)
+    page = r.json()
+    assert len(page["hits"]) == 2 and page["next_offset"] == 2
+    r = client.get("/api/v1/search/", params={"q": "sku-fts-", "limit": 2, "offset": 2}, headers=headers)
+    assert len(r.json()["hits"]) == 1 and r.json()["next_offset"] is None
+
+    # Updates and deletes go through the sync triggers
+    r = client.put(f"/api/v1/items/{drill}", json={"name": "Quillworth Drill", "description": "plain"}, headers=headers)
+    assert r.status_code == 200, r.text
+    r = client.get("/api/v1/search/", params={"q": "zephyrine drill"}, headers=headers)
+    assert [h["item"]["unique_id"] for h in r.json()["hits"]] == ["SKU-FTS-2"]
+    r = client.delete(f"/api/v1/items/{drill}", headers=headers)
+    assert r.status_code == 200
+    r = client.get("/api/v1/search/", params={"q": "quillworth"}, headers=headers)
+    assert r.json()["hits"] == []
+
+
+def test_search_transaction_notes(client: TestClient, create_user, auth_header):
+    admin = create_user("admin_search_tx", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_search_tx", "pass123")
+    r = client.post("/api/v1/items/", json={
+        "unique_id": "SKU-FTS-TX", "name": "Radio", "description": None,
+    }, headers=headers)
+    item_id = r.json()["id"]
+    r = client.post("/api/v1/transactions/", json={
+        "item_id": item_id, "user_id": admin.id, "action": "sign_out",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "notes": "Borrowed for the quarterly Kilimanjaro expedition", "state": None,
+    }, headers=headers)
+    assert r.status_code == 201, r.text
+
+    r = client.get("/api/v1/search/", params={"q": "kilimanjaro", "scope": "transactions"}, headers=headers)
+    assert r.status_code == 200, r.text
+    hits = r.json()["hits"]
+    assert len(hits) == 1
+    assert hits[0]["transaction"]["item"]["unique_id"] == "SKU-FTS-TX"
+    assert hits[0]["item"] is None
@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from backend.services.stats_service import invalidate_stats
+from backend.shared_enums import UserRole
+
+
+def test_item_stats_counts_and_invalidation(client: TestClient, db_session, create_user, auth_header, count_queries):
+    from backend import models
+
+    admin = create_user("admin_stats", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_stats", "pass123")
+    invalidate_stats()
+
+    r = client.get("/api/v1/stats/items", headers=headers)
+    assert r.status_code == 200, r.text
+    before = r.json()
+
+    category = models.Category(name="Stats Category")
+    db_session.add(category)
+    db_session.commit()
+    item_ids = []
+    for i, state in enumerate(["good", "bad", "bad"]):
+        r = client.post("/api/v1/items/", json={
+            "unique_id": f"SKU-STATS-{i}",
+            "name": f"Stats {i}",
+            "description": None,
+            "category_id": category.id,
+            "state": state,
+            "location": "Stats Room",
+        }, headers=headers)
+        assert r.status_code == 200, r.text
+        item_ids.append(r.json()["id"])
+
+    r = client.get("/api/v1/stats/items", headers=headers)
+    after = r.json()
+    assert after["total"] == before["total"] + 3
+    assert after["by_state"]["bad"] == before["by_state"]["bad"] + 2
+    assert {"category_id": category.id, "name": "Stats Category", "count": 3} in after["by_category"]
+    assert {"location": "Stats Room", "count": 3} in after["by_location"]
+
+    # Only transactions inside the window are counted
+    db_session.add(models.Transaction(
+        item_id=item_ids[0], user_id=admin.id, action=models.TransactionType.sign_out,
+        timestamp=datetime.now(timezone.utc) - timedelta(days=90),
+    ))
+    db_session.commit()
+    r = client.post("/api/v1/transactions/", json={
+        "item_id": item_ids[0], "user_id": admin.id, "action": "sign_out",
+        "timestamp": datetime.now(timezone.utc).isoformat(), "notes": None, "state": None,
+    }, headers=headers)
+    assert r.status_code == 201, r.text
+    r = client.get("/api/v1/stats/items", params={"days": 7}, headers=headers)
+    assert r.json()["window_days"] == 7
+    week = r.json()["transactions_by_action"]["sign_out"]
+    r = client.get("/api/v1/stats/items", params={"days": 120}, headers=headers)
+    assert r.json()["transactions_by_action"]["sign_out"] == week + 1
+
+    r = client.get("/api/v1/stats/items", params={"days": 7}, headers=headers)
+    assert r.json()["window_days"] == 7
+    week = r.json()["transactions_by_action"]["sign_out"]
+    r = client.get("/api/v1/stats/items", params={"days": 120}, headers=headers)
+    assert r.json()["transactions_by_action"]["sign_out"] == week + 1
+
+    # Repeated reads are served from the cache without aggregate queries
+    with count_queries() as statements:
+        r = client.get("/api/v1/stats/items", params={"days": 7}, headers=headers)
+    assert r.status_code == 200
+    assert not [s for s in statements if "GROUP BY" in s]
+
+
+def test_loop_stats_report_lag_threadpool_and_blocking_code(create_user, monkeypatch):
+    import time
+    from backend.loop_monitor import loop_monitor
+    from backend.main import app
+
+    monkeypatch.setattr(loop_monitor, "interval", 0.01)
+    monkeypatch.setattr(loop_monitor, "threshold", 0.05)
+    create_user("admin_loop", "pass123", role=UserRole.admin)
+    create_user("viewer_loop", "pass123", role=UserRole.viewer)
+
+    def block_the_loop():
+        time.sleep(0.2)
+
+    with TestClient(app) as client:
+        form = {"grant_type": "password", "username": "admin_loop", "password": "pass123", "scope": ""}
+        headers = {"Authorization": f"Bearer {client.post('/api/v1/auth/token', data=form).json()['access_token']}"}
+        blocks_before = loop_monitor.blocks
+        # Run a blocking call on the app's event loop, then let the sampler catch up
+        client.portal.call(block_the_loop)
+        time.sleep(0.05)
+
+        r = client.get("/api/v1/stats/loop", headers=headers)
+        assert r.status_code == 200, r.text
+        stats = r.json()
+        assert stats["running"] is True
+        assert stats["samples"] > 0
+        assert stats["blocks"] > blocks_before
+        block = stats["recent_blocks"][-1]
+        assert block["duration_ms"] >= 100
+        assert any("block_the_loop" in frame for frame in block["stack"])
+        assert stats["threadpool"]["size"] > 0
+
+        form["username"] = "viewer_loop"
+        viewer = {"Authorization": f"Bearer {client.post('/api/v1/auth/token', data=form).json()['access_token']}"}
+        assert client.get("/api/v1/stats/loop", headers=viewer).status_code == 403
+    assert loop_monitor.running is False
+
+
+def test_metrics_exposes_per_route_histograms_in_prometheus_format(client: TestClient, create_user, auth_header):
+    from backend.metrics import request_metrics
+
+    create_user("admin_metrics", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_metrics", "pass123")
+    request_metrics.clear()
+
+    for _ in range(3):
+        assert client.get("/api/v1/items/?limit=1").status_code == 200
+    assert client.get("/api/v1/categories/999999", headers=headers).status_code == 404
+    assert client.get("/no/such/path").status_code == 404
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = r.text.splitlines()
+
+    # Series are keyed by route template, never by the raw path
+    assert 'http_requests_total{method="GET",route="/api/v1/items/",status="200"} 3' in lines
+    assert 'http_requests_total{method="GET",route="/api/v1/categories/{category_id}",status="404"} 1' in lines
+    assert 'http_requests_total{method="other",route="<unmatched>",status="404"} 1' in lines
+    assert not any("/999999" in line for line in lines)
+    assert ('http_request_duration_seconds_bucket{method="GET",route="/api/v1/items/",status="200",le="+Inf"} 3'
+            in lines)
+    assert any(line.startswith("db_pool_checkouts_total ") for line in lines)
+    assert any(line.startswith('cache_hits_total{cache="users"} ') for line in lines)
+    assert any(line.startswith('export_jobs_total{result="started"} ') for line in lines)
+
+
+def test_metrics_series_stay_bounded_for_made_up_methods(client: TestClient):
+    from backend.metrics import request_metrics
+
+    request_metrics.clear()
+    for i in range(50):
+        client.request(f"BREW{i}", "/nope")
+        client.request(f"BREW{i}", "/health")
+    assert client.get("/nope").status_code == 404
+
+    lines = [line for line in client.get("/metrics").text.splitlines() if line.startswith("http_requests_total")]
+    assert 'http_requests_total{method="other",route="<unmatched>",status="404"} 51' in lines
+    assert 'http_requests_total{method="other",route="/health",status="405"} 50' in lines
+    assert not any("BREW" in line for line in lines)
+
+
+def test_metrics_scrape_does_not_start_the_export_job_manager(client: TestClient, monkeypatch):
+    from backend.services import export_jobs
+
+    monkeypatch.setattr(export_jobs, "_manager", None)
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert 'export_jobs_total{result="started"} 0' in r.text.splitlines()
+    assert export_jobs._manager is None
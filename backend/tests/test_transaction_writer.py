@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.api.v1.routers import transactions
+from backend.base import Base
+from backend.database import build_engine
+from backend.dependencies import get_current_user_or_device
+from backend.schemas import TransactionCreate
+from backend.services.transaction_writer import TransactionWriter, get_transaction_writer
+from backend.shared_enums import UserRole
+
+
+@pytest.fixture()
+def writer_db(tmp_path):
+    # File-backed engine with the production profile, so foreign keys are enforced
+    engine = build_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    user = models.User(username="writer", hashed_password="x", role=UserRole.admin)
+    items = [models.Item(unique_id=f"SKU-WQ-{i}", name=f"Tool {i}") for i in range(3)]
+    db.add(user)
+    db.add_all(items)
+    db.commit()
+    ids = {"user": user.id, "items": [item.id for item in items]}
+    db.close()
+    yield Session, ids
+    engine.dispose()
+
+
+def make_payload(item_id, user_id, state=None, notes=None):
+    return TransactionCreate(
+        item_id=item_id,
+        user_id=user_id,
+        action="sign_out",
+        timestamp=datetime.now(timezone.utc),
+        notes=notes,
+        state=state,
+    )
+
+
+def test_concurrent_submits_are_group_committed(writer_db):
+    Session, ids = writer_db
+    writer = TransactionWriter(Session, max_batch=64, max_delay_ms=50)
+    item_id = ids["items"][0]
+
+    async def run():
+        payloads = [make_payload(item_id, ids["user"], notes=str(i)) for i in range(29)]
+        payloads.append(make_payload(item_id, ids["user"], state="bad", notes="last"))
+        try:
+            return await asyncio.gather(*(writer.submit(p) for p in payloads))
+        finally:
+            await writer.close()
+
+    created = asyncio.run(run())
+    assert len({t.id for t in created}) == 30
+    assert [t.notes for t in created] == [str(i) for i in range(29)] + ["last"]
+    assert created[0].item.unique_id == "SKU-WQ-0"
+    assert writer.rows == 30
+    assert writer.batches < 5
+
+    db = Session()
+    assert db.query(models.Transaction).count() == 30
+    assert db.get(models.Item, item_id).state == models.ItemState.bad
+    db.close()
+
+
+def test_failing_row_does_not_sink_its_batch(writer_db):
+    Session, ids = writer_db
+    writer = TransactionWriter(Session, max_batch=64, max_delay_ms=50)
+
+    async def run():
+        payloads = [make_payload(item_id, ids["user"]) for item_id in ids["items"]]
+        payloads.insert(1, make_payload(999999, ids["user"]))
+        try:
+            return await asyncio.gather(*(writer.submit(p) for p in payloads), return_exceptions=True)
+        finally:
+            await writer.close()
+
+    results = asyncio.run(run())
+    # The missing item is refused before the insert, so the rest commit together
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 400
+    assert [r.item_id for r in results if not isinstance(r, Exception)] == ids["items"]
+    assert writer.batches == 1
+
+
+def test_queued_create_endpoint(writer_db):
+    Session, ids = writer_db
+    writer = TransactionWriter(Session, max_delay_ms=1)
+    db = Session()
+    admin = db.get(models.User, ids["user"])
+    db.close()
+
+    app = FastAPI()
+    app.include_router(transactions.queued_router, prefix="/api/v1/transactions")
+    app.dependency_overrides[get_current_user_or_device] = lambda: admin
+    app.dependency_overrides[get_transaction_writer] = lambda: writer
+
+    with TestClient(app) as client:
+        payload = make_payload(ids["items"][2], ids["user"], state="moderate")
+        r = client.post("/api/v1/transactions/", json=payload.model_dump(mode="json"))
+        assert r.status_code == 201, r.text
+        assert r.json()["item"]["state"] == "moderate"
+        r = client.post("/api/v1/transactions/", json=make_payload(999999, ids["user"]).model_dump(mode="json"))
+        assert r.status_code == 400
+        assert r.json()["detail"] == "Item not found"
+        client.portal.call(writer.close)
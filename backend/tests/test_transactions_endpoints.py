@@ -36,5 +36,278 @@ def test_transaction_create_and_list(client: TestClient, create_user, auth_heade
     # List transactions
     r = client.get("/api/v1/transactions/")
     assert r.status_code == 200
-    rows = r.json()
+    rows = r.json()["items"]
     assert any(t["id"] == tx["id"] for t in rows)
+
+    # References to missing rows are refused rather than failing the insert
+    r = client.post("/api/v1/transactions/", json={**tx_payload, "item_id": 999999}, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Item not found"
+    r = client.post("/api/v1/transactions/", json={**tx_payload, "user_id": 999999}, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "User not found"
+
+
+def test_transaction_list_query_count_is_constant(client: TestClient, db_session, create_user, count_queries):
+    from backend import models
+
+    user = create_user("admin_tx_nplus1", "pass123", role=UserRole.admin)
+    category = models.Category(name="N+1 Category", description="eager loading")
+    db_session.add(category)
+    db_session.commit()
+    user_id, category_id = user.id, category.id
+
+    def add_transactions(count: int, prefix: str):
+        for i in range(count):
+            item = models.Item(unique_id=f"{prefix}-{i}", name=f"Item {i}", category_id=category_id)
+            db_session.add(item)
+            db_session.flush()
+            db_session.add(models.Transaction(
+                item_id=item.id,
+                user_id=user_id,
+                action=models.TransactionType.add,
+                timestamp=datetime.now(timezone.utc),
+                state=models.ItemState.good,
+            ))
+        db_session.commit()
+        db_session.expunge_all()
+
+    add_transactions(2, "SKU-NP1-A")
+    with count_queries() as few:
+        r = client.get("/api/v1/transactions/")
+    assert r.status_code == 200
+    few_rows = len(r.json()["items"])
+
+    add_transactions(15, "SKU-NP1-B")
+    with count_queries() as many:
+        r = client.get("/api/v1/transactions/")
+    assert r.status_code == 200
+    assert len(r.json()["items"]) > few_rows
+    assert len(many) == len(few)
+    assert r.json()["items"][0]["item"]["category"]["name"] == "N+1 Category"
+
+
+def test_transaction_keyset_pagination_and_filters(client: TestClient, db_session, create_user):
+    from datetime import timedelta
+    from backend import models
+
+    user = create_user("admin_tx_pages", "pass123", role=UserRole.admin)
+    item = models.Item(unique_id="SKU-PAGES-1", name="Ladder")
+    db_session.add(item)
+    db_session.commit()
+    item_id, user_id = item.id, user.id
+
+    base = datetime(2025, 1, 1, 8, 0, 0)
+    # Two rows share a timestamp so the id tie-breaker is exercised
+    offsets = [0, 1, 1, 2, 3, 4, 5]
+    for i, minutes in enumerate(offsets):
+        db_session.add(models.Transaction(
+            item_id=item_id,
+            user_id=user_id,
+            action=models.TransactionType.sign_out if i % 2 else models.TransactionType.sign_in,
+            timestamp=base + timedelta(minutes=minutes),
+        ))
+    db_session.commit()
+    expected = [
+        t.id for t in db_session.query(models.Transaction)
+        .filter(models.Transaction.item_id == item_id)
+        .order_by(models.Transaction.timestamp.desc(), models.Transaction.id.desc())
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"item_id": item_id, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/transactions/", params=params)
+        assert r.status_code == 200, r.text
+        page = r.json()
+        assert len(page["items"]) <= 2
+        seen.extend(t["id"] for t in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    r = client.get("/api/v1/transactions/", params={"item_id": item_id, "action": "sign_out"})
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 3
+    assert all(t["action"] == "sign_out" for t in r.json()["items"])
+
+    r = client.get("/api/v1/transactions/", params={
+        "item_id": item_id,
+        "start": "2025-01-01T08:02:00",
+        "end": "2025-01-01T08:04:00",
+    })
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 3
+
+    r = client.get("/api/v1/transactions/", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+
+def _batch_items(db_session, prefix: str, count: int):
+    from backend import models
+
+    items = [models.Item(unique_id=f"{prefix}-{i}", name=f"Batch {i}") for i in range(count)]
+    db_session.add_all(items)
+    db_session.commit()
+    return [item.id for item in items]
+
+
+def test_transaction_batch_header_form_writes_once(client: TestClient, db_session, create_user, auth_header, count_queries):
+    from sqlalchemy import event
+    from backend import models
+
+    admin = create_user("admin_tx_batch", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_tx_batch", "pass123")
+    item_ids = _batch_items(db_session, "SKU-BATCH", 5)
+
+    payload = {
+        "header": {
+            "user_id": admin.id,
+            "action": "sign_out",
+            "timestamp": datetime(2025, 6, 1, 8, 0, tzinfo=timezone.utc).isoformat(),
+            "notes": "Field trip",
+            "state": "bad",
+        },
+        "item_ids": item_ids,
+    }
+    commits = []
+    record = commits.append
+    event.listen(db_session, "after_commit", record)
+    try:
+        with count_queries() as statements:
+            r = client.post("/api/v1/transactions/batch", json=payload, headers=headers)
+    finally:
+        event.remove(db_session, "after_commit", record)
+    assert r.status_code == 201, r.text
+
+    body = r.json()
+    assert [t["item_id"] for t in body["created"]] == item_ids
+    assert all(t["notes"] == "Field trip" and t["user"]["username"] == "admin_tx_batch" for t in body["created"])
+    assert body["errors"] == []
+    assert len(commits) == 1
+    assert sum(s.lstrip().upper().startswith("INSERT INTO TRANSACTIONS") for s in statements) == 1
+    assert sum(s.lstrip().upper().startswith("UPDATE ITEMS") for s in statements) == 1
+
+    db_session.expire_all()
+    states = {i.state for i in db_session.query(models.Item).filter(models.Item.id.in_(item_ids))}
+    assert states == {models.ItemState.bad}
+
+
+def test_transaction_batch_modes(client: TestClient, db_session, create_user, auth_header):
+    from backend import models
+
+    admin = create_user("admin_tx_batch_modes", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_tx_batch_modes", "pass123")
+    (item_id,) = _batch_items(db_session, "SKU-BATCH-MODE", 1)
+    timestamp = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {"item_id": item_id, "user_id": admin.id, "action": "sign_in", "timestamp": timestamp, "notes": None, "state": None},
+        {"item_id": 999999, "user_id": admin.id, "action": "sign_in", "timestamp": timestamp, "notes": None, "state": None},
+    ]
+    before = db_session.query(models.Transaction).count()
+
+    r = client.post("/api/v1/transactions/batch", json={"transactions": rows}, headers=headers)
+    assert r.status_code == 400, r.text
+    assert r.json()["detail"] == [{"index": 1, "item_id": 999999, "error": "Item not found"}]
+    assert db_session.query(models.Transaction).count() == before
+
+    r = client.post("/api/v1/transactions/batch", json={"transactions": rows, "mode": "best_effort"}, headers=headers)
+    assert r.status_code == 201, r.text
+    body = r.json()
+    assert [t["item_id"] for t in body["created"]] == [item_id]
+    assert body["errors"] == [{"index": 1, "item_id": 999999, "error": "Item not found"}]
+
+    r = client.post("/api/v1/transactions/batch", json={"item_ids": [item_id]}, headers=headers)
+    assert r.status_code == 422
+
+
+def test_transaction_export_streams_joined_rows(client: TestClient, db_session, create_user, auth_header, count_queries):
+    import csv
+    import io
+    from openpyxl import load_workbook
+    from backend import models
+
+    admin = create_user("admin_tx_export", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_tx_export", "pass123")
+    item = models.Item(unique_id="SKU-EXPORT-1", name="Export Item")
+    db_session.add(item)
+    db_session.commit()
+    for day in (3, 1, 2):
+        db_session.add(models.Transaction(
+            item_id=item.id, user_id=admin.id, action=models.TransactionType.sign_out,
+            timestamp=datetime(2024, 2, day, 12, 0), notes=f"day {day}", state=models.ItemState.good,
+        ))
+    db_session.commit()
+    params = {"start": "2024-02-01T00:00:00", "end": "2024-02-03T23:59:59"}
+
+    with count_queries() as statements:
+        r = client.get("/api/v1/transactions/export", params={**params, "format": "csv"}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["notes"] for row in rows] == ["day 1", "day 2", "day 3"]
+    assert rows[0]["item_unique_id"] == "SKU-EXPORT-1"
+    assert rows[0]["username"] == "admin_tx_export"
+    assert rows[0]["action"] == "sign_out" and rows[0]["state"] == "good"
+    # Rows come from joined SELECTs only, never per-row lazy loads of items or users
+    assert not any("FROM items" in s and "FROM transactions" not in s for s in statements)
+
+    r = client.get("/api/v1/transactions/export", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    assert 'filename="transactions_2024-02-01_2024-02-03.xlsx"' in r.headers["content-disposition"]
+    sheet = load_workbook(io.BytesIO(r.content), read_only=True)["Transactions"]
+    values = list(sheet.iter_rows(values_only=True))
+    assert values[0][:3] == ("id", "item_id", "item_unique_id")
+    assert [row[8] for row in values[1:]] == ["day 1", "day 2", "day 3"]
+
+
+def test_transaction_export_reuses_closed_day_partitions(client: TestClient, db_session, create_user, auth_header,
+                                                          count_queries, export_partitions):
+    import csv
+    import io
+    import os
+    from backend import models
+
+    admin = create_user("admin_tx_partitions", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_tx_partitions", "pass123")
+    item = models.Item(unique_id="SKU-PARTITION-1", name="Partition Item")
+    db_session.add(item)
+    db_session.commit()
+
+    def add(day, hour, notes):
+        db_session.add(models.Transaction(
+            item_id=item.id, user_id=admin.id, action=models.TransactionType.sign_in,
+            timestamp=datetime(2023, 5, day, hour, 0), notes=notes, state=models.ItemState.good,
+        ))
+        db_session.commit()
+
+    for day in (10, 11, 12):
+        add(day, 8, f"may {day}")
+    params = {"start": "2023-05-10T00:00:00", "end": "2023-05-12T12:00:00", "format": "csv"}
+
+    r = client.get("/api/v1/transactions/export", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    assert [row["notes"] for row in csv.DictReader(io.StringIO(r.text))] == ["may 10", "may 11", "may 12"]
+    # May 10 and 11 are whole closed days and now cached; May 12 is cut by the range
+    assert sorted(name.split(".")[0] for name in os.listdir(export_partitions.directory)) == [
+        "2023-05-10", "2023-05-11",
+    ]
+
+    with count_queries() as statements:
+        again = client.get("/api/v1/transactions/export", params=params, headers=headers)
+    assert again.content == r.content
+    # Only the partial last day is read from the table
+    assert sum("JOIN items" in s for s in statements) == 1
+
+    # A new row changes May 11's version, so only that day is rebuilt
+    add(11, 9, "may 11 late")
+    with count_queries() as statements:
+        r = client.get("/api/v1/transactions/export", params=params, headers=headers)
+    assert [row["notes"] for row in csv.DictReader(io.StringIO(r.text))] == [
+        "may 10", "may 11", "may 11 late", "may 12",
+    ]
+    assert sum("JOIN items" in s for s in statements) == 2
+    assert len(os.listdir(export_partitions.directory)) == 2
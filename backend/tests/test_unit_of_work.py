@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from backend import models
+from backend.repositories.item_repository import ItemRepository
+from backend.repositories.unit_of_work import UnitOfWork, in_unit_of_work
+from backend.schemas import ItemCreate
+from backend.shared_enums import UserRole
+
+
+def test_unit_of_work_rolls_back_every_write_on_error(db_session):
+    repo = ItemRepository(db_session)
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db_session):
+            item = repo.create(ItemCreate(unique_id="SKU-UOW-RB", name="Rollback", description=None))
+            assert item.id is not None  # flushed, so the primary key is assigned
+            raise RuntimeError("boom")
+    assert repo.get_by_field("unique_id", "SKU-UOW-RB") is None
+    assert not in_unit_of_work(db_session)
+
+
+def test_nested_unit_of_work_commits_once(db_session):
+    commits = []
+    record = commits.append
+    event.listen(db_session, "after_commit", record)
+    try:
+        repo = ItemRepository(db_session)
+        with UnitOfWork(db_session):
+            with UnitOfWork(db_session):
+                repo.create(ItemCreate(unique_id="SKU-UOW-N1", name="Inner", description=None))
+            assert commits == []
+            repo.create(ItemCreate(unique_id="SKU-UOW-N2", name="Outer", description=None))
+    finally:
+        event.remove(db_session, "after_commit", record)
+    assert len(commits) == 1
+    assert repo.get_by_field("unique_id", "SKU-UOW-N1") is not None
+
+
+def test_transaction_create_commits_once(client: TestClient, db_session, create_user, auth_header):
+    admin = create_user("admin_uow", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_uow", "pass123")
+    item = models.Item(unique_id="SKU-UOW-TX", name="Drill")
+    db_session.add(item)
+    db_session.commit()
+
+    commits = []
+    record = commits.append
+    event.listen(db_session, "after_commit", record)
+    try:
+        r = client.post("/api/v1/transactions/", json={
+            "item_id": item.id,
+            "user_id": admin.id,
+            "action": "sign_out",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "notes": None,
+            "state": "bad",
+        }, headers=headers)
+    finally:
+        event.remove(db_session, "after_commit", record)
+    assert r.status_code == 201, r.text
+    assert r.json()["item"]["state"] == "bad"
+    assert len(commits) == 1
+
+
+def test_item_update_reloads_changed_category(client: TestClient, db_session, create_user, auth_header):
+    create_user("admin_uow_cat", "pass123", role=UserRole.admin)
+    headers = auth_header("admin_uow_cat", "pass123")
+    first = models.Category(name="UoW First")
+    second = models.Category(name="UoW Second")
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    r = client.post("/api/v1/items/", json={
+        "unique_id": "SKU-UOW-CAT", "name": "Rope", "description": None, "category_id": first.id,
+    }, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["category"]["name"] == "UoW First"
+
+    r = client.put(f"/api/v1/items/{r.json()['id']}", json={"category_id": second.id}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["category"]["name"] == "UoW Second"
@@ -31,3 +31,30 @@ def test_users_list_and_update_role(client: TestClient, create_user, auth_header
     headers_admin = auth_header("admin2", "pass123")
     r = client.get("/api/v1/users/", headers=headers_admin)
     assert r.status_code == 403
+
+
+def test_current_user_is_cached_and_invalidated_on_role_change(client: TestClient, create_user, auth_header,
+                                                               count_queries):
+    create_user("super_cache", "pass123", role=UserRole.superadmin)
+    promoted = create_user("admin_cache", "pass123", role=UserRole.admin)
+    super_headers = auth_header("super_cache", "pass123")
+    admin_headers = auth_header("admin_cache", "pass123")
+
+    # The first request resolves the user; the next is served from the cache
+    r = client.get("/api/v1/users/", headers=admin_headers)
+    assert r.status_code == 403
+    with count_queries() as statements:
+        r = client.get("/api/v1/users/", headers=admin_headers)
+    assert r.status_code == 403
+    assert not any("users.username = " in s for s in statements)
+
+    r = client.put(f"/api/v1/users/{promoted.id}/role", json={"role": "superadmin"}, headers=super_headers)
+    assert r.status_code == 200, r.text
+    # The role change drops the cached entry, so the new role applies at once
+    r = client.get("/api/v1/users/", headers=admin_headers)
+    assert r.status_code == 200, r.text
+
+    r = client.get("/api/v1/stats/cache", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["users"]["hits"] >= 1
+    assert 0 < r.json()["users"]["hit_rate"] <= 1
@@ -1,33 +1,60 @@
+import csv
+import io
 import openpyxl
 from openpyxl.styles import Font, PatternFill
 from sqlalchemy.orm import Session
-from .models import Item, Transaction, ItemState
-from datetime import datetime
+from typing import IO, Dict, Iterator, Tuple
+from .repositories.item_repository import ItemRepository
+from .services.export_service import write_xlsx
 from fastapi import BackgroundTasks
 
 # --- Excel Export ---
+INVENTORY_REPORT_HEADERS = [
+    "ID", "Unique ID", "Name", "Description", "Category", "State", "Location", "Purchase Date", "Expiry Date"
+]
+
+def _style_report_header(cell) -> None:
+    cell.font = Font(bold=True)
+    cell.fill = PatternFill(start_color="C5D9F1", fill_type="solid")
+
 def export_inventory_to_excel(db: Session, file_path: str = "inventory_report.xlsx"):
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Inventory"
-
-    headers = [
-        "ID", "Unique ID", "Name", "Description", "Category", "State", "Location", "Purchase Date", "Expiry Date"
-    ]
-    ws.append(headers)
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="C5D9F1", fill_type="solid")
-
-    items = db.query(Item).all()
-    for item in items:
-        ws.append([
-            item.id, item.unique_id, item.name, item.description, item.category_id, item.state.value,
-            item.location, item.purchase_date, item.expiry_date
-        ])
-    wb.save(file_path)
+    """Write the full inventory report to `file_path`, streaming rows from one joined query."""
+    rows = ItemRepository(db).iter_export_rows()
+    with open(file_path, "wb") as fileobj:
+        write_xlsx(INVENTORY_REPORT_HEADERS, rows, fileobj, title="Inventory", header_style=_style_report_header)
     return file_path
 
+# --- Tabular import ---
+def iter_csv_rows(fileobj: IO[bytes]) -> Iterator[Tuple[int, Dict[str, object]]]:
+    """Stream `(row_number, row)` pairs from a CSV file; the header is row 1."""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, row
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+def iter_xlsx_rows(fileobj: IO[bytes]) -> Iterator[Tuple[int, Dict[str, object]]]:
+    """Stream `(row_number, row)` pairs from the first sheet of an XLSX file."""
+    wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        keys = [str(name).strip().lower() if name is not None else "" for name in header]
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield row_number, dict(zip(keys, values))
+    finally:
+        wb.close()
+
 # --- Notification (stub) ---
 def send_notification_email(to_email: str, subject: str, message: str):
     # Integrate with aiosmtplib or other mailer in production
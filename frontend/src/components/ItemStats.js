@@ -11,16 +11,8 @@ function ItemStats() {
 
   useEffect(() => {
     if (user) {
-      apiClient.get('/items/')
-        .then(res => {
-          const counts = { good: 0, moderate: 0, bad: 0 };
-          res.data.forEach(item => {
-            if (item.state === 'good') counts.good++;
-            if (item.state === 'moderate') counts.moderate++;
-            if (item.state === 'bad') counts.bad++;
-          });
-          setStats(counts);
-        });
+      apiClient.get('/stats/items')
+        .then(res => setStats(res.data.by_state));
       }
   }, [user]);
 
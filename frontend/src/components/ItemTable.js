@@ -10,10 +10,14 @@ import apiClient from '../api';
 import { AuthContext } from '../context/AuthContext';
 import { useTranslation } from 'react-i18next';
 
+const PAGE_SIZE = 50;
+
 function ItemTable({ reload }) {
   const { user } = useContext(AuthContext);
   const { t } = useTranslation();
   const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [search, setSearch] = useState({ name: '', category: '', state: '' });
   const [categories, setCategories] = useState([]);
   const [openDeleteDialog, setOpenDeleteDialog] = useState(false);
@@ -31,11 +35,34 @@ function ItemTable({ reload }) {
   });
   const [snackbar, setSnackbar] = useState({ open: false, message: '', severity: 'success' });
 
+  // Filtering and paging run server-side; the total and next cursor come back as headers.
+  const fetchPage = (cursor) => {
+    const params = { limit: PAGE_SIZE };
+    if (search.name) params.name = search.name;
+    if (search.category) params.category_id = search.category;
+    if (search.state) params.state = search.state;
+    if (cursor) params.cursor = cursor;
+    return apiClient.get('/items/', { params })
+      .then(res => {
+        setItems(prev => (cursor ? [...prev, ...res.data] : res.data));
+        setNextCursor(res.headers['x-next-cursor'] || null);
+        setTotal(Number(res.headers['x-total-count'] || 0));
+      })
+      .catch(() => {
+        if (!cursor) setItems([]);
+        setNextCursor(null);
+      });
+  };
+
+  useEffect(() => {
+    if (user) {
+      fetchPage(null);
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [reload, user, search.name, search.category, search.state]);
+
   useEffect(() => {
     if (user) {
-      apiClient.get('/items/')
-        .then(res => setItems(res.data))
-        .catch(() => setItems([]));
       apiClient.get('/categories/')
         .then(res => setCategories(res.data))
         .catch(() => setCategories([]));
@@ -57,6 +84,7 @@ function ItemTable({ reload }) {
       apiClient.delete(`/items/${selectedItem.id}`)
         .then(() => {
           setItems(items.filter(i => i.id !== selectedItem.id));
+          setTotal(count => Math.max(count - 1, 0));
           handleCloseDeleteDialog();
         })
         .catch(error => {
@@ -125,15 +153,9 @@ function ItemTable({ reload }) {
     }
   };
 
-  const filtered = items.filter(item =>
-    (!search.name || item.name.toLowerCase().includes(search.name.toLowerCase())) &&
-    (!search.category || (item.category && item.category.name === search.category)) &&
-    (!search.state || item.state === search.state)
-  );
-
   return (
     <TableContainer component={Paper} sx={{ mt: 2 }}>
-      <Typography variant="h6" sx={{ p: 2 }}>{t('items.title')}</Typography>
+      <Typography variant="h6" sx={{ p: 2 }}>{t('items.title')} ({total})</Typography>
       <Box sx={{ p: 2 }}>
         <Grid container spacing={2}>
           <Grid item xs={12} md={4}>
@@ -142,7 +164,7 @@ function ItemTable({ reload }) {
           <Grid item xs={12} md={4}>
             <TextField select label={t('common.category')} value={search.category} onChange={e => setSearch(s => ({ ...s, category: e.target.value }))} fullWidth>
               <MenuItem value="">{t('common.all')}</MenuItem>
-              {categories.map(cat => <MenuItem key={cat.id} value={cat.name}>{cat.name}</MenuItem>)}
+              {categories.map(cat => <MenuItem key={cat.id} value={cat.id}>{cat.name}</MenuItem>)}
             </TextField>
           </Grid>
           <Grid item xs={12} md={4}>
@@ -173,7 +195,7 @@ function ItemTable({ reload }) {
           </TableRow>
         </TableHead>
         <TableBody>
-          {filtered.map(item => (
+          {items.map(item => (
             <TableRow key={item.id}>
               <TableCell>{item.id}</TableCell>
               <TableCell>{item.name}</TableCell>
@@ -200,6 +222,13 @@ function ItemTable({ reload }) {
           ))}
         </TableBody>
       </Table>
+      {nextCursor && (
+        <Box sx={{ p: 2, display: 'flex', justifyContent: 'center' }}>
+          <Button onClick={() => fetchPage(nextCursor)} size="small">
+            {t('items.loadMore')}
+          </Button>
+        </Box>
+      )}
       <Dialog open={openDeleteDialog} onClose={handleCloseDeleteDialog}>
         <DialogTitle>{t('items.confirmDeletion')}</DialogTitle>
         <DialogContent>
@@ -1,11 +1,13 @@
 import React, { useState, useEffect, useContext } from 'react';
-import { Box, Paper, Typography, Button, MenuItem, TextField, Grid, Snackbar, Alert } from '@mui/material';
+import { Autocomplete, Box, Paper, Typography, Button, MenuItem, TextField, Grid, Snackbar, Alert } from '@mui/material';
 import apiClient from '../api';
 import { AuthContext } from '../context/AuthContext';
 import { useTranslation } from 'react-i18next';
 
 function SignInOutForm({ onTransaction }) {
   const [items, setItems] = useState([]);
+  const [itemQuery, setItemQuery] = useState('');
+  const [selectedItem, setSelectedItem] = useState(null);
   const [form, setForm] = useState({
     item_id: '',
     action: 'sign_out',
@@ -17,11 +19,19 @@ function SignInOutForm({ onTransaction }) {
   const { user } = useContext(AuthContext);
   const { t } = useTranslation();
 
+  // Suggestions come from the server's in-memory prefix index as the operator types
   useEffect(() => {
-    apiClient.get('/items/')
-      .then(res => setItems(res.data))
-      .catch(() => setItems([]));
-  }, []);
+    const prefix = itemQuery.trim();
+    if (!prefix) {
+      setItems([]);
+      return;
+    }
+    let active = true;
+    apiClient.get('/items/suggest', { params: { prefix, limit: 20 } })
+      .then(res => { if (active) setItems(res.data); })
+      .catch(() => { if (active) setItems([]); });
+    return () => { active = false; };
+  }, [itemQuery]);
 
   const handleChange = (e) => {
     setForm({ ...form, [e.target.name]: e.target.value });
@@ -62,6 +72,8 @@ function SignInOutForm({ onTransaction }) {
         image_url: imageUrl,
       });
       setForm({ item_id: '', action: 'sign_out', notes: '', state: 'good' });
+      setSelectedItem(null);
+      setItemQuery('');
       setImageFile(null);
       // Also reset the file input if it exists (it's only rendered for moderate/bad state)
       const fileInput = document.getElementById('signinout-image-upload');
@@ -82,9 +94,22 @@ function SignInOutForm({ onTransaction }) {
         <Box component="form" onSubmit={handleSubmit}>
           <Grid container spacing={2}>
             <Grid item xs={12} md={4}>
-              <TextField id="signinout-item" select label={t('items.item') || 'Item'} name="item_id" value={form.item_id} onChange={handleChange} fullWidth required>
-                {items.map(item => <MenuItem key={item.id} value={item.id}>{item.name} ({item.unique_id})</MenuItem>)}
-              </TextField>
+              <Autocomplete
+                id="signinout-item"
+                options={items}
+                value={selectedItem}
+                filterOptions={(options) => options}
+                getOptionLabel={(item) => `${item.name} (${item.unique_id})`}
+                isOptionEqualToValue={(option, value) => option.id === value.id}
+                onInputChange={(e, value) => setItemQuery(value)}
+                onChange={(e, item) => {
+                  setSelectedItem(item);
+                  setForm(f => ({ ...f, item_id: item ? item.id : '' }));
+                }}
+                renderInput={(params) => (
+                  <TextField {...params} label={t('items.item') || 'Item'} required />
+                )}
+              />
             </Grid>
             <Grid item xs={12} md={2}>
               <TextField id="signinout-action" select label={t('transactions.action')} name="action" value={form.action} onChange={handleChange} fullWidth>
@@ -4,51 +4,77 @@ import apiClient from '../api';
 import { AuthContext } from '../context/AuthContext';
 import { useTranslation } from 'react-i18next';
 
+const PAGE_SIZE = 25;
+
 function TransactionTable({ reload }) {
   const { user } = useContext(AuthContext);
   const { t } = useTranslation();
   const [transactions, setTransactions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [search, setSearch] = useState({ item_name: '', user_name: '', action: '' });
   const [downloading, setDownloading] = useState(false);
+  const [exportProgress, setExportProgress] = useState(0);
+
+  // The API returns newest-first keyset pages; the action filter runs server-side.
+  const fetchPage = (cursor) => {
+    const params = { limit: PAGE_SIZE };
+    if (search.action) params.action = search.action;
+    if (cursor) params.cursor = cursor;
+    return apiClient.get('/transactions/', { params })
+      .then(res => {
+        setTransactions(prev => (cursor ? [...prev, ...res.data.items] : res.data.items));
+        setNextCursor(res.data.next_cursor);
+      })
+      .catch(() => {
+        if (!cursor) setTransactions([]);
+        setNextCursor(null);
+      });
+  };
 
   useEffect(() => {
     if (user) {
-      apiClient.get('/transactions/')
-        .then(res => setTransactions(res.data))
-        .catch(() => setTransactions([]));
+      fetchPage(null);
     }
-  }, [user, reload]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user, reload, search.action]);
 
   const filtered = transactions.filter(trx => {
     const itemName = trx.item && (trx.item.name || trx.item.unique_id || trx.item.id);
     const userName = trx.user && (trx.user.username || trx.user.name || trx.user.id);
     const itemMatch = !search.item_name || (itemName && String(itemName).toLowerCase().includes(search.item_name.toLowerCase()));
     const userMatch = !search.user_name || (userName && String(userName).toLowerCase().includes(search.user_name.toLowerCase()));
-    const actionMatch = !search.action || trx.action === search.action;
-    return itemMatch && userMatch && actionMatch;
+    return itemMatch && userMatch;
   });
 
+  // Exports are built server-side as a job; poll it, then download the finished file.
+  // Whole-day bounds keep the request identical across clicks, so an unchanged
+  // report is served from the server's cache.
   const exportLastWeek = async () => {
     try {
       setDownloading(true);
+      setExportProgress(0);
       const end = new Date();
-      const start = new Date();
-      start.setDate(end.getDate() - 7);
+      end.setHours(24, 0, 0, 0);
+      const start = new Date(end);
+      start.setDate(end.getDate() - 8);
       const startISO = start.toISOString();
       const endISO = end.toISOString();
-      const response = await apiClient.get(`/transactions/export`, {
-        params: { start: startISO, end: endISO },
-        responseType: 'blob',
-      });
-      const contentType = response.headers && (response.headers['content-type'] || response.headers['Content-Type']);
-      const isExcel = contentType && contentType.includes('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-      const blobType = isExcel ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' : 'text/csv';
-      const extension = isExcel ? 'xlsx' : 'csv';
+      let { data: job } = await apiClient.post('/exports/', { start: startISO, end: endISO });
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        job = (await apiClient.get(`/exports/${job.id}`)).data;
+        setExportProgress(job.rows_total ? Math.round((100 * job.rows_done) / job.rows_total) : 0);
+      }
+      if (job.status !== 'done') {
+        throw new Error(job.error || 'Export failed');
+      }
+      const response = await apiClient.get(`/exports/${job.id}/download`, { responseType: 'blob' });
+      const blobType = job.format === 'xlsx' ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' : 'text/csv';
       const blob = new Blob([response.data], { type: blobType });
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
-      a.download = `transactions_${startISO.slice(0,10)}_${endISO.slice(0,10)}.${extension}`;
+      a.download = `transactions_${startISO.slice(0,10)}_${endISO.slice(0,10)}.${job.format}`;
       document.body.appendChild(a);
       a.click();
       a.remove();
@@ -66,7 +92,7 @@ function TransactionTable({ reload }) {
         <Typography variant="h6">{t('transactions.recent')}</Typography>
         {user && (
           <Button onClick={exportLastWeek} variant="outlined" size="small" disabled={downloading}>
-            {downloading ? t('transactions.exporting') : t('transactions.exportLastWeek')}
+            {downloading ? `${t('transactions.exporting')} ${exportProgress}%` : t('transactions.exportLastWeek')}
           </Button>
         )}
       </Box>
@@ -103,7 +129,7 @@ function TransactionTable({ reload }) {
           </TableRow>
         </TableHead>
         <TableBody>
-          {filtered.slice(-10).reverse().map(trx => (
+          {filtered.map(trx => (
             <TableRow key={trx.id}>
               <TableCell>{trx.id}</TableCell>
               <TableCell>{trx.item && typeof trx.item === 'object' && (typeof trx.item.id === 'string' || typeof trx.item.id === 'number') ? trx.item.id : t('common.n_a')}</TableCell>
@@ -123,6 +149,13 @@ function TransactionTable({ reload }) {
           ))}
         </TableBody>
       </Table>
+      {nextCursor && (
+        <Box sx={{ p: 2, display: 'flex', justifyContent: 'center' }}>
+          <Button onClick={() => fetchPage(nextCursor)} size="small">
+            {t('transactions.loadMore')}
+          </Button>
+        </Box>
+      )}
     </TableContainer>
   );
 }